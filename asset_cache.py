@@ -0,0 +1,145 @@
+import base64
+import shutil
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+MIME_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".gif": "image/gif", ".svg": "image/svg+xml", ".webp": "image/webp"}
+
+PathLike = Union[str, Path]
+
+
+def _mime(path: Path) -> str:
+    return MIME_TYPES.get(path.suffix.lower(), "image/jpeg")
+
+
+def _version(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _script_static_dir() -> Optional[Path]:
+    """`static/` next to the running app's main script, if static serving is on (server.enableStaticServing)."""
+    try:
+        import streamlit as st
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        if not st.get_option("server.enableStaticServing"):
+            return None
+        ctx = get_script_run_ctx()
+        main_script = getattr(ctx, "main_script_path", None)
+    except Exception:
+        return None
+    return Path(main_script).parent / "static" if main_script else None
+
+
+class AssetCache:
+    """
+    Image sources for the img_tag helpers, computed once per file version.
+
+    - Inline mode (default): memoized base64 data-URIs, keyed by path and (mtime, size).
+    - Static mode: the file is copied once into the app's `static/` folder under a content-hashed
+      name and referenced as `app/static/<name>`. The browser caches it, so reruns only send the
+      short URL instead of the whole image. Enabled when Streamlit's static serving is turned on
+      (`server.enableStaticServing = true` or STREAMLIT_SERVER_ENABLE_STATIC_SERVING=true).
+
+    `stats()` reports how many tags were rendered and the bytes of HTML they added to the page.
+    """
+    def __init__(self, static_dir: Optional[PathLike] = None):
+        self.static_dir = Path(static_dir) if static_dir else None
+        self._data_uris: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        self._static_urls: Dict[Tuple[Path, Path], Tuple[Tuple[int, int], str]] = {}
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.bytes_rendered = 0
+
+    def data_uri(self, path: PathLike) -> Optional[str]:
+        """`data:<mime>;base64,...` for the file, or None if it doesn't exist."""
+        path = Path(path)
+        version = _version(path)
+        if version is None:
+            return None
+        with self._lock:
+            cached = self._data_uris.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        uri = f"data:{_mime(path)};base64,{base64.b64encode(path.read_bytes()).decode()}"
+        with self._lock:
+            self._data_uris[path] = (version, uri)
+        return uri
+
+    def static_url(self, path: PathLike, static_dir: PathLike) -> Optional[str]:
+        """Publishes the file into `static_dir` and returns its `app/static/...` URL, or None if it doesn't exist."""
+        path, static_dir = Path(path), Path(static_dir)
+        version = _version(path)
+        if version is None:
+            return None
+        key = (path, static_dir)
+        with self._lock:
+            cached = self._static_urls.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        data = path.read_bytes()
+        # Content hash in the name: a changed image gets a new URL, so long browser caching stays correct
+        name = f"{path.stem}-{hashlib.sha256(data).hexdigest()[:12]}{path.suffix.lower()}"
+        target = static_dir / name
+        if not target.exists():
+            static_dir.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(target.suffix + ".tmp")
+            shutil.copyfile(path, tmp)
+            tmp.replace(target)
+            logger.info(f"Published {path} as static asset {target}")
+        url = f"app/static/{name}"
+        with self._lock:
+            self._static_urls[key] = (version, url)
+        return url
+
+    def src(self, path: PathLike) -> Optional[str]:
+        """Best `src` for the file: a static URL when static serving is available, else a data-URI."""
+        static_dir = self.static_dir or _script_static_dir()
+        if static_dir is not None:
+            try:
+                return self.static_url(path, static_dir)
+            except OSError as e:
+                logger.warning(f"Static asset publishing failed for {path}, inlining instead: {e}")
+        return self.data_uri(path)
+
+    def img_tag(self, path: PathLike, height: int) -> str:
+        src = self.src(path)
+        if src is None:
+            return ""
+        tag = f'<img src="{src}" height="{height}">'
+        self.record(tag)
+        return tag
+
+    def record(self, html: str) -> None:
+        """Counts HTML emitted for assets towards `stats()`."""
+        with self._lock:
+            self.renders += 1
+            self.bytes_rendered += len(html) # asset HTML is ASCII
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"renders": self.renders, "bytes_rendered": self.bytes_rendered}
+
+
+# Shared by every page and session in the process
+assets = AssetCache()
+
+
+def asset_src(path: PathLike) -> str:
+    """`src` attribute value for an image (empty if the file doesn't exist)."""
+    src = assets.src(path) or ""
+    assets.record(src)
+    return src
+
+
+def img_tag(path: PathLike, height: int) -> str:
+    """`<img>` tag for a local image at the given height (empty if the file doesn't exist)."""
+    return assets.img_tag(path, height)
@@ -0,0 +1,50 @@
+import sys
+import json
+import time
+import platform
+import datetime
+import statistics
+from pathlib import Path
+from typing import Callable, Dict, Any, List
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Make the flat app modules importable the same way the Streamlit pages do
+for _p in (ROOT, ROOT / "consumer", ROOT / "vendor"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """Runs `fn` `warmup + repeat` times and returns wall-clock stats (seconds) over the timed runs."""
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "max": max(samples),
+        "repeat": repeat,
+    }
+
+
+def save_results(name: str, results: Dict[str, Any]) -> Path:
+    """Writes results to benchmarks/results/<name>-<timestamp>.json for trend comparison."""
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+    path = RESULTS_DIR / f"{name}-{stamp}.json"
+    payload = {
+        "benchmark": name,
+        "timestamp": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    path.write_text(json.dumps(payload, indent=2, default=str))
+    return path
@@ -0,0 +1,48 @@
+"""
+Bytes and time spent on images per rerun of the consumer home page (logo, avatar, card):
+the old per-rerun base64 inlining vs. the memoized data-URIs and static serving of asset_cache.
+
+    python benchmarks/bench_assets.py
+"""
+import base64
+import tempfile
+from pathlib import Path
+
+from _harness import ROOT, measure, save_results
+from asset_cache import AssetCache
+
+ASSETS = ROOT / "consumer" / "assets"
+# (path, height) as rendered by consumer/home.py on every rerun
+PAGE_IMAGES = [(ASSETS / "revolut_logo.png", 28), (ASSETS / "user.png", 30), (ASSETS / "card.png", 90)]
+
+
+def legacy_img_tag(path: Path, height: int) -> str:
+    """The img_tag the pages used before asset_cache: read + encode on every call."""
+    if not path.exists():
+        return ""
+    mime = "image/png" if path.suffix.lower() == ".png" else "image/jpeg"
+    data = base64.b64encode(path.read_bytes()).decode()
+    return f'<img src="data:{mime};base64,{data}" height="{height}">'
+
+
+def render(img_tag) -> int:
+    """HTML bytes one rerun sends for the page's images."""
+    return sum(len(img_tag(path, height).encode()) for path, height in PAGE_IMAGES)
+
+
+def run(repeat: int = 200) -> dict:
+    results = {}
+    inline = AssetCache()
+    with tempfile.TemporaryDirectory() as static_dir:
+        static = AssetCache(static_dir=static_dir)
+        for name, img_tag in (("legacy", legacy_img_tag), ("inline_cached", inline.img_tag), ("static", static.img_tag)):
+            timing = measure(lambda: render(img_tag), repeat=repeat)
+            results[name] = {"bytes_per_render": render(img_tag), "seconds_per_render": timing["median"]}
+    return results
+
+
+if __name__ == "__main__":
+    r = run()
+    for name, row in r.items():
+        print(f"{name:>14}: {row['bytes_per_render']:>9,} bytes/render  {row['seconds_per_render'] * 1e6:8.1f} us/render")
+    print(f"saved to {save_results('assets', r)}")
@@ -0,0 +1,72 @@
+"""
+Build time and memory of the co-occurrence index (consumer/cooccurrence.py) on synthetic user x merchant
+pairs, plus the per-recommendation lookup cost. The target scale is 10M users x 100k merchants:
+
+    python benchmarks/bench_cooccurrence.py [users] [merchants] [transactions_per_user] [max_block_nnz]
+"""
+import sys
+import time
+import resource
+
+import numpy as np
+
+from _harness import measure, save_results
+from generators import user_merchant_codes, vendor_names
+from cooccurrence import MAX_BLOCK_NNZ, TOP_K, CooccurrenceIndex, top_k_cosine, user_merchant_matrix
+
+GENERATE_CHUNK = 10_000_000
+
+
+def peak_rss_bytes() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 # kB on Linux
+
+
+def run(users: int = 1_000_000, merchants: int = 100_000, per_user: float = 5.0, max_block_nnz: int = MAX_BLOCK_NNZ) -> dict:
+    n = int(users * per_user)
+    start = time.perf_counter()
+    parts = [user_merchant_codes(min(GENERATE_CHUNK, n - first), users, merchants, first_row=first, locality=200) for first in range(0, n, GENERATE_CHUNK)]
+    user = np.concatenate([p[0] for p in parts]).astype(np.int32)
+    merchant = np.concatenate([p[1] for p in parts]).astype(np.int32)
+    del parts
+    generate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    X = user_merchant_matrix(user, merchant, users, merchants)
+    del user, merchant
+    matrix_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    neighbors, scores = top_k_cosine(X, TOP_K, max_block_nnz=max_block_nnz)
+    top_k_seconds = time.perf_counter() - start
+
+    names = [str(v) for v in vendor_names(merchants)]
+    index = CooccurrenceIndex(names, neighbors, scores)
+    rng = np.random.default_rng(0)
+    anchors = [names[i] for i in rng.integers(0, merchants, 100)]
+    candidates = [names[i] for i in rng.integers(0, merchants, 500)] # one anchor's vendor list
+    lookup = measure(lambda: [index.scores_for(a, candidates) for a in anchors], repeat=5)
+    return {
+        "users": users,
+        "merchants": merchants,
+        "transactions": n,
+        "user_merchant_pairs": X.nnz,
+        "generate_seconds": generate_seconds,
+        "matrix_seconds": matrix_seconds,
+        "top_k_seconds": top_k_seconds,
+        "build_seconds": matrix_seconds + top_k_seconds,
+        "index_bytes": neighbors.nbytes + scores.nbytes,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "lookup_us_per_vendor": lookup["median"] / (len(anchors) * len(candidates)) * 1e6,
+        "merchants_with_neighbours": int((neighbors[:, 0] >= 0).sum()),
+    }
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    merchants = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    per_user = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+    max_block_nnz = int(sys.argv[4]) if len(sys.argv) > 4 else MAX_BLOCK_NNZ
+    r = run(users, merchants, per_user, max_block_nnz)
+    print(f"{r['users']:,} users x {r['merchants']:,} merchants, {r['transactions']:,} transactions ({r['user_merchant_pairs']:,} distinct pairs)")
+    print(f"build: matrix {r['matrix_seconds']:.1f}s + top-{TOP_K} {r['top_k_seconds']:.1f}s = {r['build_seconds']:.1f}s; peak RSS {r['peak_rss_bytes'] / 1e9:.2f} GB")
+    print(f"index: {r['index_bytes'] / 1e6:.0f} MB, {r['merchants_with_neighbours']:,} merchants with neighbours; lookup {r['lookup_us_per_vendor']:.2f} us/vendor")
+    print(f"saved to {save_results('cooccurrence', r)}")
@@ -0,0 +1,71 @@
+"""
+Peak RSS of loading a large point-transaction history: json.load of the array vs. streaming the
+array vs. streaming JSON Lines, with and without column projection. Each method runs in a fresh
+child process so peaks don't mask each other.
+
+    python benchmarks/bench_ingest.py [n_records]
+"""
+import sys
+import json
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+from _harness import save_results
+import json_stream
+import point_transactions
+from bench_point_loader import write_history
+
+COLUMNS = point_transactions.RECORD_COLUMNS
+
+METHODS = {
+    # name: (file kind, callable(path) -> number of records kept or seen)
+    "json_load": ("json", lambda p: len(json.load(open(p, "r", encoding="utf-8")))),
+    "stream_array_columns": ("json", lambda p: len(json_stream.load_records(p, COLUMNS))),
+    "stream_jsonl_all": ("jsonl", lambda p: len(json_stream.load_records(p))),
+    "stream_jsonl_columns": ("jsonl", lambda p: len(json_stream.load_records(p, COLUMNS))),
+    "stream_jsonl_chunks": ("jsonl", lambda p: sum(len(c) for c in point_transactions.iter_point_transactions(p))),
+}
+
+
+def peak_rss_bytes() -> int:
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def child(method: str, path: str) -> None:
+    baseline = peak_rss_bytes()
+    records = METHODS[method][1](path)
+    print(json.dumps({"records": records, "baseline_rss": baseline, "peak_rss": peak_rss_bytes()}))
+
+
+def run(n: int = 500_000) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        array_path = Path(tmp) / "revpoint_transactions.json"
+        write_history(array_path, n)
+        lines_path = json_stream.convert_to_jsonl(array_path)
+        paths = {"json": array_path, "jsonl": lines_path}
+        results = {"n_records": n, "json_bytes": array_path.stat().st_size, "jsonl_bytes": lines_path.stat().st_size}
+        for method, (kind, _) in METHODS.items():
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", method, str(paths[kind])],
+                check=True, capture_output=True, text=True,
+            )
+            row = json.loads(out.stdout.strip().splitlines()[-1])
+            row["added_rss"] = row["peak_rss"] - row["baseline_rss"]
+            results[method] = row
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+        sys.exit(0)
+    r = run(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
+    print(f"{r['n_records']:,} records ({r['json_bytes'] / 1e6:.0f} MB array, {r['jsonl_bytes'] / 1e6:.0f} MB JSONL)")
+    for method in METHODS:
+        row = r[method]
+        print(f"{method:>22}: peak RSS +{row['added_rss'] / 1e6:7.1f} MB over a {row['baseline_rss'] / 1e6:.0f} MB baseline")
+    print(f"saved to {save_results('ingest', r)}")
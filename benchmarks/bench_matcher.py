@@ -0,0 +1,72 @@
+"""
+Throughput of NotificationMatcher: one campaign matched against N synthetic user profiles.
+
+    python benchmarks/bench_matcher.py [n_users]
+"""
+import sys
+import time
+import datetime
+
+import numpy as np
+
+from _harness import measure, save_results
+from notification_matcher import NotificationMatcher, NotificationInboxes, ProfileMatrix, TIME_SLOTS
+
+CATEGORIES = ["Restaurants", "Groceries", "Shopping", "Travel and Transportation", "Entertainment"]
+
+
+def synthetic_profiles(n_users: int, n_merchants: int = 10_000, seed: int = 0) -> ProfileMatrix:
+    """Profiles shaped like generate_user_profile_summary output: 3 ranked categories, 5 merchants, 2 time slots."""
+    rng = np.random.default_rng(seed)
+    affinity = np.zeros((len(CATEGORIES), n_users), dtype=np.float32)
+    users = np.arange(n_users)
+    for rank in (1, 2, 3):
+        cats = rng.integers(0, len(CATEGORIES), n_users)
+        affinity[cats, users] = np.maximum(affinity[cats, users], 1.0 / rank)
+    slots = np.zeros((len(TIME_SLOTS), n_users), dtype=np.float32)
+    for _ in range(2):
+        slots[rng.integers(0, len(TIME_SLOTS), n_users), users] = 1.0
+    merchant_of = rng.integers(0, n_merchants, size=n_users * 5)
+    owners = np.repeat(users, 5)
+    order = np.argsort(merchant_of, kind="stable")
+    bounds = np.searchsorted(merchant_of[order], np.arange(n_merchants + 1))
+    merchant_users = {f"Merchant {m}": owners[order[bounds[m]:bounds[m + 1]]] for m in range(n_merchants)}
+    user_ids = [f"user_{i}" for i in range(n_users)]
+    return ProfileMatrix(user_ids, CATEGORIES, affinity, slots, merchant_users)
+
+
+def run(n_users: int = 1_000_000, n_campaigns: int = 20) -> dict:
+    start = time.perf_counter()
+    profiles = synthetic_profiles(n_users)
+    build_seconds = time.perf_counter() - start
+
+    rng = np.random.default_rng(1)
+    campaigns = [
+        {"campaign_id": f"c{i}", "category": CATEGORIES[i % len(CATEGORIES)], "vendor_name": f"Merchant {rng.integers(10_000)}"}
+        for i in range(n_campaigns)
+    ]
+    at = datetime.datetime(2025, 5, 3, 19, 0)
+    matcher = NotificationMatcher(profiles)
+    match = measure(lambda: [matcher.match(c, at) for c in campaigns], repeat=3)
+    recipients = np.mean([len(matcher.match(c, at)[0]) for c in campaigns])
+
+    matcher.inboxes = NotificationInboxes()
+    route = measure(lambda: matcher.route(campaigns[:1]), repeat=1, warmup=0)
+    return {
+        "n_users": n_users,
+        "profile_build_seconds": build_seconds,
+        "match_seconds_per_campaign": match["median"] / n_campaigns,
+        "profiles_per_second": n_users * n_campaigns / match["median"],
+        "mean_recipients": float(recipients),
+        "route_seconds_per_campaign": route["median"],
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    r = run(n)
+    print(f"{r['n_users']:,} profiles built in {r['profile_build_seconds']:.2f}s")
+    print(f"match: {r['match_seconds_per_campaign'] * 1000:.1f} ms/campaign ({r['profiles_per_second']:,.0f} profiles/s), "
+          f"~{r['mean_recipients']:,.0f} recipients")
+    print(f"match + inbox delivery: {r['route_seconds_per_campaign']:.2f} s/campaign")
+    print(f"saved to {save_results('matcher', r)}")
@@ -0,0 +1,48 @@
+"""
+Offline evaluation throughput (consumer/offline_eval.py) on a synthetic multi-user log: users/second
+with one weight configuration vs. many, i.e. the marginal cost of evaluating another scoring variant.
+
+    python benchmarks/bench_offline_eval.py [users] [transactions_per_user] [vendors] [workers]
+
+Needs the recommendation engine's own dependencies (torch, sentence-transformers and the model).
+"""
+import sys
+
+from _harness import save_results
+from generators import partner_vendors, user_transactions
+import offline_eval
+
+SWEEP_CONFIGS = 16
+
+
+def sweep(n: int) -> dict:
+    """`n` configurations spread over the (similarity, value, novelty) simplex."""
+    configs = dict(offline_eval.DEFAULT_CONFIGS)
+    for i in range(max(n - len(configs), 0)):
+        sim = 0.3 + 0.6 * i / max(n - len(configs) - 1, 1)
+        configs[f"sweep_{i}"] = (round(sim, 3), round((1 - sim) * 0.6, 3), round((1 - sim) * 0.4, 3))
+    return configs
+
+
+def run(users: int = 2_000, per_user: int = 100, vendors: int = 500, workers: int = None) -> dict:
+    log = user_transactions(users * per_user, users=users, merchants=vendors)
+    vendor_list = partner_vendors(vendors)
+    results = {"users": users, "transactions": len(log), "vendors": vendors}
+    for name, configs in (("one_config", {"production": offline_eval.DEFAULT_CONFIGS["production"]}), ("sweep", sweep(SWEEP_CONFIGS))):
+        r = offline_eval.evaluate(log, vendor_list, configs, workers=workers)
+        results[name] = {"configs": len(configs), "seconds": r["seconds"], "users_per_second": r["users_per_second"], "metrics": r["configs"]}
+    return results
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    vendors = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    r = run(users, per_user, vendors, workers)
+    print(f"{r['users']:,} users, {r['transactions']:,} transactions, {r['vendors']:,} vendors")
+    for name in ("one_config", "sweep"):
+        print(f"{name:>10}: {r[name]['configs']:>2} configs in {r[name]['seconds']:.1f}s ({r[name]['users_per_second']:.0f} users/s)")
+    extra = (r["sweep"]["seconds"] - r["one_config"]["seconds"]) / (r["sweep"]["configs"] - 1)
+    print(f"marginal cost per extra config: {extra:.2f}s")
+    print(f"saved to {save_results('offline_eval', r)}")
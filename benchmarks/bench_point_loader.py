@@ -0,0 +1,107 @@
+"""
+Point-transaction loading: the old per-record validation loop vs. the streaming, vectorized loader.
+Reports records/second and Python heap peak (tracemalloc) for a synthetic history.
+
+    python benchmarks/bench_point_loader.py [n_records]
+"""
+import sys
+import json
+import random
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from _harness import measure, save_results
+import point_transactions
+
+REQUIRED_KEYS = point_transactions.REQUIRED_KEYS
+
+
+def write_history(path: Path, n: int, invalid_rate: float = 0.01, seed: int = 0) -> None:
+    """Synthetic revpoint_transactions.json shaped like utilities/get_savings.py output, with some broken records."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i in range(n):
+            price = round(rng.uniform(5, 80), 2)
+            record = {
+                "pointtransactionid": f"pt-{i}",
+                "timestamp": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00",
+                "vendor_name": f"Vendor {rng.randint(0, 199)}",
+                "points_spent": rng.randint(10, 200),
+                "money_saved": round(price * 0.1, 2),
+                "percentage_saved": 10,
+                "actual_price": price,
+                "promotion_description_used": "Great deal: redeem points and enjoy a discount on your purchase.",
+            }
+            if rng.random() < invalid_rate:
+                record["money_saved"] = "n/a"
+            f.write(("," if i else "") + json.dumps(record))
+        f.write("]")
+
+
+def legacy_load(path: Path) -> pd.DataFrame:
+    """The loader 6_savings.py used before point_transactions."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    valid_data = []
+    for t in data:
+        if t and all(key in t for key in REQUIRED_KEYS):
+            try:
+                t['money_saved'] = float(t['money_saved'])
+                t['points_spent'] = int(t['points_spent'])
+                t['actual_price'] = float(t['actual_price'])
+                t['percentage_saved'] = float(t['percentage_saved']) if t.get('percentage_saved') is not None else 0.0
+                valid_data.append(t)
+            except (ValueError, TypeError):
+                continue
+    df = pd.DataFrame(valid_data)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df['month_year'] = df['timestamp'].dt.to_period('M')
+    df['month_year_str'] = df['month_year'].astype(str)
+    df['paid_amount'] = (df['actual_price'] - df['money_saved']).fillna(0)
+    return df
+
+
+def streamed_rows(path: Path) -> int:
+    """Consumes the chunk stream the way the savings rollups do, without keeping the chunks."""
+    return sum(len(chunk) for chunk in point_transactions.iter_point_transactions(path))
+
+
+def heap_peak(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(n: int = 200_000) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "revpoint_transactions.json"
+        write_history(path, n)
+        results = {"n_records": n, "file_bytes": path.stat().st_size}
+        for name, fn in (
+            ("legacy", lambda: legacy_load(path)),
+            ("vectorized_frame", lambda: point_transactions.load_point_transactions(path)),
+            ("vectorized_stream", lambda: streamed_rows(path)),
+        ):
+            timing = measure(fn, repeat=3, warmup=0)
+            results[name] = {
+                "seconds": timing["median"],
+                "records_per_second": n / timing["median"],
+                "heap_peak_bytes": heap_peak(fn),
+            }
+    return results
+
+
+if __name__ == "__main__":
+    r = run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
+    print(f"{r['n_records']:,} records, {r['file_bytes'] / 1e6:.1f} MB")
+    for name in ("legacy", "vectorized_frame", "vectorized_stream"):
+        row = r[name]
+        print(f"{name:>18}: {row['seconds']:.2f}s  {row['records_per_second']:>10,.0f} rec/s  heap peak {row['heap_peak_bytes'] / 1e6:7.1f} MB")
+    print(f"saved to {save_results('point_loader', r)}")
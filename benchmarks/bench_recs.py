@@ -0,0 +1,60 @@
+"""
+Recommendation pipeline, stage by stage and end to end, on synthetic data from generators.py:
+generate_user_profile_summary, _choose_anchor_vendors, _vendor_embeddings, _score_vendors,
+_diverse_top_vendors and generate_recs. Run at several scales and compare the saved JSON over time.
+
+    python benchmarks/bench_recs.py [transactions] [vendors] [repeat]
+
+Needs the recommendation engine's own dependencies (torch, sentence-transformers and the model).
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from _harness import measure, save_results
+from generators import write_card_transactions, write_partner_vendors
+from user_profiler import generate_user_profile_summary
+import recommendation_engine as engine
+
+
+def run(transactions: int = 100_000, vendors: int = 1_000, repeat: int = 3) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        txn_path = write_card_transactions(Path(tmp) / "final_data.csv", transactions, merchants=min(vendors, 500))
+        vendor_path = write_partner_vendors(Path(tmp) / "partner_vendors.json", vendors)
+
+        txn_df = pd.read_csv(
+            txn_path, usecols=["timestamp", "merchant_name", "category", "amount"], parse_dates=["timestamp"],
+        ).sort_values("timestamp", ascending=False).reset_index(drop=True)
+        vendor_list = engine._load_vendors(str(vendor_path))
+        engine._ModelCache.get() # model load is a one-off, not part of any stage
+
+        summary = generate_user_profile_summary(path=str(txn_path))
+        anchors = engine._choose_anchor_vendors(txn_df, k=3)
+        vendor_vecs = engine._vendor_embeddings(vendor_list)
+        scores = engine._score_vendors(anchors[0], vendor_list, vendor_vecs, summary, txn_df)
+
+        stages = {
+            "profile_summary": lambda: generate_user_profile_summary(path=str(txn_path)),
+            "choose_anchors": lambda: engine._choose_anchor_vendors(txn_df, k=3),
+            "vendor_embeddings": lambda: engine._vendor_embeddings(vendor_list),
+            "score_vendors": lambda: engine._score_vendors(anchors[0], vendor_list, vendor_vecs, summary, txn_df),
+            "diverse_top_vendors": lambda: engine._diverse_top_vendors(list(scores), 6), # sorts its input in place
+            "generate_recs": lambda: engine.generate_recs(vendor_path=str(vendor_path), transactions_path=str(txn_path), k_panels=3),
+        }
+        results = {"transactions": transactions, "vendors": vendors}
+        for name, fn in stages.items():
+            results[name] = measure(fn, repeat=repeat)
+    return results
+
+
+if __name__ == "__main__":
+    transactions = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    vendors = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    r = run(transactions, vendors, repeat)
+    print(f"{r['transactions']:,} transactions, {r['vendors']:,} vendors (median of {repeat})")
+    for stage in ("profile_summary", "choose_anchors", "vendor_embeddings", "score_vendors", "diverse_top_vendors", "generate_recs"):
+        print(f"{stage:>20}: {r[stage]['median'] * 1000:10.1f} ms")
+    print(f"saved to {save_results('recs', r)}")
@@ -0,0 +1,52 @@
+"""
+Full-regeneration vs. delta revisions in HumanInLoopManager, measured against a fake LLM.
+
+    python benchmarks/bench_revisions.py
+"""
+import tempfile
+import datetime
+
+from _harness import measure, save_results
+from fake_llm import FakeToolLLM, SAMPLE_CAMPAIGN
+from campaign_agent import CampaignGenerationAgent, CampaignFormat
+from human_in_loop import HumanInLoopManager
+
+FEEDBACKS = [
+    "Make the slogan funnier",
+    "The notification should mention the weekend",
+    "Use bigger discounts in the promotions",
+    "Shorter slogan and a punchier notification",
+]
+
+
+def run(repeat: int = 3) -> dict:
+    llm = FakeToolLLM()
+    agent = CampaignGenerationAgent(llm=llm, cache_dir=tempfile.mkdtemp(prefix="campaign_cache_"))
+    manager = HumanInLoopManager(agent)
+    campaign = CampaignFormat(**SAMPLE_CAMPAIGN, campaign_id="bench", timestamp=datetime.datetime.now())
+
+    results = {}
+    for mode in ("full", "delta"):
+        llm.reset_stats()
+        timing = measure(lambda: [manager.revise_campaign(campaign, fb, mode=mode) for fb in FEEDBACKS], repeat=repeat, warmup=0)
+        calls = llm.stats["calls"]
+        results[mode] = {
+            "seconds_per_revision": timing["median"] / len(FEEDBACKS),
+            "input_tokens_per_revision": llm.stats["input_tokens"] / calls,
+            "output_tokens_per_revision": llm.stats["output_tokens"] / calls,
+        }
+
+    full, delta = results["full"], results["delta"]
+    results["output_token_reduction"] = 1 - delta["output_tokens_per_revision"] / full["output_tokens_per_revision"]
+    results["latency_reduction"] = 1 - delta["seconds_per_revision"] / full["seconds_per_revision"]
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+    for mode in ("full", "delta"):
+        r = results[mode]
+        print(f"{mode:>5}: {r['seconds_per_revision'] * 1000:7.1f} ms/revision | "
+              f"in {r['input_tokens_per_revision']:6.0f} tok | out {r['output_tokens_per_revision']:5.0f} tok")
+    print(f"output tokens -{results['output_token_reduction']:.0%}, latency -{results['latency_reduction']:.0%}")
+    print(f"saved to {save_results('revisions', results)}")
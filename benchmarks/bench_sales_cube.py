@@ -0,0 +1,80 @@
+"""
+Vendor dashboard aggregates: the per-rerun pandas groupbys vendor/home.py used to run vs. SalesCube queries.
+
+    python benchmarks/bench_sales_cube.py [years] [orders_per_hour]
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from _harness import measure, save_results
+from sales_cube import SalesCube, WEEKDAYS
+
+
+def synthetic_sales(years: int = 3, orders_per_hour: float = 4.0, seed: int = 0) -> pd.DataFrame:
+    """Hourly sales for one vendor with a weekday/hour profile, shaped like vendor/home.py's data."""
+    rng = np.random.default_rng(seed)
+    hours = pd.date_range(end=pd.Timestamp("2025-05-01"), periods=years * 365 * 24, freq="h")
+    profile = 0.2 + np.sin(np.pi * hours.hour.to_numpy() / 24) ** 2
+    counts = rng.poisson(orders_per_hour * profile)
+    dates = np.repeat(hours.to_numpy(), counts) + rng.integers(0, 3600, counts.sum()).astype("timedelta64[s]")
+    n = len(dates)
+    return pd.DataFrame({
+        "date": dates,
+        "amount": rng.gamma(3, 4, n).round(2),
+        "vendor_name": "Bar de la FIB",
+        "product_category": rng.choice(["Drink", "Food", "Merch"], size=n, p=[.7, .25, .05]),
+    })
+
+
+def legacy_charts(df: pd.DataFrame) -> None:
+    """The aggregates vendor/home.py computed on every rerun before SalesCube."""
+    df = df.copy()
+    df["amount"].sum(), len(df), df["amount"].mean()
+    df.groupby(df["date"].dt.date)["amount"].sum().reset_index()
+    df.groupby(df["date"].dt.day_name())["amount"].sum().reindex(WEEKDAYS).reset_index(name="total")
+    df["hour"] = df["date"].dt.hour
+    df["weekday"] = df["date"].dt.day_name()
+    df.pivot_table(index="weekday", columns="hour", values="amount", aggfunc="sum").fillna(0).reindex(index=WEEKDAYS)
+    df.groupby("product_category")["amount"].sum().reset_index(name="total")
+    df.sort_values("date").assign(cum=lambda d: d["amount"].cumsum())
+    df.sort_values("date", ascending=False).head(10)
+
+
+def cube_charts(cube: SalesCube, start=None, end=None) -> None:
+    cube.summary(start, end)
+    cube.daily(start, end)
+    cube.weekday_totals(start, end)
+    cube.weekday_hour(start, end)
+    cube.category_totals(start, end)
+    cube.cumulative(start, end)
+    cube.recent_transactions(10, start, end)
+
+
+def run(years: int = 3, orders_per_hour: float = 4.0) -> dict:
+    df = synthetic_sales(years, orders_per_hour)
+    build = measure(lambda: SalesCube.from_frame(df), repeat=3)
+    cube = SalesCube.from_frame(df)
+    first, last = cube.date_range
+    quarter_start = last - pd.Timedelta(days=90)
+    return {
+        "orders": len(df),
+        "days": len(cube.days),
+        "cube_bytes": cube.nbytes,
+        "cube_build_seconds": build["median"],
+        "legacy_rerun_seconds": measure(lambda: legacy_charts(df), repeat=3)["median"],
+        "cube_rerun_seconds": measure(lambda: cube_charts(cube), repeat=20)["median"],
+        "cube_rerun_last_quarter_seconds": measure(lambda: cube_charts(cube, quarter_start, last), repeat=20)["median"],
+    }
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    per_hour = float(sys.argv[2]) if len(sys.argv) > 2 else 4.0
+    r = run(years, per_hour)
+    print(f"{r['orders']:,} orders over {r['days']:,} days; cube {r['cube_bytes'] / 1e6:.1f} MB, built in {r['cube_build_seconds']:.2f}s")
+    print(f"all charts, legacy groupbys: {r['legacy_rerun_seconds'] * 1000:8.1f} ms/rerun")
+    print(f"all charts, cube (all time): {r['cube_rerun_seconds'] * 1000:8.1f} ms/rerun")
+    print(f"all charts, cube (90 days):  {r['cube_rerun_last_quarter_seconds'] * 1000:8.1f} ms/rerun")
+    print(f"saved to {save_results('sales_cube', r)}")
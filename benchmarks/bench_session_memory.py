@@ -0,0 +1,92 @@
+"""
+Memory held by home-page sessions: the old per-session frame copies (transactions_hidden,
+transactions_shown, transactions) vs. one shared activity frame plus an ActivitySlice per session.
+
+    python benchmarks/bench_session_memory.py [transactions] [sessions]
+"""
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from _harness import measure, save_results
+from generators import write_card_transactions
+from activity_view import ActivitySlice
+from data_access import clear_cache, load_activity
+
+N_INIT = 50 # transactions hidden by default, as in consumer/home.py
+
+
+def legacy_session(df: pd.DataFrame, n: int = N_INIT) -> dict:
+    """The session state consumer/home.py kept before activity_view."""
+    if n > 0 and len(df) > n:
+        hidden_df = df.iloc[:n].copy()
+        shown_df = df.iloc[n:].copy()
+    else:
+        hidden_df = pd.DataFrame(columns=df.columns)
+        shown_df = df.copy()
+    state = {"lastn": n, "transactions_hidden": hidden_df, "transactions_shown": shown_df}
+    state["transactions"] = shown_df.copy() if n > 0 and len(df) > n else df.copy()
+    return state
+
+
+def slice_session(df: pd.DataFrame, n: int = N_INIT) -> dict:
+    return {"lastn": n, "activity": ActivitySlice(hidden_n=n)}
+
+
+def sessions_bytes(make_session, df: pd.DataFrame, sessions: int) -> int:
+    """Python heap added by `sessions` session states (tracemalloc; includes numpy buffers)."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        states = [make_session(df) for _ in range(sessions)]
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def legacy_rerun(df: pd.DataFrame) -> int:
+    state = legacy_session(df)
+    shown = state["transactions"].assign(date_fmt=lambda d: pd.to_datetime(d.date).dt.strftime("%d %b %Y"))
+    return sum(1 for _ in shown.iterrows())
+
+
+def slice_rerun(df: pd.DataFrame, view: ActivitySlice) -> int:
+    return sum(1 for _ in view.rows(df).itertuples(index=False))
+
+
+def run(transactions: int = 20_000, sessions: int = 1_000) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_card_transactions(Path(tmp) / "final_data.csv", transactions)
+        clear_cache()
+        df = load_activity(path)
+        shared = int(df.memory_usage(deep=True).sum())
+        legacy = sessions_bytes(legacy_session, df, sessions)
+        sliced = sessions_bytes(slice_session, df, sessions)
+        view = ActivitySlice(hidden_n=N_INIT)
+        results = {
+            "transactions": transactions,
+            "sessions": sessions,
+            "shared_frame_bytes": shared,
+            "legacy_bytes": legacy,
+            "slice_bytes": sliced,
+            "legacy_bytes_per_session": legacy / sessions,
+            "slice_bytes_per_session": sliced / sessions,
+            "legacy_rerun_seconds": measure(lambda: legacy_rerun(df), repeat=5)["median"],
+            "slice_rerun_seconds": measure(lambda: slice_rerun(df, view), repeat=20)["median"],
+        }
+    clear_cache()
+    return results
+
+
+if __name__ == "__main__":
+    transactions = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    r = run(transactions, sessions)
+    print(f"{r['sessions']:,} sessions over {r['transactions']:,} transactions (shared frame {r['shared_frame_bytes'] / 1e6:.1f} MB)")
+    print(f"frame copies per session: {r['legacy_bytes'] / 1e6:9.1f} MB total, {r['legacy_bytes_per_session'] / 1e3:9.1f} kB/session")
+    print(f"slice descriptors:        {r['slice_bytes'] / 1e6:9.1f} MB total, {r['slice_bytes_per_session'] / 1e3:9.1f} kB/session")
+    print(f"rerun: legacy {r['legacy_rerun_seconds'] * 1000:.1f} ms, slice {r['slice_rerun_seconds'] * 1000:.2f} ms")
+    print(f"saved to {save_results('session_memory', r)}")
@@ -0,0 +1,84 @@
+import json
+import time
+import uuid
+import threading
+from typing import Any, Dict, List
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+SAMPLE_CAMPAIGN = {
+    "vendor_name": "H2O Bar",
+    "category": "Restaurants",
+    "promotions": [
+        "Use 30 points for a free Cold-Pressed Juice (like Power or Detox)!",
+        "Use 500 points for €5 off any delicious Toast or Bowl!",
+        "Use 250 points for a free Protein Ball add-on!",
+    ],
+    "notification": "⏳ Fresh deals at H2O Bar! Use points for 10€ off bowls & juices or grab a free protein boost. Healthy & tasty awaits! Tap now!",
+    "campaign_message": (
+        "Fuel your day the healthy way at H2O Bar! 🥗 Discover our vibrant Toasts, energizing Bowls, fresh "
+        "Cold-Pressed Juices & more. Use your points for amazing discounts like €5 off bowls/toasts or a "
+        "FREE juice! Taste the freshness! 🥑🍓"
+    ),
+    "campaign_slogan": "H2O Bar: Sip Fresh, Eat Healthy, Feel Great! ✨",
+}
+
+
+def count_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token), good enough for relative comparisons."""
+    return max(1, len(text) // 4)
+
+
+def _message_text(message: Any) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+
+
+class FakeToolLLM:
+    """
+    Stand-in for ChatGoogleGenerativeAI that answers forced tool calls from a canned campaign.
+
+    Latency is simulated as `base_latency + output_tokens * seconds_per_output_token`, and token
+    usage is accumulated in `stats`, so prompt/schema changes can be compared without an API key.
+    """
+    model = "fake-tool-llm"
+    temperature = 0.0
+
+    def __init__(self, campaign: Dict[str, Any] = None, base_latency: float = 0.05, seconds_per_output_token: float = 0.002):
+        self.campaign = dict(campaign or SAMPLE_CAMPAIGN)
+        self.base_latency = base_latency
+        self.seconds_per_output_token = seconds_per_output_token
+        self.stats = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+        self._lock = threading.Lock()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+
+    def bind_tools(self, tools: List[Any], tool_choice: str = None) -> RunnableLambda:
+        fields = list(tools[0].model_fields)
+        name = tool_choice or tools[0].__name__
+        return RunnableLambda(lambda messages: self._respond(messages, name, fields))
+
+    def _revise(self, value: Any) -> Any:
+        if isinstance(value, list):
+            return [f"{v} (revised)" for v in value]
+        return f"{value} (revised)"
+
+    def _respond(self, messages: List[Any], tool_name: str, fields: List[str]) -> AIMessage:
+        args = {name: self._revise(self.campaign[name]) for name in fields}
+        input_tokens = sum(count_tokens(_message_text(m)) for m in messages)
+        output_tokens = count_tokens(json.dumps(args, ensure_ascii=False))
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["input_tokens"] += input_tokens
+            self.stats["output_tokens"] += output_tokens
+        time.sleep(self.base_latency + output_tokens * self.seconds_per_output_token)
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": tool_name, "args": args, "id": str(uuid.uuid4())}],
+            usage_metadata={"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens},
+        )
@@ -0,0 +1,234 @@
+"""
+Synthetic data at configurable scale for the benchmarks, shaped like the files in data/:
+
+- card transactions   -> final_data.csv            (timestamp, merchant_name, category, amount, currency)
+- multi-user card transactions (the same plus user_id), for offline evaluation and co-occurrence
+- point transactions  -> revpoint_transactions.json (utilities/get_savings.py records), or .jsonl
+- partner vendors     -> partner_vendors.json       (vendor_id, vendor_name, category, offer_details, ...)
+
+Rows are generated column-wise with NumPy and written in chunks, so 100M transactions never need
+to fit in memory. The same seed always produces the same files.
+
+    python benchmarks/generators.py OUT_DIR [--transactions N] [--points N] [--vendors N] [--jsonl]
+"""
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ["Restaurants", "Groceries", "Travel & Transportation", "Entertainment", "Shopping"]
+CATEGORY_WEIGHTS = [0.37, 0.25, 0.19, 0.12, 0.07] # category mix of data/final_data.csv
+CATEGORY_SPEND = {"Restaurants": 14.0, "Groceries": 22.0, "Travel & Transportation": 18.0, "Entertainment": 25.0, "Shopping": 40.0}
+OFFER_TYPES = ["points_for_cash", "percentage_discount", "fixed_voucher", "free_item", "fixed_discount", "buy_one_get_one"]
+OFFER_WEIGHTS = [0.30, 0.23, 0.17, 0.15, 0.08, 0.07] # offer mix of data/partner_vendors.json
+TAGS = ["coffee", "brunch", "vegan", "late-night", "family", "budget", "premium", "local", "takeaway", "delivery"]
+
+CHUNK_ROWS = 1_000_000
+START = pd.Timestamp("2024-01-01", tz="UTC")
+
+
+def _chunks(n: int, chunk_rows: int) -> Iterator[tuple]:
+    """(chunk index, first row, rows) covering n rows."""
+    for i, first in enumerate(range(0, n, chunk_rows)):
+        yield i, first, min(chunk_rows, n - first)
+
+
+def vendor_names(n: int) -> np.ndarray:
+    return np.char.add("Vendor ", np.arange(n).astype(str))
+
+
+def vendor_categories(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).choice(CATEGORIES, size=n, p=CATEGORY_WEIGHTS)
+
+
+# ---------- Card transactions (final_data.csv) ---------- #
+def card_transactions(n: int, merchants: int = 500, days: int = 365, seed: int = 0, first_row: int = 0, total: int = None) -> pd.DataFrame:
+    """
+    `n` card transactions in timestamp order. Rows [first_row, first_row + n) of a `total`-row history
+    spread over `days`, so consecutive chunks concatenate into one chronological file.
+    Merchant popularity is Zipf-like and each merchant has a fixed category.
+    """
+    total = total or n
+    rng = np.random.default_rng((seed, first_row))
+    span = days * 86_400 / total
+    seconds = (first_row + np.arange(n) + rng.random(n)) * span
+    popularity = 1.0 / np.arange(1, merchants + 1)
+    merchant = rng.choice(merchants, size=n, p=popularity / popularity.sum())
+    categories = vendor_categories(merchants, seed)[merchant]
+    mean_spend = pd.Series(categories).map(CATEGORY_SPEND).to_numpy()
+    return pd.DataFrame({
+        "timestamp": START + pd.to_timedelta(seconds.astype(np.int64), unit="s"),
+        "merchant_name": vendor_names(merchants)[merchant],
+        "category": categories,
+        "amount": -rng.gamma(2.0, mean_spend / 2.0).round(2),
+        "currency": "EUR",
+    })
+
+
+def write_card_transactions(path: Path, n: int, merchants: int = 500, days: int = 365, seed: int = 0, chunk_rows: int = CHUNK_ROWS) -> Path:
+    path = Path(path)
+    for i, first, rows in _chunks(n, chunk_rows):
+        df = card_transactions(rows, merchants, days, seed, first_row=first, total=n)
+        df.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return path
+
+
+def user_merchant_codes(n: int, users: int = 1_000, merchants: int = 500, seed: int = 0, first_row: int = 0, locality: int = 50) -> tuple:
+    """
+    (user, merchant) index arrays for `n` transactions. Each user shops mostly within a window of
+    `locality` merchants around a home merchant, with Zipf-like preference inside it, so users
+    overlap and merchants have real co-shoppers. Cheap enough for 10M-user scale tests.
+    """
+    rng = np.random.default_rng((seed, first_row, 3))
+    user = rng.integers(0, users, size=n)
+    home = np.random.default_rng((seed, 4)).integers(0, merchants, size=users) # fixed per user across chunks
+    popularity = 1.0 / np.arange(1, locality + 1)
+    merchant = (home[user] + rng.choice(locality, size=n, p=popularity / popularity.sum())) % merchants
+    return user, merchant
+
+
+def user_transactions(n: int, users: int = 1_000, merchants: int = 500, days: int = 365, seed: int = 0, first_row: int = 0, total: int = None, locality: int = 50) -> pd.DataFrame:
+    """Multi-user card transactions (card_transactions columns plus user_id) in timestamp order; see user_merchant_codes."""
+    total = total or n
+    rng = np.random.default_rng((seed, first_row, 5))
+    span = days * 86_400 / total
+    seconds = (first_row + np.arange(n) + rng.random(n)) * span
+    user, merchant = user_merchant_codes(n, users, merchants, seed, first_row, locality)
+    categories = vendor_categories(merchants, seed)[merchant]
+    mean_spend = pd.Series(categories).map(CATEGORY_SPEND).to_numpy()
+    return pd.DataFrame({
+        "timestamp": START + pd.to_timedelta(seconds.astype(np.int64), unit="s"),
+        "user_id": np.char.add("user_", user.astype(str)),
+        "merchant_name": vendor_names(merchants)[merchant],
+        "category": categories,
+        "amount": -rng.gamma(2.0, mean_spend / 2.0).round(2),
+        "currency": "EUR",
+    })
+
+
+def write_user_transactions(path: Path, n: int, users: int = 1_000, merchants: int = 500, days: int = 365, seed: int = 0, chunk_rows: int = CHUNK_ROWS) -> Path:
+    path = Path(path)
+    for i, first, rows in _chunks(n, chunk_rows):
+        df = user_transactions(rows, users, merchants, days, seed, first_row=first, total=n)
+        df.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return path
+
+
+# ---------- Point transactions (revpoint_transactions.json) ---------- #
+def point_transactions(n: int, vendors: int = 200, seed: int = 0, first_row: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng((seed, first_row, 1))
+    price = rng.uniform(5, 80, n).round(2)
+    pct = rng.integers(5, 40, n)
+    saved = (price * pct / 100).round(2)
+    points = (saved * 50).astype(np.int64) + rng.integers(10, 60, n)
+    stamps = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365 * 86_400, n), unit="s")
+    return pd.DataFrame({
+        "pointtransactionid": np.char.add("pt-", (first_row + np.arange(n)).astype(str)),
+        "timestamp": stamps.strftime("%Y-%m-%dT%H:%M:%S"),
+        "vendor_name": vendor_names(vendors)[rng.integers(0, vendors, n)],
+        "points_spent": points,
+        "money_saved": saved,
+        "percentage_saved": pct,
+        "actual_price": price,
+        "promotion_description_used": (
+            "Spend " + pd.Series(points).astype(str) + " points to save €" + pd.Series(saved).astype(str)
+            + " (" + pd.Series(pct).astype(str) + "% off) on a product originally priced at €" + pd.Series(price).astype(str) + "."
+        ).to_numpy(),
+    })
+
+
+def write_point_transactions(path: Path, n: int, vendors: int = 200, seed: int = 0, jsonl: bool = False, chunk_rows: int = CHUNK_ROWS) -> Path:
+    """Writes a JSON array (like get_savings.py) or, with `jsonl`, one record per line."""
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        if not jsonl:
+            f.write("[")
+        for i, first, rows in _chunks(n, chunk_rows):
+            lines = point_transactions(rows, vendors, seed, first_row=first).to_json(orient="records", lines=True, force_ascii=False)
+            if jsonl:
+                f.write(lines)
+            else:
+                f.write(("," if i else "") + lines.rstrip("\n").replace("\n", ","))
+        if not jsonl:
+            f.write("]")
+    return path
+
+
+# ---------- Partner vendors (partner_vendors.json) ---------- #
+def partner_vendors(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Vendor records with offers; vendor names and categories line up with card_transactions()."""
+    rng = np.random.default_rng((seed, 2))
+    names = vendor_names(n)
+    categories = vendor_categories(n, seed)
+    otypes = rng.choice(OFFER_TYPES, size=n, p=OFFER_WEIGHTS)
+    values = rng.choice([3, 5, 10, 15, 20, 25], size=n)
+    costs = values * 100
+    tag_picks = rng.integers(0, len(TAGS), (n, 3))
+    descriptions = {
+        "points_for_cash": "Use {cost} points for a {value}€ voucher.",
+        "percentage_discount": "{value}% off when paying with points.",
+        "fixed_voucher": "{value}€ discount voucher when paying with points.",
+        "free_item": "Get a free coffee when paying with points.",
+        "fixed_discount": "{value}€ discount on your next purchase when paying with points.",
+        "buy_one_get_one": "Buy one, get one free when paying with points.",
+    }
+    return [
+        {
+            "vendor_id": f"vendor_{i:08x}",
+            "vendor_name": str(names[i]),
+            "category": str(categories[i]),
+            "location_hint": "Barcelona",
+            "offer_details": {
+                "offer_id": f"offer_{i:08x}",
+                "offer_description": descriptions[otypes[i]].format(cost=int(costs[i]), value=int(values[i])),
+                "offer_type": str(otypes[i]),
+                "offer_value": None if otypes[i] in ("free_item", "buy_one_get_one") else int(values[i]),
+                "points_cost": int(costs[i]) if otypes[i] == "points_for_cash" else None,
+            },
+            "tags": [TAGS[t] for t in tag_picks[i]],
+            "About": f"{names[i]} is a {categories[i].lower()} partner in Barcelona.",
+            "url": f"https://example.com/{i}",
+            "image_url": "",
+        }
+        for i in range(n)
+    ]
+
+
+def write_partner_vendors(path: Path, n: int, seed: int = 0, jsonl: bool = False) -> Path:
+    path = Path(path)
+    vendors = partner_vendors(n, seed)
+    with open(path, "w", encoding="utf-8") as f:
+        if jsonl:
+            f.writelines(json.dumps(v, ensure_ascii=False) + "\n" for v in vendors)
+        else:
+            json.dump(vendors, f, ensure_ascii=False)
+    return path
+
+
+def write_dataset(out_dir: Path, transactions: int = 10_000, points: int = 10_000, vendors: int = 1_000, seed: int = 0, jsonl: bool = False) -> Dict[str, Path]:
+    """All three files in `out_dir`, with card merchants drawn from the partner vendors."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    suffix = ".jsonl" if jsonl else ".json"
+    return {
+        "transactions": write_card_transactions(out_dir / "final_data.csv", transactions, merchants=min(vendors, 500), seed=seed),
+        "points": write_point_transactions(out_dir / f"revpoint_transactions{suffix}", points, vendors=min(vendors, 200), seed=seed, jsonl=jsonl),
+        "vendors": write_partner_vendors(out_dir / f"partner_vendors{suffix}", vendors, seed=seed, jsonl=jsonl),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--transactions", type=int, default=10_000)
+    parser.add_argument("--points", type=int, default=10_000)
+    parser.add_argument("--vendors", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jsonl", action="store_true", help="write JSON Lines instead of JSON arrays")
+    args = parser.parse_args()
+    paths = write_dataset(args.out_dir, args.transactions, args.points, args.vendors, args.seed, args.jsonl)
+    for name, path in paths.items():
+        print(f"{name:>12}: {path} ({path.stat().st_size / 1e6:.1f} MB)")
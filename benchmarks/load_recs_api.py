@@ -0,0 +1,128 @@
+"""
+Load test for the recommendation API (consumer/recs_api.py): closed-loop clients at rising
+concurrency, each hitting /recs with a few exclude_last_n variants. A share of the requests
+revalidate with If-None-Match, as the React frontends do on refresh.
+
+    python benchmarks/load_recs_api.py [requests_per_level] [--url http://127.0.0.1:8502]
+
+Without --url the API is started under uvicorn on a free port and stopped afterwards.
+"""
+import sys
+import time
+import socket
+import random
+import statistics
+import subprocess
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+from concurrent.futures import ThreadPoolExecutor
+
+from _harness import ROOT, save_results
+
+CONCURRENCY_LEVELS = (1, 4, 16, 64)
+EXCLUDE_VARIANTS = (0, 5, 10, 20) # distinct /recs responses the clients ask for
+REVALIDATE_SHARE = 0.5 # fraction of requests sent with a known ETag
+STARTUP_TIMEOUT = 600 # seconds; the first start downloads and loads the model
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "recs_api:app", "--app-dir", "consumer", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+        try:
+            with urlopen(f"http://127.0.0.1:{port}/healthz", timeout=1):
+                return proc
+        except (URLError, OSError):
+            time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError("recommendation API did not start in time")
+
+
+def fetch(url: str, etag: str = None) -> tuple:
+    """(status, etag, seconds) for one GET."""
+    request = Request(url, headers={"If-None-Match": etag} if etag else {})
+    start = time.perf_counter()
+    try:
+        with urlopen(request, timeout=120) as response:
+            response.read()
+            status, tag = response.status, response.headers.get("ETag")
+    except HTTPError as e:
+        status, tag = e.code, e.headers.get("ETag")
+    return status, tag, time.perf_counter() - start
+
+
+def run_level(base: str, concurrency: int, requests: int, etags: dict) -> dict:
+    rng = random.Random(concurrency)
+    urls = [f"{base}/recs?exclude_last_n={rng.choice(EXCLUDE_VARIANTS)}" for _ in range(requests)]
+    revalidate = [rng.random() < REVALIDATE_SHARE for _ in range(requests)]
+
+    def one(i: int) -> tuple:
+        url = urls[i]
+        status, tag, seconds = fetch(url, etags.get(url) if revalidate[i] else None)
+        if tag:
+            etags[url] = tag
+        return status, seconds
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies = [s for _, s in results]
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    statuses = [st for st, _ in results]
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "requests_per_second": requests / elapsed,
+        "not_modified_rate": statuses.count(304) / requests,
+        "errors": sum(1 for st in statuses if st not in (200, 304)),
+    }
+
+
+def run(base: str, requests_per_level: int = 200) -> dict:
+    etags: dict = {}
+    for exclude in EXCLUDE_VARIANTS: # warm the per-variant caches so levels compare steady state
+        fetch(f"{base}/recs?exclude_last_n={exclude}")
+    levels = [run_level(base, c, max(requests_per_level, c), etags) for c in CONCURRENCY_LEVELS]
+    with urlopen(f"{base}/healthz") as response:
+        health = response.read().decode()
+    return {"url": base, "levels": levels, "healthz": health}
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    url = None
+    if "--url" in args:
+        i = args.index("--url")
+        url = args[i + 1].rstrip("/")
+        del args[i:i + 2]
+    requests_per_level = int(args[0]) if args else 200
+    server = None
+    if url is None:
+        port = free_port()
+        server = start_server(port)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        r = run(url, requests_per_level)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+    for level in r["levels"]:
+        print(f"concurrency {level['concurrency']:>3}: p50 {level['p50_ms']:7.1f} ms, p99 {level['p99_ms']:7.1f} ms, "
+              f"{level['requests_per_second']:6.1f}/s, {level['not_modified_rate']:.0%} 304, {level['errors']} errors")
+    print(f"batching: {r['healthz']}")
+    print(f"saved to {save_results('recs_api', r)}")
@@ -0,0 +1,102 @@
+"""
+Load test for the multi-vendor dashboard: hundreds of concurrent vendor sessions, each picking a
+vendor (Zipf-skewed, as a few busy vendors log in far more than the long tail) and running every
+dashboard query against the shared SalesService.
+
+    python benchmarks/load_sales_service.py [vendors] [sessions] [cache_size]
+"""
+import sys
+import time
+import random
+import tempfile
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from _harness import save_results
+from bench_sales_cube import cube_charts, synthetic_sales
+from sales_service import SalesService, partition_sales
+
+RERUNS_PER_SESSION = 5
+
+
+def current_rss_bytes() -> int:
+    """Resident set size now (Linux); 0 where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * 4096
+    except OSError:
+        return 0
+
+
+def write_partitions(root: Path, vendors: int, years: int = 1, orders_per_hour: float = 1.0) -> int:
+    frames = []
+    for v in range(vendors):
+        df = synthetic_sales(years, orders_per_hour * (0.5 + (v % 4)), seed=v)
+        frames.append(df.assign(vendor_id=f"vendor_{v:04d}", vendor_name=f"Vendor {v}"))
+    sales = pd.concat(frames, ignore_index=True)
+    partition_sales(sales, root)
+    return len(sales)
+
+
+def session(service: SalesService, vendor_id: str, seed: int) -> list:
+    """One dashboard session: open the vendor's page, then a few date-range reruns."""
+    rng = random.Random(seed)
+    latencies = []
+    for rerun in range(RERUNS_PER_SESSION):
+        start_t = time.perf_counter()
+        cube = service.cube(vendor_id)
+        first, last = cube.date_range
+        if rerun == 0:
+            cube_charts(cube)
+        else:
+            start = last - pd.Timedelta(days=rng.choice([7, 30, 90, 365]))
+            cube_charts(cube, max(start, first), last)
+        latencies.append(time.perf_counter() - start_t)
+    return latencies
+
+
+def run(vendors: int = 300, sessions: int = 500, cache_size: int = 64, workers: int = 32) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        orders = write_partitions(root, vendors)
+        service = SalesService(root, max_vendors=cache_size)
+        ids = service.vendors()
+        rng = np.random.default_rng(0)
+        picks = [ids[(k - 1) % len(ids)] for k in rng.zipf(1.3, sessions)]
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            latencies = [t for ts in pool.map(session, [service] * sessions, picks, range(sessions)) for t in ts]
+        elapsed = time.perf_counter() - start
+        stats = service.stats()
+        rss_after = current_rss_bytes()
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "vendors": vendors,
+        "orders": orders,
+        "sessions": sessions,
+        "concurrency": workers,
+        "cache_size": cache_size,
+        "requests": len(latencies),
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "requests_per_second": len(latencies) / elapsed,
+        "hit_rate": stats["hits"] / max(stats["hits"] + stats["misses"], 1),
+        **stats,
+        "added_rss": rss_after - rss_before,
+    }
+
+
+if __name__ == "__main__":
+    vendors = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    cache_size = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    r = run(vendors, sessions, cache_size)
+    print(f"{r['sessions']} sessions over {r['vendors']} vendors ({r['orders']:,} orders), {r['concurrency']} concurrent, LRU of {r['cache_size']}")
+    print(f"dashboard reruns: p50 {r['p50_ms']:.1f} ms, p95 {r['p95_ms']:.1f} ms, {r['requests_per_second']:.0f}/s")
+    print(f"cube cache: {r['hit_rate']:.1%} hits, {r['misses']} loads, {r['evictions']} evictions; RSS {r['added_rss'] / 1e6:+.0f} MB")
+    print(f"saved to {save_results('sales_service', r)}")
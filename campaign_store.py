@@ -0,0 +1,188 @@
+import sys
+import json
+import logging
+import sqlite3
+import datetime
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Union
+
+logger = logging.getLogger(__name__)
+
+# --- Paths ---
+DATA_DIR = Path(__file__).parent / "data"
+DEFAULT_DB_PATH = DATA_DIR / "campaigns.db"
+LEGACY_JSON_PATH = DATA_DIR / "campaigns_approved.json" # Pre-store format, migrated on first open
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    seq          INTEGER PRIMARY KEY AUTOINCREMENT,
+    campaign_id  TEXT NOT NULL UNIQUE,
+    vendor_name  TEXT,
+    category     TEXT,
+    timestamp    TEXT NOT NULL,
+    payload      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_campaigns_vendor_name ON campaigns(vendor_name);
+CREATE INDEX IF NOT EXISTS idx_campaigns_category ON campaigns(category);
+CREATE INDEX IF NOT EXISTS idx_campaigns_timestamp ON campaigns(timestamp);
+"""
+
+Timestamp = Union[str, datetime.datetime]
+
+
+def _normalize_timestamp(value: Optional[Timestamp]) -> str:
+    """ISO-8601 string in local naive time, so timestamps compare correctly as text in SQL."""
+    if value is None or value == "":
+        ts = datetime.datetime.now()
+    elif isinstance(value, datetime.datetime):
+        ts = value
+    else:
+        ts = datetime.datetime.fromisoformat(str(value))
+    if ts.tzinfo is not None:
+        ts = ts.astimezone().replace(tzinfo=None)
+    return ts.isoformat()
+
+
+class CampaignStore:
+    """
+    Approved campaigns in SQLite (WAL mode), replacing the single campaigns_approved.json array.
+
+    Every insert is its own transaction, so concurrent vendor sessions can approve campaigns
+    without clobbering each other, and readers never block writers. Rows carry a monotonically
+    increasing `seq`, which lets readers fetch only what is new via `since` / `since_seq`.
+    Connections are per thread, so one store instance can be shared across Streamlit sessions.
+    """
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_DB_PATH, legacy_json_path: Optional[Union[str, Path]] = LEGACY_JSON_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        is_new = not self.db_path.exists()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        if is_new and legacy_json_path and Path(legacy_json_path).exists():
+            self.migrate_from_json(legacy_json_path)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: autocommit, transactions are opened explicitly where needed
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row(campaign: Dict[str, Any]) -> tuple:
+        if not campaign.get("campaign_id"):
+            raise ValueError("campaign must have a campaign_id")
+        entry = {k: v for k, v in campaign.items() if k != "seq"}
+        entry["timestamp"] = _normalize_timestamp(entry.get("timestamp"))
+        return (
+            entry["campaign_id"],
+            entry.get("vendor_name"),
+            entry.get("category"),
+            entry["timestamp"],
+            json.dumps(entry, ensure_ascii=False, default=str),
+        )
+
+    def add(self, campaign: Dict[str, Any]) -> int:
+        """
+        Inserts (or replaces, for a re-approved campaign_id) one campaign atomically.
+
+        Returns:
+            The campaign's new `seq`.
+        """
+        cur = self._conn().execute(
+            "INSERT OR REPLACE INTO campaigns (campaign_id, vendor_name, category, timestamp, payload) VALUES (?, ?, ?, ?, ?)",
+            self._row(campaign),
+        )
+        return cur.lastrowid
+
+    def add_many(self, campaigns: Iterable[Dict[str, Any]], replace: bool = True) -> int:
+        """Inserts campaigns in one transaction; returns how many rows were written."""
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany(
+                f"{verb} INTO campaigns (campaign_id, vendor_name, category, timestamp, payload) VALUES (?, ?, ?, ?, ?)",
+                [self._row(c) for c in campaigns],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return conn.total_changes - before
+
+    def _select(self, where: str = "", params: tuple = (), order: str = "seq") -> List[Dict[str, Any]]:
+        """Campaign dicts as approved, plus their change-feed position under `seq`."""
+        rows = self._conn().execute(f"SELECT seq, payload FROM campaigns {where} ORDER BY {order}", params).fetchall()
+        return [{**json.loads(payload), "seq": seq} for seq, payload in rows]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Every campaign in approval order."""
+        return self._select()
+
+    def since(self, timestamp: Timestamp) -> List[Dict[str, Any]]:
+        """Campaigns with a timestamp strictly after `timestamp`, oldest first."""
+        return self._select("WHERE timestamp > ?", (_normalize_timestamp(timestamp),), order="timestamp, seq")
+
+    def since_seq(self, seq: int) -> List[Dict[str, Any]]:
+        """Campaigns written after change-feed position `seq` (see `latest_seq`)."""
+        return self._select("WHERE seq > ?", (seq,))
+
+    def by_vendor(self, vendor_name: str) -> List[Dict[str, Any]]:
+        return self._select("WHERE vendor_name = ?", (vendor_name,))
+
+    def by_category(self, category: str) -> List[Dict[str, Any]]:
+        return self._select("WHERE category = ?", (category,))
+
+    def latest_seq(self) -> int:
+        """Current change-feed position; cheap enough to poll."""
+        return self._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM campaigns").fetchone()[0]
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM campaigns").fetchone()[0]
+
+    def migrate_from_json(self, json_path: Union[str, Path] = LEGACY_JSON_PATH) -> int:
+        """
+        Imports a campaigns_approved.json array. Campaigns already in the store are kept as-is,
+        so running the migration twice is harmless. Records with an unparseable timestamp are
+        skipped and logged rather than aborting the import.
+
+        Returns:
+            The number of campaigns imported.
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            campaigns = json.load(f)
+        valid = []
+        for c in campaigns:
+            if not (isinstance(c, dict) and c.get("campaign_id")):
+                continue
+            try:
+                _normalize_timestamp(c.get("timestamp"))
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Skipping campaign {c['campaign_id']} in {json_path}: bad timestamp {c.get('timestamp')!r} ({e})")
+                continue
+            valid.append(c)
+        return self.add_many(valid, replace=False)
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# --- Migration entry point ---
+if __name__ == "__main__":
+    # python campaign_store.py [campaigns_approved.json] [campaigns.db]
+    json_path = Path(sys.argv[1]) if len(sys.argv) > 1 else LEGACY_JSON_PATH
+    db_path = Path(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_DB_PATH
+    store = CampaignStore(db_path, legacy_json_path=None)
+    imported = store.migrate_from_json(json_path)
+    print(f"Imported {imported} campaign(s) from {json_path} into {db_path} ({store.count()} total).")
@@ -0,0 +1,49 @@
+from typing import Tuple
+
+import pandas as pd
+
+ACTIVITY_PAGE = 100 # rows rendered at first and added by each "Show more"
+
+
+class ActivitySlice:
+    """
+    What one session sees of the shared recent-activity frame (data_access.load_activity).
+
+    The frame is built once per data version and shared read-only by every session; a session
+    keeps only these three ints and slices the rows it renders on each rerun, so per-session
+    memory doesn't grow with the transaction history.
+
+    hidden_n: newest transactions held back (the demo's "last n"); nothing is hidden when the
+        history isn't longer than that.
+    offset, limit: window of the remaining transactions that is rendered.
+    """
+    __slots__ = ("hidden_n", "offset", "limit")
+
+    def __init__(self, hidden_n: int = 0, offset: int = 0, limit: int = ACTIVITY_PAGE):
+        self.hidden_n = hidden_n
+        self.offset = offset
+        self.limit = limit
+
+    def hidden_count(self, df: pd.DataFrame) -> int:
+        return self.hidden_n if 0 < self.hidden_n < len(df) else 0
+
+    def bounds(self, df: pd.DataFrame) -> Tuple[int, int]:
+        """[start, stop) row range of `df` to render."""
+        start = self.hidden_count(df) + self.offset
+        return start, min(start + self.limit, len(df))
+
+    def rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """The rendered rows: a slice of the shared frame, not a copy (treat as read-only)."""
+        start, stop = self.bounds(df)
+        return df.iloc[start:stop]
+
+    def has_more(self, df: pd.DataFrame) -> bool:
+        return self.bounds(df)[1] < len(df)
+
+    def show_more(self, rows: int = ACTIVITY_PAGE) -> None:
+        self.limit += rows
+
+    def reveal_hidden(self) -> None:
+        """Shows the held-back transactions on top of the list."""
+        self.hidden_n = 0
+        self.offset = 0
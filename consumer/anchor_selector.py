@@ -0,0 +1,185 @@
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DAY_NS = 86_400 * 10**9
+# Counters are stored relative to a reference time; once a new transaction is this many time
+# constants ahead of it, everything is rescaled so the exponentials stay far from overflow
+RESCALE_AFTER_TAUS = 300.0
+
+FREQ_WEIGHT = 0.6
+SPEND_WEIGHT = 0.4
+
+
+def _days(timestamp) -> float:
+    return pd.Timestamp(timestamp).value / DAY_NS
+
+
+class AnchorSelector:
+    """
+    Exponentially-decayed visit frequency and spend per (merchant, category), for choosing the
+    recommendation anchors.
+
+    Each counter holds sum(w * exp(-(t_now - t) / tau)) over the pair's transactions. Rather than
+    re-decaying every counter whenever time moves on, counters are kept relative to a reference
+    time `t_ref` (stored value = sum(w * exp((t - t_ref) / tau))), so adding a transaction is a
+    single O(1) update. Rescaling to the latest timestamp is deferred until it is needed: when the
+    exponent would get large, or when decayed values are read. Anchor scores normalize by the
+    maximum counter, so ranking never needs the rescale at all.
+
+    Ages are continuous (fractional days). The engine used to floor them to whole days
+    (`.dt.days`), but a floored age depends on the current latest timestamp and cannot be
+    folded in incrementally. Pairs whose scores were close can therefore rank differently
+    than they used to, so the chosen anchors are not always identical to the old ones.
+    """
+    def __init__(self, tau_days: float = 3.0):
+        self.tau_days = tau_days
+        self._slots: Dict[Tuple[str, str], int] = {}
+        self._merchants: List[str] = []
+        self._categories: List[str] = []
+        self._freq: List[float] = []
+        self._spend: List[float] = []
+        self._ref: Optional[float] = None # reference time in days since the epoch
+        self.max_time: Optional[float] = None
+        self._lock = threading.Lock()
+        self._selected: Dict[int, List[Dict[str, str]]] = {} # k -> anchors, valid until the next update
+        self._version = 0 # bumped by every update
+        self.rows_seen = 0
+        self._last_row: Optional[Tuple] = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, tau_days: float = 3.0) -> "AnchorSelector":
+        selector = cls(tau_days)
+        selector.add_frame(df)
+        return selector
+
+    def _slot(self, merchant: str, category: str) -> int:
+        slot = self._slots.get((merchant, category))
+        if slot is None:
+            slot = self._slots[(merchant, category)] = len(self._freq)
+            self._merchants.append(merchant)
+            self._categories.append(category)
+            self._freq.append(0.0)
+            self._spend.append(0.0)
+        return slot
+
+    def _rescale(self, ref: float) -> None:
+        """Moves the reference time to `ref`, decaying every stored counter accordingly."""
+        if self._ref is not None and self._freq:
+            factor = math.exp(-(ref - self._ref) / self.tau_days)
+            self._freq = (np.asarray(self._freq) * factor).tolist()
+            self._spend = (np.asarray(self._spend) * factor).tolist()
+        self._ref = ref
+
+    def _changed(self) -> None:
+        self._version += 1
+        self._selected.clear()
+
+    # ---------- Updates ---------- #
+    def add(self, timestamp, merchant: str, category: str, amount: float) -> None:
+        """Folds one transaction into its pair's counters in O(1) (amortized over rare rescales)."""
+        t = _days(timestamp)
+        with self._lock:
+            if self._ref is None or (t - self._ref) / self.tau_days > RESCALE_AFTER_TAUS:
+                self._rescale(t)
+            weight = math.exp((t - self._ref) / self.tau_days)
+            slot = self._slot(merchant, category)
+            self._freq[slot] += weight
+            self._spend[slot] += weight * abs(amount)
+            self.max_time = t if self.max_time is None else max(self.max_time, t)
+            self.rows_seen += 1
+            self._last_row = (timestamp, merchant, category, amount)
+            self._changed()
+
+    def add_frame(self, df: pd.DataFrame) -> None:
+        """Folds a batch of transactions (timestamp, merchant_name, category, amount) in, vectorized."""
+        if df.empty:
+            return
+        t = df["timestamp"].to_numpy(dtype="datetime64[ns]").astype(np.int64) / DAY_NS
+        with self._lock:
+            batch_max = float(t.max())
+            if self._ref is None or (batch_max - self._ref) / self.tau_days > RESCALE_AFTER_TAUS:
+                self._rescale(batch_max)
+            weight = np.exp((t - self._ref) / self.tau_days)
+            grouped = pd.DataFrame({
+                "merchant_name": df["merchant_name"].to_numpy(),
+                "category": df["category"].to_numpy(),
+                "freq": weight,
+                "spend": weight * np.abs(df["amount"].to_numpy(dtype=np.float64)),
+            }).groupby(["merchant_name", "category"], sort=False)[["freq", "spend"]].sum()
+            for (merchant, category), freq, spend in zip(grouped.index, grouped["freq"], grouped["spend"]):
+                slot = self._slot(merchant, category)
+                self._freq[slot] += freq
+                self._spend[slot] += spend
+            self.max_time = batch_max if self.max_time is None else max(self.max_time, batch_max)
+            self.rows_seen += len(df)
+            self._last_row = tuple(df[["timestamp", "merchant_name", "category", "amount"]].iloc[-1])
+            self._changed()
+
+    def sync(self, df: pd.DataFrame) -> None:
+        """
+        Brings the counters up to date with the full current frame `df` (oldest first).
+        If `df` only grew, just the new rows are added; otherwise the counters are rebuilt.
+        """
+        n = self.rows_seen
+        is_prefix = n <= len(df) and (n == 0 or tuple(df[["timestamp", "merchant_name", "category", "amount"]].iloc[n - 1]) == self._last_row)
+        if not is_prefix:
+            with self._lock:
+                self._slots.clear()
+                self._merchants, self._categories, self._freq, self._spend = [], [], [], []
+                self._ref = self.max_time = None
+                self.rows_seen = 0
+                self._last_row = None
+                self._changed()
+            n = 0
+        self.add_frame(df.iloc[n:])
+
+    # ---------- Queries ---------- #
+    def stats(self) -> pd.DataFrame:
+        """Decayed counters as of the latest transaction (columns: merchant_name, category, freq, spend)."""
+        with self._lock:
+            if self.max_time is not None and self._ref != self.max_time:
+                self._rescale(self.max_time)
+            return pd.DataFrame({
+                "merchant_name": self._merchants,
+                "category": self._categories,
+                "freq": self._freq,
+                "spend": self._spend,
+            })
+
+    def select(self, k: int = 5) -> List[Dict[str, str]]:
+        """
+        The top pair per category by 0.6 * normalized frequency + 0.4 * normalized spend, best
+        categories first, at most `k` of them. Memoized until the next update.
+        """
+        with self._lock:
+            cached = self._selected.get(k)
+            if cached is not None:
+                return cached
+            freq = np.asarray(self._freq)
+            spend = np.asarray(self._spend)
+            merchants, categories = list(self._merchants), list(self._categories)
+            version = self._version
+        if not len(freq):
+            return []
+        # Normalizing by the max cancels the reference-time scale, so no rescale is needed here
+        freq_norm = freq / freq.max() if freq.max() > 0 else freq
+        spend_norm = spend / spend.max() if spend.max() > 0 else spend
+        stats = pd.DataFrame({
+            "merchant_name": merchants,
+            "category": categories,
+            "score": FREQ_WEIGHT * freq_norm + SPEND_WEIGHT * spend_norm,
+        })
+        best = stats.loc[stats.groupby("category", sort=False)["score"].idxmax()]
+        best = best.sort_values("score", ascending=False, kind="stable").head(k)
+        anchors = [{"merchant": m, "category": c} for m, c in zip(best["merchant_name"], best["category"])]
+        with self._lock:
+            if self._version == version:
+                self._selected[k] = anchors
+        return anchors
+
+    def __len__(self) -> int:
+        return len(self._freq)
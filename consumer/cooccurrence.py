@@ -0,0 +1,193 @@
+"""
+Item-item co-occurrence ("people who shop at X also use Y") from a multi-user transaction log.
+
+A binary users x merchants CSR matrix X is multiplied by its transpose in row blocks of merchants;
+each block's co-shopper counts are turned into cosine similarities and cut to the top-K
+neighbours per merchant, so the full merchants x merchants product never exists in memory.
+The result is stored as two (merchants x K) arrays and looked up per recommendation in O(1).
+
+    python consumer/cooccurrence.py LOG.csv [--out data/cooccurrence.npz] [--k 50]
+
+LOG.csv needs user_id and merchant_name columns.
+"""
+import time
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+logger = logging.getLogger(__name__)
+
+# --- Defaults ---
+TOP_K = 50 # neighbours kept per merchant
+MIN_COOCCURRENCE = 2 # pairs seen together by fewer users are noise
+MAX_BLOCK_NNZ = 50_000_000 # bound on co-occurrence entries materialized per block (~600 MB)
+READ_CHUNK_ROWS = 5_000_000
+
+
+def user_merchant_matrix(user_codes: np.ndarray, merchant_codes: np.ndarray, users: int, merchants: int) -> sp.csr_matrix:
+    """Binary users x merchants matrix: 1 where the user has at least one transaction at the merchant."""
+    X = sp.csr_matrix(
+        (np.ones(len(user_codes), dtype=np.float32), (user_codes, merchant_codes)), shape=(users, merchants)
+    )
+    X.sum_duplicates()
+    X.data[:] = 1.0
+    return X
+
+
+def _row_blocks(estimate: np.ndarray, max_nnz: int) -> Iterator[Tuple[int, int]]:
+    """[start, stop) merchant ranges whose estimated output entries stay under max_nnz (at least one row each)."""
+    start, total = 0, 0
+    for row, n in enumerate(estimate):
+        if row > start and total + n > max_nnz:
+            yield start, row
+            start, total = row, 0
+        total += n
+    if start < len(estimate):
+        yield start, len(estimate)
+
+
+def top_k_cosine(
+    X: sp.csr_matrix, k: int = TOP_K, min_cooccurrence: int = MIN_COOCCURRENCE, max_block_nnz: int = MAX_BLOCK_NNZ
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k cosine neighbours of every column (merchant) of a binary users x merchants matrix.
+
+    Returns:
+        (neighbors, scores): int32 and float32 arrays of shape (merchants, k), best first; rows
+        with fewer than k neighbours are padded with -1 / 0.
+    """
+    merchants = X.shape[1]
+    XT = X.T.tocsr() # merchants x users
+    users_per_merchant = np.asarray(X.sum(axis=0)).ravel()
+    norms = np.sqrt(users_per_merchant)
+    # A merchant's output row has at most min(merchants, sum of its users' merchant counts) entries
+    estimate = np.minimum(XT @ np.asarray(X.sum(axis=1)).ravel(), merchants)
+    neighbors = np.full((merchants, k), -1, dtype=np.int32)
+    scores = np.zeros((merchants, k), dtype=np.float32)
+    for start, stop in _row_blocks(estimate, max_block_nnz):
+        block = (XT[start:stop] @ X).tocoo() # co-shopper counts, (stop - start) x merchants
+        rows, cols, counts = block.row, block.col, block.data
+        keep = (counts >= min_cooccurrence) & (cols != rows + start)
+        rows, cols = rows[keep], cols[keep]
+        sims = counts[keep] / (norms[rows + start] * norms[cols])
+        # Best first within each row, then the first k of every row
+        order = np.lexsort((cols, -sims, rows))
+        rows, cols, sims = rows[order], cols[order], sims[order]
+        row_starts = np.searchsorted(rows, np.arange(stop - start))
+        rank = np.arange(len(rows)) - row_starts[rows]
+        top = rank < k
+        neighbors[rows[top] + start, rank[top]] = cols[top]
+        scores[rows[top] + start, rank[top]] = sims[top]
+    return neighbors, scores
+
+
+class CooccurrenceIndex:
+    """
+    Precomputed top-K co-occurrence neighbours per merchant.
+
+    Merchant names are matched case-insensitively, like vendor names elsewhere in the engine.
+    """
+    def __init__(self, merchants: Sequence[str], neighbors: np.ndarray, scores: np.ndarray):
+        self.merchants = np.asarray(merchants, dtype=object)
+        self.neighbors = neighbors
+        self.scores = scores
+        self._index: Dict[str, int] = {}
+        for i, name in enumerate(self.merchants):
+            self._index.setdefault(str(name).lower(), i)
+
+    @classmethod
+    def from_codes(
+        cls,
+        user_codes: np.ndarray,
+        merchant_codes: np.ndarray,
+        merchants: Sequence[str],
+        users: Optional[int] = None,
+        k: int = TOP_K,
+        min_cooccurrence: int = MIN_COOCCURRENCE,
+        max_block_nnz: int = MAX_BLOCK_NNZ,
+    ) -> "CooccurrenceIndex":
+        """From integer (user, merchant) pairs; `merchants[i]` names merchant code i."""
+        start = time.perf_counter()
+        users = users if users is not None else int(user_codes.max()) + 1 if len(user_codes) else 0
+        X = user_merchant_matrix(user_codes, merchant_codes, users, len(merchants))
+        neighbors, scores = top_k_cosine(X, k, min_cooccurrence, max_block_nnz)
+        logger.info(f"cooccurrence: {users:,} users x {len(merchants):,} merchants ({X.nnz:,} pairs) in {time.perf_counter() - start:.1f}s")
+        return cls(merchants, neighbors, scores)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, **kwargs) -> "CooccurrenceIndex":
+        """From a transaction frame with user_id and merchant_name columns."""
+        pairs = df[["user_id", "merchant_name"]].drop_duplicates()
+        user_codes, _ = pd.factorize(pairs["user_id"])
+        merchant_codes, merchants = pd.factorize(pairs["merchant_name"])
+        return cls.from_codes(user_codes, merchant_codes, list(merchants), **kwargs)
+
+    @classmethod
+    def from_csv(cls, path: Union[str, Path], chunk_rows: int = READ_CHUNK_ROWS, **kwargs) -> "CooccurrenceIndex":
+        """Streams the log in chunks, keeping only distinct (user, merchant) pairs in memory."""
+        chunks = [
+            chunk.drop_duplicates()
+            for chunk in pd.read_csv(path, usecols=["user_id", "merchant_name"], dtype=str, chunksize=chunk_rows)
+        ]
+        pairs = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=["user_id", "merchant_name"])
+        return cls.from_frame(pairs, **kwargs)
+
+    # ---------- Storage ---------- #
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        tmp = path.with_name(f".{path.stem}.tmp.npz")
+        np.savez(tmp, merchants=self.merchants.astype(str), neighbors=self.neighbors, scores=self.scores)
+        tmp.replace(path) # readers never see a half-written file
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CooccurrenceIndex":
+        with np.load(path) as data:
+            return cls(data["merchants"].tolist(), data["neighbors"], data["scores"])
+
+    # ---------- Lookups ---------- #
+    def __len__(self) -> int:
+        return len(self.merchants)
+
+    def __contains__(self, merchant: str) -> bool:
+        return merchant.lower() in self._index
+
+    def similar(self, merchant: str, n: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Best co-shopped merchants of `merchant` with their cosine, best first; [] if unknown."""
+        row = self._index.get(merchant.lower())
+        if row is None:
+            return []
+        found = self.neighbors[row] >= 0
+        pairs = [(str(self.merchants[j]), float(s)) for j, s in zip(self.neighbors[row][found], self.scores[row][found])]
+        return pairs[:n] if n is not None else pairs
+
+    def scores_for(self, merchant: str, names: Sequence[str]) -> np.ndarray:
+        """Co-occurrence of `merchant` with each of `names` (0 where they were never co-shopped)."""
+        row = self._index.get(merchant.lower())
+        out = np.zeros(len(names))
+        if row is None:
+            return out
+        found = self.neighbors[row] >= 0
+        by_neighbor = dict(zip(self.neighbors[row][found].tolist(), self.scores[row][found].tolist()))
+        for i, name in enumerate(names):
+            j = self._index.get(name.lower())
+            if j is not None:
+                out[i] = by_neighbor.get(j, 0.0)
+        return out
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", type=Path)
+    parser.add_argument("--out", type=Path, default=Path(__file__).parent.parent / "data" / "cooccurrence.npz")
+    parser.add_argument("--k", type=int, default=TOP_K)
+    parser.add_argument("--min-cooccurrence", type=int, default=MIN_COOCCURRENCE)
+    args = parser.parse_args()
+    index = CooccurrenceIndex.from_csv(args.log, k=args.k, min_cooccurrence=args.min_cooccurrence)
+    print(f"{len(index):,} merchants -> {index.save(args.out)}")
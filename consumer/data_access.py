@@ -0,0 +1,295 @@
+import logging
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+import metrics
+import json_stream
+import point_transactions
+from anchor_selector import AnchorSelector
+from cooccurrence import CooccurrenceIndex
+from merchant_index import MerchantIndex
+from savings_rollups import SavingsRollups
+from transaction_query import TransactionIndex
+
+logger = logging.getLogger(__name__)
+
+CACHE_LOOKUPS = metrics.counter("data_cache_lookups_total", "File-backed cache lookups by dataset and result (hit, miss).", ["name", "result"])
+
+# -------- Data files shared by the consumer pages -------- #
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+TRANSACTIONS_FILE = DATA_DIR / "final_data.csv"
+VENDORS_FILE = DATA_DIR / "partner_vendors.json"
+POINT_TRANSACTIONS_FILE = DATA_DIR / "revpoint_transactions.json"
+COOCCURRENCE_FILE = DATA_DIR / "cooccurrence.npz" # built by consumer/cooccurrence.py from a multi-user log
+
+PathLike = Union[str, Path]
+
+# Entries kept per cached dataset; datasets keyed by request parameters (e.g. exclude_last_n)
+# keep only the most recently used ones instead of one per value ever requested
+MAX_ENTRIES_PER_NAME = 8
+
+
+def file_version(path: PathLike) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it doesn't exist. Changes whenever the file is rewritten."""
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _FileCache:
+    """
+    Process-wide cache of values derived from data files.
+
+    Streamlit imports this module once per server process, so entries are shared by every
+    session. Each entry is keyed by name + arguments and stamped with the version of the files
+    it was built from; a changed file means a miss and a rebuild, and only the latest version
+    is kept. Each name keeps at most `max_entries` argument sets, least recently used evicted
+    first. Cached values are shared: callers must treat them as read-only.
+    """
+    def __init__(self, max_entries: int = MAX_ENTRIES_PER_NAME):
+        self.max_entries = max_entries
+        self._entries: Dict[str, "OrderedDict[Tuple, Tuple[Tuple, Any]]"] = {}
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+    def get(self, name: str, paths: Sequence[PathLike], build: Callable[..., Any], *args: Any) -> Any:
+        key = (name, tuple(str(p) for p in paths), args)
+        version = tuple(file_version(p) for p in paths)
+        with self._lock:
+            entry = self._lookup(name, key, version)
+            if entry is not None:
+                return entry[1]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Build outside the global lock; the per-key lock stops concurrent sessions building the same thing twice
+        with key_lock:
+            with self._lock:
+                entry = self._lookup(name, key, version)
+                if entry is not None:
+                    return entry[1]
+            value = build(*args)
+            with self._lock:
+                entries = self._entries.setdefault(name, OrderedDict())
+                entries[key] = (version, value)
+                entries.move_to_end(key)
+                while len(entries) > self.max_entries:
+                    evicted, _ = entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+                self.misses[name] = self.misses.get(name, 0) + 1
+            CACHE_LOOKUPS.inc(name=name, result="miss")
+            logger.info(f"data_access: built '{name}' for {[str(p) for p in paths]}")
+            return value
+
+    def _lookup(self, name: str, key: Tuple, version: Tuple) -> Optional[Tuple[Tuple, Any]]:
+        # Caller holds self._lock
+        entries = self._entries.get(name)
+        entry = entries.get(key) if entries is not None else None
+        if entry is None or entry[0] != version:
+            return None
+        entries.move_to_end(key)
+        self.hits[name] = self.hits.get(name, 0) + 1
+        CACHE_LOOKUPS.inc(name=name, result="hit")
+        return entry
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            names = set(self.hits) | set(self.misses)
+            return {n: {"hits": self.hits.get(n, 0), "misses": self.misses.get(n, 0)} for n in sorted(names)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits.clear()
+            self.misses.clear()
+
+
+_cache = _FileCache()
+
+
+def cached_on_files(name: str, paths: Sequence[PathLike], build: Callable[..., Any], *args: Any) -> Any:
+    """Returns `build(*args)`, cached until any of `paths` changes on disk."""
+    return _cache.get(name, paths, build, *args)
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters per cached dataset, e.g. {'vendors': {'hits': 12, 'misses': 1}}."""
+    return _cache.stats()
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+# -------- Card transactions (final_data.csv) -------- #
+def _read_transactions(path: str) -> pd.DataFrame:
+    return pd.read_csv(path, parse_dates=["timestamp"])
+
+
+def load_transactions(path: PathLike = TRANSACTIONS_FILE) -> pd.DataFrame:
+    """All card transactions with a parsed `timestamp` column (shared, read-only)."""
+    return cached_on_files("transactions", [path], _read_transactions, str(path))
+
+
+def _format_activity(path: str) -> pd.DataFrame:
+    df = load_transactions(path).rename(columns={"timestamp": "date", "merchant_name": "name"})
+    df["date_str"] = df["date"].dt.strftime("%Y-%m-%d")
+    df["date_fmt"] = df["date"].dt.strftime("%d %b %Y") # as displayed, so sessions don't reformat on every rerun
+    df = df[["date_str", "name", "amount", "date_fmt"]].rename(columns={"date_str": "date"})
+    # Sort by date descending
+    return df.sort_values("date", ascending=False).reset_index(drop=True)
+
+
+def load_activity(path: PathLike = TRANSACTIONS_FILE) -> pd.DataFrame:
+    """
+    Transactions formatted for the home page's recent activity list: date (str), name, amount,
+    date_fmt (display date); newest first. One frame per CSV version, shared by every session.
+    """
+    return cached_on_files("activity", [path], _format_activity, str(path))
+
+
+_merchant_indexes: Dict[str, MerchantIndex] = {}
+
+
+def _sync_merchant_index(path: str) -> MerchantIndex:
+    # One long-lived index per file: only lines appended to the CSV since the last sync are parsed
+    # and folded in, a rewritten file rebuilds it
+    index = _merchant_indexes.setdefault(path, MerchantIndex())
+    index.sync_file(path)
+    return index
+
+
+def load_merchant_index(path: PathLike = TRANSACTIONS_FILE) -> MerchantIndex:
+    """Per-merchant totals, visit counts and recent transactions, kept in step with the CSV."""
+    return cached_on_files("merchant_index", [path], _sync_merchant_index, str(path))
+
+
+def load_transaction_index(path: PathLike = TRANSACTIONS_FILE) -> TransactionIndex:
+    """Newest-first keyset index over the transactions for paginated, filtered queries."""
+    return cached_on_files("transaction_index", [path], lambda p: TransactionIndex(load_transactions(p)), str(path))
+
+
+# Bounded like the cache entries: one selector per recently used (file, exclude_last_n)
+_anchor_selectors: "OrderedDict[Tuple[str, int], AnchorSelector]" = OrderedDict()
+_anchor_selectors_lock = threading.Lock()
+
+
+def _sync_anchor_selector(path: str, exclude_last_n: int) -> AnchorSelector:
+    # Oldest first, so rows appended to the CSV (and rows leaving the excluded newest-n window)
+    # extend the frame and only they are folded into the long-lived counters
+    df = load_transactions(path)[["timestamp", "merchant_name", "category", "amount"]]
+    df = df.sort_values("timestamp", kind="stable")
+    if exclude_last_n > 0 and len(df) > exclude_last_n:
+        df = df.iloc[:len(df) - exclude_last_n]
+    with _anchor_selectors_lock:
+        selector = _anchor_selectors.setdefault((path, exclude_last_n), AnchorSelector())
+        _anchor_selectors.move_to_end((path, exclude_last_n))
+        while len(_anchor_selectors) > MAX_ENTRIES_PER_NAME:
+            _anchor_selectors.popitem(last=False)
+    selector.sync(df)
+    return selector
+
+
+def load_anchor_selector(path: PathLike = TRANSACTIONS_FILE, exclude_last_n: int = 0) -> AnchorSelector:
+    """Decayed merchant/category counters for recommendation anchors, ignoring the newest `exclude_last_n` transactions."""
+    return cached_on_files("anchor_selector", [path], _sync_anchor_selector, str(path), exclude_last_n)
+
+
+def _read_cooccurrence(path: str) -> Optional[CooccurrenceIndex]:
+    return CooccurrenceIndex.load(path) if Path(path).exists() else None
+
+
+def load_cooccurrence(path: PathLike = COOCCURRENCE_FILE) -> Optional[CooccurrenceIndex]:
+    """Top-K co-shopped merchants per merchant, or None when no index has been built."""
+    return cached_on_files("cooccurrence", [path], _read_cooccurrence, str(path))
+
+
+# -------- Partner vendors (partner_vendors.json / .jsonl) -------- #
+# Field sets the pages need, so large unused fields (e.g. "About" on Explore) are never materialized
+VENDOR_CARD_FIELDS = ("vendor_id", "vendor_name", "image_url", "offer_details")
+VENDOR_PAGE_FIELDS = VENDOR_CARD_FIELDS + ("vendor_description", "website", "url", "About")
+
+Columns = Optional[Sequence[str]]
+
+
+def _read_records(path: str, columns: Optional[Tuple[str, ...]]) -> List[Any]:
+    return json_stream.load_records(path, columns)
+
+
+def load_vendors(path: PathLike = VENDORS_FILE, columns: Columns = None) -> List[Dict[str, Any]]:
+    """
+    Partner vendor records (shared, read-only), streamed from the JSON Lines copy when there is
+    an up-to-date one. With `columns`, each record only holds those fields.
+    """
+    source = json_stream.preferred_path(path)
+    return cached_on_files("vendors", [source], _read_records, str(source), tuple(columns) if columns else None)
+
+
+def vendors_by_id(path: PathLike = VENDORS_FILE, columns: Columns = None) -> Dict[str, Dict[str, Any]]:
+    source = json_stream.preferred_path(path)
+    build = lambda p, c: {v["vendor_id"]: v for v in load_vendors(p, c)}
+    return cached_on_files("vendors_by_id", [source], build, str(path), tuple(columns) if columns else None)
+
+
+def vendors_by_name(path: PathLike = VENDORS_FILE, columns: Columns = None) -> Dict[str, Dict[str, Any]]:
+    source = json_stream.preferred_path(path)
+    build = lambda p, c: {v["vendor_name"]: v for v in load_vendors(p, c)}
+    return cached_on_files("vendors_by_name", [source], build, str(path), tuple(columns) if columns else None)
+
+
+# -------- Point transactions (revpoint_transactions.json / .jsonl) -------- #
+_point_rejections: Dict[str, Counter] = {}
+
+
+def _read_point_transactions(path: str) -> pd.DataFrame:
+    rejections = _point_rejections[path] = Counter()
+    return point_transactions.load_point_transactions(path, rejections)
+
+
+def load_point_transactions(path: PathLike = POINT_TRANSACTIONS_FILE) -> pd.DataFrame:
+    """Validated point transactions with month and paid_amount columns; empty if nothing valid (shared, read-only)."""
+    source = json_stream.preferred_path(path)
+    return cached_on_files("point_transactions", [source], _read_point_transactions, str(source))
+
+
+def point_transaction_rejections(path: PathLike = POINT_TRANSACTIONS_FILE) -> Dict[str, int]:
+    """Invalid records skipped per reason on the last read of `path`, e.g. {'invalid_money_saved': 3}."""
+    source = json_stream.preferred_path(path)
+    return {reason: n for reason, n in _point_rejections.get(str(source), Counter()).items() if n}
+
+
+_savings_rollups: Dict[str, Tuple[SavingsRollups, point_transactions.ReadCursor]] = {}
+
+
+def _sync_savings_rollups(path: str) -> SavingsRollups:
+    # One long-lived rollup per file, fed chunk by chunk so memory stays bounded on large histories.
+    # Only records appended since the last sync are read (a .jsonl resumes at a byte offset) and
+    # aggregated; a rewritten file rebuilds the rollups from the start.
+    rollups, cursor = _savings_rollups.setdefault(path, (SavingsRollups(), point_transactions.ReadCursor()))
+    source = str(json_stream.preferred_path(path))
+    rejections = Counter()
+    try:
+        for chunk in point_transactions.iter_appended(source, cursor, rejections=rejections):
+            rollups.append(chunk)
+    except point_transactions.HistoryRewritten as e:
+        logger.info(f"data_access: rebuilding savings rollups ({e})")
+        rollups.reset()
+        cursor.reset()
+        _point_rejections.pop(source, None)
+        for chunk in point_transactions.iter_appended(source, cursor, rejections=rejections):
+            rollups.append(chunk)
+    point_transactions.log_rejections(source, rejections)
+    _point_rejections.setdefault(source, Counter()).update(rejections)
+    return rollups
+
+
+def load_savings_rollups(path: PathLike = POINT_TRANSACTIONS_FILE) -> SavingsRollups:
+    """Month x vendor savings rollups, kept in step with the point-transaction file."""
+    return cached_on_files("savings_rollups", [json_stream.preferred_path(path)], _sync_savings_rollups, str(path))
@@ -1,11 +1,19 @@
 import os
+import sys
 import json
+import time
 import argparse
 import re
 import requests
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Iterator
 from urllib.parse import quote_plus
 from openai import OpenAI
 from tqdm import tqdm   # ← progress bar
+if __name__ == "__main__": # run as a script: make the project root (metrics.py) importable
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+import metrics
 
 # ─────────────── Configuration ───────────────
 PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY", "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")
@@ -16,6 +24,26 @@ PIXABAY_API_KEY = os.getenv("PIXABAY_API_KEY", "48341946-7f8ff43596cf2384ad9e1d6
 if not PIXABAY_API_KEY:
     raise RuntimeError("Please set your PIXABAY_API_KEY environment variable")
 
+# ─────────────── Metrics ───────────────
+ENRICH_REQUESTS = metrics.counter("vendor_enrichment_requests_total", "Enrichment API calls by api (perplexity, pixabay) and status (ok, error).", ["api", "status"])
+ENRICH_SECONDS = metrics.histogram("vendor_enrichment_request_seconds", "Seconds per enrichment API call.", ["api"])
+
+
+@contextmanager
+def _api_call(api: str) -> Iterator[None]:
+    """Times an external API call and counts it as ok or error."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        ENRICH_REQUESTS.inc(api=api, status="error")
+        raise
+    else:
+        ENRICH_REQUESTS.inc(api=api, status="ok")
+    finally:
+        ENRICH_SECONDS.observe(time.perf_counter() - start, api=api)
+
+
 client = OpenAI(
     api_key=PERPLEXITY_API_KEY,
     base_url="https://api.perplexity.ai",
@@ -36,22 +64,23 @@ def _chat(system_prompt: str, user_prompt: str, stream: bool = False) -> str:
         {"role": "system", "content": system_prompt},
         {"role": "user",   "content": user_prompt},
     ]
-    resp = client.chat.completions.create(
-        model="sonar-pro",
-        messages=messages,
-        stream=stream,
-    )
-
-    raw = ""
-    if stream:
-        for chunk in resp:
-            delta = chunk.choices[0].delta
-            if hasattr(delta, "content") and delta.content:
-                print(delta.content, end="", flush=True)
-                raw += delta.content
-        print()
-    else:
-        raw = resp.choices[0].message.content
+    with _api_call("perplexity"):
+        resp = client.chat.completions.create(
+            model="sonar-pro",
+            messages=messages,
+            stream=stream,
+        )
+
+        raw = ""
+        if stream:
+            for chunk in resp:
+                delta = chunk.choices[0].delta
+                if hasattr(delta, "content") and delta.content:
+                    print(delta.content, end="", flush=True)
+                    raw += delta.content
+            print()
+        else:
+            raw = resp.choices[0].message.content
 
     # Strip markdown fences
     raw = re.sub(r"^```(?:json)?\s*", "", raw)
@@ -88,9 +117,10 @@ def fetch_vendor_logo(vendor: str, category: str) -> str:
         f"&per_page=3"
         f"&safesearch=true"
     )
-    resp = requests.get(url)
-    resp.raise_for_status()
-    data = resp.json()
+    with _api_call("pixabay"):
+        resp = requests.get(url)
+        resp.raise_for_status()
+        data = resp.json()
     hits = data.get("hits", [])
     if not hits:
         return ""
@@ -131,5 +161,12 @@ if __name__ == "__main__":
     parser.add_argument("input",  help="Path to input JSON file")
     parser.add_argument("output", help="Path to output enriched JSON file")
     parser.add_argument("--stream", action="store_true", help="Show streaming output")
+    parser.add_argument("--metrics-out", help="Write the run's Perplexity / Pixabay metrics (Prometheus text format) here when it ends")
     args = parser.parse_args()
-    main(args.input, args.output, args.stream)
\ No newline at end of file
+    metrics.serve_from_env() # scrapeable while the run lasts when METRICS_PORT is set
+    try:
+        main(args.input, args.output, args.stream)
+    finally:
+        if args.metrics_out:
+            Path(args.metrics_out).write_text(metrics.REGISTRY.render(), encoding="utf-8")
+            print(f"📈 Metrics written to {args.metrics_out}")
\ No newline at end of file
@@ -1,9 +1,13 @@
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
 import streamlit as st
 import pandas as pd
 from urllib.parse import quote_plus
-from pathlib import Path
-import base64
 import os
+from data_access import load_activity
+from activity_view import ActivitySlice
+from asset_cache import asset_src, img_tag
 
 # -------- Paths to local assets -------- #
 ASSETS_PATH = Path(__file__).parent / "assets"
@@ -12,15 +16,6 @@ LOGO_FILE = ASSETS_PATH / "revolut_logo.png"
 PROFILE_FILE = ASSETS_PATH / "user.png"
 
 CSV_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "final_data.csv")
-# ---------- Helper to inline images as <img> tags ---------- #
-
-def img_tag(path: Path, height: int) -> str:
-    if not path.exists():
-        return ""
-    mime = "image/png" if path.suffix.lower() == ".png" else "image/jpeg"
-    data = base64.b64encode(path.read_bytes()).decode()
-    return f'<img src="data:{mime};base64,{data}" height="{height}">'  # noqa: E501
-
 # ---------- Page config ---------- #
 
 st.set_page_config(
@@ -70,40 +65,19 @@ if "balance" not in st.session_state:
 N_INIT = 50
 
 if os.path.exists(CSV_FILE):
-    # Read transactions from CSV
-    df = pd.read_csv(
-        CSV_FILE,
-        parse_dates=["timestamp"]
-    )
-    # Rename and format date
-    df = df.rename(
-        columns={
-            "timestamp": "date",
-            "merchant_name": "name",
-        }
-    )
-    df["date_str"] = df["date"].dt.strftime("%Y-%m-%d")
-    df = df[["date_str", "name", "amount"]].rename(columns={"date_str": "date"})
-    # Sort by date descending
-    df = df.sort_values("date", ascending=False).reset_index(drop=True)
+    # Parsed, renamed and sorted once per process; shared by every session until the CSV changes
+    df = load_activity(CSV_FILE)
     # Set up lastn in session state
     if "lastn" not in st.session_state:
         st.session_state.lastn = N_INIT
-    n = st.session_state.lastn
-    # Split into hidden (most recent n) and shown (the rest)
-    if n > 0 and len(df) > n:
-        hidden_df = df.iloc[:n].copy()
-        shown_df = df.iloc[n:].copy()
-    else:
-        hidden_df = pd.DataFrame(columns=df.columns)
-        shown_df = df.copy()
-    st.session_state.transactions_hidden = hidden_df
-    st.session_state.transactions_shown = shown_df
-    # Set the transactions to display
-    if n > 0 and len(df) > n:
-        st.session_state.transactions = shown_df.copy()
-    else:
-        st.session_state.transactions = df.copy()
+    # Sessions keep a slice descriptor (hidden n, offset, limit), never copies of the frame
+    if "activity" not in st.session_state:
+        st.session_state.activity = ActivitySlice(hidden_n=st.session_state.lastn)
+else:
+    df = pd.DataFrame(columns=["date", "name", "amount", "date_fmt"])
+    st.session_state.setdefault("lastn", 0)
+    st.session_state.setdefault("activity", ActivitySlice())
+view = st.session_state.activity
 
 # ---------- CSS ---------- #
 
@@ -146,49 +120,44 @@ st.markdown(
 # ---------- MAIN CARD ---------- #
 st.markdown(f"""
 <div style='display: flex; align-items: center; justify-content: center; gap: 1.5rem; margin-bottom: 1.5rem;'>
-    <img src='data:image/png;base64,{base64.b64encode(CARD_FILE.read_bytes()).decode()}' width='90' style='display:block;'>
+    <img src='{asset_src(CARD_FILE)}' width='90' style='display:block;'>
     <span style='font-size:2.2rem;font-weight:700;'>12,345 Points</span>
 </div>
 """, unsafe_allow_html=True)
 
 # ---------- RECENT ACTIVITY ---------- #
 st.markdown("#### Recent activity")
-if st.session_state.lastn > 0 and not st.session_state.transactions_hidden.empty:
+if st.session_state.lastn > 0 and view.hidden_count(df):
     if st.button(f"Show last {st.session_state.lastn} transactions"):
         st.session_state.lastn = 0
         # Show all transactions
-        df = pd.concat([
-            st.session_state.transactions_hidden,
-            st.session_state.transactions_shown
-        ], ignore_index=True)
-        st.session_state.transactions = df.copy()
+        view.reveal_hidden()
         st.rerun()
 
 rows_html = ""
-for _, row in (
-    st.session_state.transactions.assign(
-        date_fmt=lambda d: pd.to_datetime(d.date).dt.strftime("%d %b %Y")
-    )
-).iterrows():
-    color = "#0f0" if row["amount"] > 0 else "#ff5b5b"
+for row in view.rows(df).itertuples(index=False):
+    color = "#0f0" if row.amount > 0 else "#ff5b5b"
     query = (
-        f"vendor_name={quote_plus(row['name'])}"
-        f"&amount={row['amount']}"
-        f"&date={row['date']}"
+        f"vendor_name={quote_plus(row.name)}"
+        f"&amount={row.amount}"
+        f"&date={row.date}"
     )
     href = f"/Vendor?{query}"
     rows_html += (
         f"<a href='{href}' target='_self' style='text-decoration:none;color:inherit;'>"
         f"  <div style='display:flex;justify-content:space-between;padding:4px 0;'>"
-        f"    <div><strong>{row['name']}</strong><br>"
-        f"      <span style='font-size:0.8rem;color:#888'>{row['date_fmt']}</span>"
+        f"    <div><strong>{row.name}</strong><br>"
+        f"      <span style='font-size:0.8rem;color:#888'>{row.date_fmt}</span>"
         f"    </div>"
-        f"    <div style='text-align:right;color:{color};'>€ {row['amount']:,.2f}</div>"
+        f"    <div style='text-align:right;color:{color};'>€ {row.amount:,.2f}</div>"
         f"  </div>"
         f"</a>"
     )
 
 st.markdown(f"<div class='recent-activity'>{rows_html}</div>", unsafe_allow_html=True)
+if view.has_more(df) and st.button("Show more"):
+    view.show_more()
+    st.rerun()
 
 # ---------- BOTTOM NAVIGATION ---------- #
 NAV = [
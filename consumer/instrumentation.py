@@ -0,0 +1,200 @@
+import io
+import os
+import time
+import logging
+import cProfile
+import pstats
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# --- Toggles ---
+# RECS_TIMING=1       time spans and log a breakdown for every trace, not only for callers that ask
+# RECS_PROFILE=...    "cprofile" or "pyinstrument": profile whole traces and keep the report
+# RECS_TRACEMALLOC=1  record the peak traced allocation of every span
+TIMING_ENABLED = os.getenv("RECS_TIMING", "0") == "1"
+PROFILER = os.getenv("RECS_PROFILE", "").lower()
+TRACEMALLOC_ENABLED = os.getenv("RECS_TRACEMALLOC", "0") == "1"
+PROFILE_LINES = 30 # functions kept in a cProfile report
+
+_NOOP = nullcontext()
+_current: ContextVar[Optional["Trace"]] = ContextVar("recs_trace", default=None)
+
+
+class Trace:
+    """
+    Timings of the spans opened while a trace is active, aggregated by span path
+    (e.g. "generate_recs/score_vendors"), plus the optional profiler report.
+    """
+    def __init__(self, name: str, memory: bool = False):
+        self.name = name
+        self.memory = memory
+        self.elapsed_ns = 0
+        self.peak_bytes: Optional[int] = None
+        self.profile_report: Optional[str] = None
+        self._totals: Dict[str, List[int]] = {} # path -> [calls, elapsed_ns, peak_bytes]
+        self._stack: List[List[Any]] = [] # open spans: [path, running peak]
+        self._peak = 0 # running peak outside any span
+
+    def _fold_peak(self, peak: int) -> None:
+        """Raises the running peak of the innermost open span (or of the trace) to `peak` bytes."""
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        else:
+            self._peak = max(self._peak, peak)
+
+    def _record(self, path: str, elapsed_ns: int, peak: int) -> None:
+        totals = self._totals[path]
+        totals[0] += 1
+        totals[1] += elapsed_ns
+        totals[2] = max(totals[2], peak)
+
+    def breakdown(self) -> List[Dict[str, Any]]:
+        """One row per span path, in first-opened order: stage, calls, ms, % of the trace (and peak_mb with tracemalloc)."""
+        rows = []
+        for path, (calls, elapsed_ns, peak) in self._totals.items():
+            row = {
+                "stage": path,
+                "calls": calls,
+                "ms": elapsed_ns / 1e6,
+                "pct": 100 * elapsed_ns / self.elapsed_ns if self.elapsed_ns else 0.0,
+            }
+            if self.memory:
+                row["peak_mb"] = peak / 1e6
+            rows.append(row)
+        return rows
+
+    def summary(self) -> str:
+        parts = [f"{r['stage']} {r['ms']:.1f} ms" + (f" x{r['calls']}" if r["calls"] > 1 else "") for r in self.breakdown()]
+        return f"{self.name}: {self.elapsed_ns / 1e6:.1f} ms total | " + " | ".join(parts)
+
+
+class _Span:
+    __slots__ = ("trace", "name", "path", "start", "mem_start")
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        stack = self.trace._stack
+        self.path = f"{stack[-1][0]}/{self.name}" if stack else self.name
+        if self.trace.memory:
+            # reset_peak() discards the enclosing span's peak so far, so hand it up first
+            current, peak = tracemalloc.get_traced_memory()
+            self.trace._fold_peak(peak)
+            self.mem_start = current
+        stack.append([self.path, 0])
+        self.trace._totals.setdefault(self.path, [0, 0, 0]) # keeps stages in the order they were opened
+        if self.trace.memory:
+            tracemalloc.reset_peak()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter_ns() - self.start
+        stack = self.trace._stack
+        _, child_peak = stack.pop()
+        peak = 0
+        if self.trace.memory:
+            # reset_peak() in nested spans hides their peaks from this one, so children report theirs up
+            peak = max(tracemalloc.get_traced_memory()[1], child_peak) - self.mem_start
+            self.trace._fold_peak(peak + self.mem_start)
+        self.trace._record(self.path, elapsed, peak)
+
+
+def span(name: str):
+    """
+    Times the block as a stage of the active trace. Without an active trace this returns a shared
+    no-op context manager, so instrumented code costs one ContextVar lookup.
+    """
+    trace_ = _current.get()
+    if trace_ is None:
+        return _NOOP
+    return _Span(trace_, name)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def trace(name: str, enabled: Optional[bool] = None, profile: Optional[str] = None, memory: Optional[bool] = None) -> Iterator[Optional[Trace]]:
+    """
+    Collects the spans opened inside the block into a Trace and logs its breakdown.
+
+    Args:
+        name: Name of the traced request, e.g. "generate_recs".
+        enabled: Force tracing on or off; defaults to RECS_TIMING.
+        profile: "cprofile" or "pyinstrument" to profile the block; defaults to RECS_PROFILE.
+        memory: Record tracemalloc peaks per span; defaults to RECS_TRACEMALLOC.
+
+    Yields:
+        The Trace (filled in when the block exits), or None when tracing is off.
+        Inside an already active trace this is just a span of it.
+    """
+    parent = _current.get()
+    if parent is not None:
+        with _Span(parent, name):
+            yield parent
+        return
+    if not (TIMING_ENABLED if enabled is None else enabled):
+        yield None
+        return
+
+    memory = TRACEMALLOC_ENABLED if memory is None else memory
+    profile = (PROFILER if profile is None else profile or "").lower()
+    result = Trace(name, memory=memory)
+    started_tracemalloc = memory and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    profiler = _start_profiler(profile)
+    token = _current.set(result)
+    start = time.perf_counter_ns()
+    try:
+        yield result
+    finally:
+        result.elapsed_ns = time.perf_counter_ns() - start
+        _current.reset(token)
+        if profiler is not None:
+            result.profile_report = _stop_profiler(profile, profiler)
+        if memory:
+            result.peak_bytes = max(tracemalloc.get_traced_memory()[1], result._peak)
+            if started_tracemalloc:
+                tracemalloc.stop()
+        logger.info(result.summary())
+        if result.profile_report:
+            logger.info(f"{name} profile ({profile}):\n{result.profile_report}")
+
+
+# ---------- Profilers ---------- #
+def _start_profiler(kind: str) -> Any:
+    if kind == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    if kind == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("RECS_PROFILE=pyinstrument but pyinstrument is not installed; profiling skipped.")
+            return None
+        profiler = Profiler()
+        profiler.start()
+        return profiler
+    if kind:
+        logger.warning(f"Unknown profiler '{kind}'; use 'cprofile' or 'pyinstrument'.")
+    return None
+
+
+def _stop_profiler(kind: str, profiler: Any) -> str:
+    if kind == "cprofile":
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_LINES)
+        return out.getvalue()
+    profiler.stop()
+    return profiler.output_text(unicode=True, color=False)
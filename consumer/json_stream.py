@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Optional fast backends: orjson for JSON Lines, ijson for incremental parsing of JSON arrays
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+READ_BUFFER_CHARS = 1 << 20   # characters read from disk at a time by the fallback array parser
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+PathLike = Union[str, Path]
+
+
+def is_jsonl(path: PathLike) -> bool:
+    return Path(path).suffix.lower() in JSONL_SUFFIXES
+
+
+def jsonl_path(path: PathLike) -> Path:
+    """The JSON Lines sibling of a .json file (data/x.json -> data/x.jsonl)."""
+    path = Path(path)
+    return path if is_jsonl(path) else path.with_suffix(".jsonl")
+
+
+def preferred_path(path: PathLike) -> Path:
+    """
+    The file to read for `path`: its JSON Lines sibling if one exists and is at least as new,
+    otherwise `path` itself. Writers that still produce the .json array keep working; the .jsonl
+    is simply ignored once it goes stale.
+    """
+    path = Path(path)
+    lines = jsonl_path(path)
+    if lines != path and lines.exists():
+        if not path.exists() or lines.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            return lines
+    return path
+
+
+def iter_json_array(path: PathLike, buffer_chars: int = READ_BUFFER_CHARS) -> Iterator[Any]:
+    """
+    Yields the elements of a top-level JSON array one at a time, reading the file in fixed-size
+    blocks, so memory stays proportional to one element rather than the whole document.
+
+    Raises:
+        json.JSONDecodeError / ValueError: If the file is not a well-formed JSON array.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+
+        def fill() -> None:
+            nonlocal buf, pos, eof
+            block = f.read(buffer_chars)
+            buf, pos, eof = buf[pos:] + block, 0, not block
+
+        def skip(chars: str) -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                fill()
+
+        skip(" \t\r\n")
+        if pos >= len(buf) or buf[pos] != "[":
+            raise ValueError(f"{path}: expected a top-level JSON array")
+        pos += 1
+        while True:
+            skip(" \t\r\n,")
+            if pos >= len(buf):
+                raise ValueError(f"{path}: unterminated JSON array")
+            if buf[pos] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buf, pos)
+                # A number at the end of the buffer may continue in the next block
+                truncated = end == len(buf) and not eof
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                truncated = True
+            if truncated:
+                fill()
+                continue
+            pos = end
+            yield element
+
+
+def iter_jsonl(path: PathLike) -> Iterator[Any]:
+    """Yields one parsed value per non-blank line of a JSON Lines file."""
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON line: {e}") from e
+
+
+def iter_jsonl_from(path: PathLike, offset: int = 0, columns: Optional[Sequence[str]] = None) -> Iterator[Tuple[Any, int, int]]:
+    """
+    Like iter_jsonl, but starting at byte `offset` and yielding (record, line start, line end) byte
+    offsets so a reader can resume after the last line it consumed. A final line without its newline
+    is only yielded if it parses; otherwise a writer is still appending it and it is left for later.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, "rb") as f:
+        f.seek(offset)
+        start = offset
+        for line in f:
+            end = start + len(line)
+            if line.strip():
+                try:
+                    record = loads(line)
+                except ValueError as e:
+                    if not line.endswith(b"\n"):
+                        return
+                    raise ValueError(f"{path}: invalid JSON line at byte {start}: {e}") from e
+                yield (_project(record, columns) if columns is not None else record), start, end
+            start = end
+
+
+def _project(record: Any, columns: Sequence[str]) -> Any:
+    # Keys absent from the record stay absent, so validators can still tell missing from null
+    if not isinstance(record, dict):
+        return record
+    return {k: record[k] for k in columns if k in record}
+
+
+def iter_records(path: PathLike, columns: Optional[Sequence[str]] = None) -> Iterator[Any]:
+    """
+    Streams the records of a JSON array or JSON Lines file (chosen by suffix).
+
+    Args:
+        path: .json (top-level array) or .jsonl/.ndjson file.
+        columns: If given, each dict record is reduced to these keys as soon as it is parsed,
+            so large unused fields are never kept.
+    """
+    if is_jsonl(path):
+        records = iter_jsonl(path)
+    elif ijson is not None:
+        f = open(path, "rb")
+        records = _closing(f, ijson.items(f, "item", use_float=True))
+    else:
+        records = iter_json_array(path)
+    if columns is None:
+        yield from records
+    else:
+        for record in records:
+            yield _project(record, columns)
+
+
+def _closing(f, items: Iterator[Any]) -> Iterator[Any]:
+    with f:
+        yield from items
+
+
+def load_records(path: PathLike, columns: Optional[Sequence[str]] = None) -> List[Any]:
+    """All records of `path` as a list, materializing only `columns` of each (see `iter_records`)."""
+    return list(iter_records(path, columns))
+
+
+def convert_to_jsonl(src: PathLike, dst: Optional[PathLike] = None) -> Path:
+    """
+    Rewrites a JSON array file as JSON Lines (one record per line), streaming so the whole
+    array is never held in memory. The output is written atomically.
+
+    Returns:
+        The path of the .jsonl file.
+    """
+    src = Path(src)
+    dst = Path(dst) if dst else jsonl_path(src)
+    fd, tmp = tempfile.mkstemp(dir=dst.parent, prefix=f".{dst.name}.", suffix=".tmp")
+    count = 0
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            for record in iter_json_array(src):
+                out.write(json.dumps(record, ensure_ascii=False))
+                out.write("\n")
+                count += 1
+        os.replace(tmp, dst)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    logger.info(f"Converted {count} record(s) from {src} to {dst}")
+    return dst
+
+
+def append_jsonl(path: PathLike, records: Sequence[Dict[str, Any]]) -> None:
+    """Appends records to a JSON Lines file (one write per call, so lines are never interleaved)."""
+    payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(payload)
+
+
+# --- Conversion entry point ---
+if __name__ == "__main__":
+    # python consumer/json_stream.py data/partner_vendors.json data/revpoint_transactions.json
+    for arg in sys.argv[1:]:
+        print(f"{arg} -> {convert_to_jsonl(arg)}")
@@ -0,0 +1,163 @@
+import io
+import os
+import csv
+import bisect
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+RECENT_TRANSACTIONS = 10 # transactions kept per merchant for the vendor page's recent activity
+
+
+def _field_count(line: bytes) -> int:
+    return len(next(csv.reader([line.decode("utf-8", "replace")]), []))
+
+
+class MerchantSummary:
+    """Running totals for one merchant plus a bounded ring buffer of its latest transactions."""
+    __slots__ = ("total_spent", "visits", "recent")
+
+    def __init__(self, max_recent: int = RECENT_TRANSACTIONS):
+        self.total_spent = 0.0
+        self.visits = 0
+        self.recent: deque = deque(maxlen=max_recent) # {"timestamp", "amount"} dicts, oldest first
+
+    def add_totals(self, amount_sum: float, count: int) -> None:
+        self.total_spent -= amount_sum # card spend is negative in final_data.csv
+        self.visits += count
+
+    def remember(self, timestamp: pd.Timestamp, amount: float) -> None:
+        """Offers a transaction to the ring buffer; kept only if it is among the latest `maxlen`."""
+        recent = self.recent
+        if not recent or timestamp >= recent[-1]["timestamp"]:
+            recent.append({"timestamp": timestamp, "amount": amount}) # usual case: evicts the oldest when full
+        elif len(recent) < recent.maxlen or timestamp > recent[0]["timestamp"]:
+            # Late arrival that still belongs among the latest ones
+            if len(recent) == recent.maxlen:
+                recent.popleft()
+            position = bisect.bisect_right([t["timestamp"] for t in recent], timestamp)
+            recent.insert(position, {"timestamp": timestamp, "amount": amount})
+
+    @property
+    def last_purchase(self) -> Optional[Dict[str, Any]]:
+        if not self.recent:
+            return None
+        last = self.recent[-1]
+        return {"date": last["timestamp"], "amount": last["amount"]}
+
+    def recent_transactions(self) -> List[Dict[str, Any]]:
+        """Latest transactions, newest first."""
+        return list(reversed(self.recent))
+
+
+class MerchantIndex:
+    """
+    Per-merchant summaries of the card transactions, so the vendor page is a dict lookup
+    instead of a full-table filter and two sorts per render.
+
+    Built once from the transaction frame and kept current with `add` / `sync` / `sync_file`,
+    which only fold in rows that were appended since the last call.
+    """
+    def __init__(self, max_recent: int = RECENT_TRANSACTIONS):
+        self.max_recent = max_recent
+        self._merchants: Dict[str, MerchantSummary] = {}
+        self._lock = threading.Lock()
+        self.rows_seen = 0
+        self._last_row: Optional[Tuple] = None
+        # sync_file: where the CSV was last read up to
+        self._inode: Optional[int] = None
+        self._header = b""
+        self._offset = 0
+        self._last_line = b""
+        self._terminated = True # whether the last line read ended with a newline
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, max_recent: int = RECENT_TRANSACTIONS) -> "MerchantIndex":
+        index = cls(max_recent)
+        index.add(df)
+        return index
+
+    def add(self, df: pd.DataFrame) -> None:
+        """Folds new transactions (timestamp, merchant_name, amount) into the index."""
+        if df.empty:
+            return
+        rows = df[["timestamp", "merchant_name", "amount"]]
+        # Totals in one groupby; only each merchant's latest rows touch the ring buffers
+        grouped = rows.groupby("merchant_name", sort=False)["amount"].agg(["sum", "size"])
+        latest = rows.sort_values("timestamp", kind="stable").groupby("merchant_name", sort=False).tail(self.max_recent)
+        with self._lock:
+            for merchant, total, count in zip(grouped.index, grouped["sum"], grouped["size"]):
+                summary = self._merchants.get(merchant)
+                if summary is None:
+                    summary = self._merchants[merchant] = MerchantSummary(self.max_recent)
+                summary.add_totals(float(total), int(count))
+            for timestamp, merchant, amount in latest.itertuples(index=False):
+                self._merchants[merchant].remember(timestamp, amount)
+            self.rows_seen += len(df)
+            self._last_row = tuple(rows.iloc[-1])
+
+    def _reset(self) -> None:
+        with self._lock:
+            self._merchants.clear()
+            self.rows_seen = 0
+            self._last_row = None
+        self._inode, self._header, self._offset, self._last_line, self._terminated = None, b"", 0, b"", True
+
+    def sync_file(self, path: Union[str, Path]) -> None:
+        """
+        Brings the index up to date with a transactions CSV (timestamp, merchant_name, amount, ...),
+        parsing only the complete lines appended since the last call. The file is re-read from the
+        start if it was replaced (new inode), the last line already read is no longer in place, or
+        that line had no newline and has since been extended.
+        Assumes one transaction per line (no quoted newlines), as in final_data.csv.
+        """
+        with open(path, "rb") as f:
+            intact = self._offset > 0 and os.fstat(f.fileno()).st_ino == self._inode
+            if intact:
+                f.seek(self._offset - len(self._last_line))
+                intact = f.read(len(self._last_line)) == self._last_line
+            if intact and not self._terminated:
+                intact = f.read(1) in (b"", b"\r", b"\n")
+            if not intact:
+                self._reset()
+                self._inode = os.fstat(f.fileno()).st_ino
+                f.seek(0)
+                self._header = f.readline()
+                self._offset = f.tell()
+            f.seek(self._offset)
+            appended = f.read()
+        complete = appended[:appended.rfind(b"\n") + 1]
+        # A last line without its newline is read if it has every field (final_data.csv ends that
+        # way); otherwise it is still being written and waits for the next sync
+        tail = appended[len(complete):]
+        if tail.strip() and _field_count(tail) == _field_count(self._header):
+            complete = appended
+        if not complete.strip():
+            return
+        df = pd.read_csv(io.BytesIO(self._header + complete), usecols=["timestamp", "merchant_name", "amount"], parse_dates=["timestamp"])
+        self.add(df)
+        self._offset += len(complete)
+        self._last_line = complete[complete.rstrip(b"\r\n").rfind(b"\n") + 1:]
+        self._terminated = complete.endswith(b"\n")
+
+    def sync(self, df: pd.DataFrame) -> None:
+        """
+        Brings the index up to date with the full current transaction frame `df` (in file order).
+        If `df` only grew, just the new rows are added; otherwise the index is rebuilt.
+        """
+        n = self.rows_seen
+        is_prefix = n <= len(df) and (n == 0 or tuple(df[["timestamp", "merchant_name", "amount"]].iloc[n - 1]) == self._last_row)
+        if not is_prefix:
+            self._reset()
+            n = 0
+        self.add(df.iloc[n:])
+
+    def get(self, merchant: str) -> Optional[MerchantSummary]:
+        with self._lock:
+            return self._merchants.get(merchant)
+
+    def __len__(self) -> int:
+        return len(self._merchants)
@@ -0,0 +1,151 @@
+import logging
+import datetime
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote_plus
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 1.0 # How often the watcher checks the store's change feed
+
+Subscriber = Callable[[List[Dict[str, Any]]], None]
+
+
+def notification_card_html(campaign: Dict[str, Any], card_class: str) -> str:
+    """HTML for one notification card linking to the vendor page."""
+    notification = campaign.get("notification", "")
+    vendor_name_encoded = quote_plus(campaign.get("vendor_name", ""))
+    # Use campaign timestamp if available, else today's date
+    date = campaign.get("timestamp") or datetime.date.today().isoformat()
+    vendor_page = f"/Vendor?vendor_name={vendor_name_encoded}&date={date}"
+    return f"""
+        <a href='{vendor_page}' target='_self' style='text-decoration:none;color:inherit;' class='notification-card {card_class}'>
+            <div class='notification-text'>{notification}</div>
+        </a>
+        """
+
+
+class NotificationHub:
+    """
+    In-process fan-out of newly approved campaigns.
+
+    A single daemon thread per process follows the CampaignStore change feed (a cheap MAX(seq)
+    lookup) and publishes new campaigns to subscribers, bumping `version` each time. Sessions
+    only compare `version` against what they rendered last, so polls with nothing new do no file
+    I/O or JSON parsing. Card HTML is rendered once per campaign and the joined feed once per version.
+    """
+    def __init__(self, store: Any, poll_interval: float = POLL_INTERVAL_SECONDS):
+        self.store = store
+        self.poll_interval = poll_interval
+        self._campaigns: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._seq = 0
+        self._version = 0
+        self._subscribers: List[Subscriber] = []
+        self._card_cache: Dict[Tuple[str, str], str] = {}
+        self._feed_cache: Dict[Tuple[int, Optional[Tuple[str, ...]]], str] = {}
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def start(self) -> "NotificationHub":
+        """Loads the current campaigns and starts the watcher thread (idempotent)."""
+        if self._thread is None or not self._thread.is_alive():
+            self.refresh()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="notification-hub", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 2)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Notification hub failed to read the campaign store: {e}", exc_info=True)
+
+    def refresh(self) -> int:
+        """Pulls campaigns approved since the last refresh; returns how many were published."""
+        if self.store.latest_seq() == self._seq:
+            return 0
+        new_campaigns = self.store.since_seq(self._seq)
+        self.publish(new_campaigns)
+        return len(new_campaigns)
+
+    def publish(self, campaigns: List[Dict[str, Any]]) -> None:
+        """Adds campaigns to the feed, bumps the version and notifies subscribers."""
+        if not campaigns:
+            return
+        with self._cond:
+            for campaign in campaigns:
+                campaign_id = campaign["campaign_id"]
+                # A re-approved campaign moves to the end and gets re-rendered
+                self._campaigns.pop(campaign_id, None)
+                self._campaigns[campaign_id] = campaign
+                for card_class in ("norm", "alt"):
+                    self._card_cache.pop((campaign_id, card_class), None)
+                self._seq = max(self._seq, campaign.get("seq", 0))
+            self._version += 1
+            self._feed_cache.clear()
+            subscribers = list(self._subscribers)
+            self._cond.notify_all()
+        logger.info(f"Published {len(campaigns)} campaign(s); notification feed version {self._version}.")
+        for callback in subscribers:
+            try:
+                callback(campaigns)
+            except Exception as e:
+                logger.error(f"Notification subscriber {callback!r} failed: {e}", exc_info=True)
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Registers `callback(new_campaigns)`; returns a function that unsubscribes it."""
+        with self._cond:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._cond:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def wait_for_change(self, version: int, timeout: Optional[float] = None) -> int:
+        """Blocks until the feed version differs from `version` (or timeout); returns the current version."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._version != version, timeout=timeout)
+            return self._version
+
+    def campaigns(self) -> List[Dict[str, Any]]:
+        """Snapshot of the feed in approval order."""
+        with self._cond:
+            return list(self._campaigns.values())
+
+    def render_feed(self, campaign_ids: Optional[List[str]] = None) -> str:
+        """
+        Joined card HTML for the whole feed, or only `campaign_ids` (in feed order).
+        Cached per feed version, so repeated calls between updates are a dict lookup.
+        """
+        with self._cond:
+            key = (self._version, tuple(campaign_ids) if campaign_ids is not None else None)
+            cached = self._feed_cache.get(key)
+            if cached is not None:
+                return cached
+            wanted = set(campaign_ids) if campaign_ids is not None else None
+            cards = []
+            for campaign_id, campaign in self._campaigns.items():
+                if wanted is not None and campaign_id not in wanted:
+                    continue
+                card_class = "alt" if len(cards) % 2 else "norm"
+                html = self._card_cache.get((campaign_id, card_class))
+                if html is None:
+                    html = self._card_cache[(campaign_id, card_class)] = notification_card_html(campaign, card_class)
+                cards.append(html)
+            feed = self._feed_cache[key] = "".join(cards)
+            return feed
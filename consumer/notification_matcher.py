@@ -0,0 +1,165 @@
+import re
+import datetime
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# --- Scoring configuration ---
+CATEGORY_WEIGHT = 0.5 # user's affinity for the campaign's category (1 / frequency rank)
+MERCHANT_WEIGHT = 0.3 # campaign vendor is one of the user's frequent merchants
+TIME_WEIGHT = 0.2     # delivery time falls in one of the user's typical spending times
+MIN_SCORE = 0.3       # users scoring below this don't get the notification
+INBOX_SIZE = 50       # notifications kept per user
+
+# Buckets used by generate_user_profile_summary's 'typical_spending_times'
+TIME_SLOTS = [f"{day} {bucket}s" for day in ("weekday", "weekend") for bucket in ("morning", "afternoon", "evening", "night")]
+_SLOT_INDEX = {slot: i for i, slot in enumerate(TIME_SLOTS)}
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Canonical form for matching categories/merchants ("Travel & Transportation" == "travel and transportation")."""
+    return re.sub(r"\s+", " ", (name or "").replace("&", "and")).strip().lower()
+
+
+def time_slot(ts: datetime.datetime) -> int:
+    """Index into TIME_SLOTS for a timestamp, using the same hour buckets as the user profiler."""
+    h = ts.hour
+    if 5 <= h <= 11:
+        bucket = "morning"
+    elif 12 <= h <= 17:
+        bucket = "afternoon"
+    elif 18 <= h <= 21:
+        bucket = "evening"
+    else:
+        bucket = "night"
+    day = "weekday" if ts.weekday() < 5 else "weekend"
+    return _SLOT_INDEX[f"{day} {bucket}s"]
+
+
+class ProfileMatrix:
+    """
+    Many user profiles packed into dense, column-major matrices for vectorized matching.
+
+    - `category_affinity[c, u]`: 1 / frequency_rank of category c for user u (0 if not a top category)
+    - `time_slots[s, u]`: 1 if slot s is one of user u's typical spending times
+    - `merchant_users[m]`: rows of the users listing merchant m among their frequent merchants
+
+    Rows are laid out per category/slot so scoring a campaign reads one contiguous vector each.
+    """
+    def __init__(
+        self,
+        user_ids: List[str],
+        categories: List[str],
+        category_affinity: np.ndarray,
+        time_slots: np.ndarray,
+        merchant_users: Dict[str, np.ndarray],
+    ):
+        self.user_ids = np.asarray(user_ids, dtype=object)
+        self.category_index = {normalize_name(c): i for i, c in enumerate(categories)}
+        self.category_affinity = np.ascontiguousarray(category_affinity, dtype=np.float32)
+        self.time_slots = np.ascontiguousarray(time_slots, dtype=np.float32)
+        self.merchant_users = {normalize_name(m): np.asarray(rows, dtype=np.int64) for m, rows in merchant_users.items()}
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    @classmethod
+    def from_profiles(cls, profiles: Dict[str, Dict[str, Any]]) -> "ProfileMatrix":
+        """Builds the matrices from {user_id: generate_user_profile_summary(...)}."""
+        user_ids = list(profiles)
+        categories: Dict[str, int] = {}
+        cat_rows, cat_cols, cat_vals = [], [], []
+        slot_rows, slot_cols = [], []
+        merchant_users: Dict[str, List[int]] = {}
+        for u, user_id in enumerate(user_ids):
+            summary = profiles[user_id]
+            for entry in summary.get("top_categories", []):
+                c = categories.setdefault(normalize_name(entry["category"]), len(categories))
+                cat_rows.append(c)
+                cat_cols.append(u)
+                cat_vals.append(1.0 / max(1, int(entry.get("frequency_rank", 1))))
+            for slot in summary.get("typical_spending_times", []):
+                if slot in _SLOT_INDEX:
+                    slot_rows.append(_SLOT_INDEX[slot])
+                    slot_cols.append(u)
+            for entry in summary.get("frequent_merchants", []):
+                merchant_users.setdefault(normalize_name(entry["merchant"]), []).append(u)
+
+        affinity = np.zeros((len(categories), len(user_ids)), dtype=np.float32)
+        np.maximum.at(affinity, (np.asarray(cat_rows, dtype=np.int64), np.asarray(cat_cols, dtype=np.int64)), np.asarray(cat_vals, dtype=np.float32))
+        slots = np.zeros((len(TIME_SLOTS), len(user_ids)), dtype=np.float32)
+        slots[np.asarray(slot_rows, dtype=np.int64), np.asarray(slot_cols, dtype=np.int64)] = 1.0
+        return cls(user_ids, list(categories), affinity, slots, {m: np.unique(rows) for m, rows in merchant_users.items()})
+
+
+class NotificationInboxes:
+    """Bounded per-user inboxes of matched campaign ids, oldest first."""
+    def __init__(self, max_size: int = INBOX_SIZE):
+        self.max_size = max_size
+        self._inboxes: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def deliver(self, user_ids: Iterable[str], campaign_id: str) -> int:
+        delivered = 0
+        with self._lock:
+            for user_id in user_ids:
+                inbox = self._inboxes.get(user_id)
+                if inbox is None:
+                    inbox = self._inboxes[user_id] = deque(maxlen=self.max_size)
+                if campaign_id in inbox:
+                    inbox.remove(campaign_id)
+                inbox.append(campaign_id)
+                delivered += 1
+        return delivered
+
+    def get(self, user_id: str) -> List[str]:
+        with self._lock:
+            return list(self._inboxes.get(user_id, ()))
+
+    def __len__(self) -> int:
+        return len(self._inboxes)
+
+
+class NotificationMatcher:
+    """
+    Routes each approved campaign to the users it is relevant for.
+
+    score = CATEGORY_WEIGHT * category affinity + MERCHANT_WEIGHT * frequent-merchant overlap
+            + TIME_WEIGHT * typical-spending-time match (at delivery time)
+
+    `route` can be registered directly as a NotificationHub subscriber.
+    """
+    def __init__(self, profiles: ProfileMatrix, inboxes: Optional[NotificationInboxes] = None, min_score: float = MIN_SCORE):
+        self.profiles = profiles
+        self.inboxes = inboxes or NotificationInboxes()
+        self.min_score = min_score
+
+    def score(self, campaign: Dict[str, Any], at: Optional[datetime.datetime] = None) -> np.ndarray:
+        """Relevance of `campaign` for every profile, as a float32 vector aligned with `profiles.user_ids`."""
+        p = self.profiles
+        scores = np.zeros(len(p), dtype=np.float32)
+        c = p.category_index.get(normalize_name(campaign.get("category")))
+        if c is not None:
+            scores += CATEGORY_WEIGHT * p.category_affinity[c]
+        rows = p.merchant_users.get(normalize_name(campaign.get("vendor_name")))
+        if rows is not None:
+            scores[rows] += MERCHANT_WEIGHT
+        scores += TIME_WEIGHT * p.time_slots[time_slot(at or datetime.datetime.now())]
+        return scores
+
+    def match(self, campaign: Dict[str, Any], at: Optional[datetime.datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (user_ids, scores) of the eligible users, best first."""
+        scores = self.score(campaign, at)
+        eligible = np.flatnonzero(scores >= self.min_score)
+        order = eligible[np.argsort(-scores[eligible], kind="stable")]
+        return self.profiles.user_ids[order], scores[order]
+
+    def route(self, campaigns: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Matches campaigns and delivers them to inboxes; returns {campaign_id: recipients}."""
+        delivered = {}
+        for campaign in campaigns:
+            user_ids, _ = self.match(campaign)
+            delivered[campaign["campaign_id"]] = self.inboxes.deliver(user_ids, campaign["campaign_id"])
+        return delivered
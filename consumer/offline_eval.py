@@ -0,0 +1,309 @@
+"""
+Offline evaluation of the recommender on time-split holdouts.
+
+Every user's newest `holdout_n` transactions are hidden (as generate_recs(exclude_last_n=...)
+does), panels are built from the rest, and the hidden merchants that are partner vendors are
+the relevant items. Reports hit-rate@k, NDCG@k and catalog coverage per weight configuration of
+_score_vendors, optionally with a co-occurrence index blended in.
+
+The expensive inputs are computed once and reused by every configuration: vendor and anchor
+embeddings for the whole log (one model pass, in the parent), then per user the anchors x vendors
+similarity matrix, the value / novelty vectors and the anchors' co-occurrence rows. A configuration only re-weights those
+matrices and re-runs the diversified top-n, so adding one costs a fraction of a pipeline run.
+Users are evaluated in chunks across a process pool.
+
+    python consumer/offline_eval.py [transactions.csv] [partner_vendors.json] [--holdout 5] [--k 10] [--workers N]
+"""
+import os
+import sys
+import math
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+if __name__ == "__main__": # run as a script: make the project root (metrics.py) importable
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+import recommendation_engine as engine
+from cooccurrence import CooccurrenceIndex
+from user_profiler import profile_summary_from_frame
+
+logger = logging.getLogger(__name__)
+
+# --- Defaults ---
+HOLDOUT_N = 5 # newest transactions hidden per user
+CUTOFF_K = 10 # metrics look at the first k recommended vendors
+MIN_HISTORY = 10 # users with fewer remaining transactions are skipped
+USERS_PER_TASK = 64
+COLUMNS = ["timestamp", "merchant_name", "category", "amount"]
+
+Weights = Tuple[float, ...] # similarity, value, novelty[, co-occurrence]
+
+DEFAULT_CONFIGS: Dict[str, Weights] = {
+    "production": engine.SCORE_WEIGHTS,
+    "similarity_only": (1.0, 0.0, 0.0),
+    "value_heavy": (0.4, 0.5, 0.1),
+    "no_novelty": (0.7, 0.3, 0.0),
+}
+# Added when evaluating with a co-occurrence index
+COOCCURRENCE_CONFIGS: Dict[str, Weights] = {
+    "no_cooccurrence": engine.SCORE_WEIGHTS[:3],
+    "cooccurrence_heavy": (0.4, 0.2, 0.1, 0.5),
+}
+
+
+# ---------- Worker state ---------- #
+# Set once per worker process by _init_worker. Under the fork start method (the Linux default)
+# the embedding matrices are inherited copy-on-write; other start methods copy them once per worker.
+_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    vendors: List[Dict[str, Any]],
+    vendor_vecs: np.ndarray,
+    pair_vecs: np.ndarray,
+    pair_rows: Dict[str, int],
+    configs: Dict[str, Weights],
+    settings: Dict[str, int],
+    cooccurrence: Optional[CooccurrenceIndex] = None,
+) -> None:
+    otypes = [v["offer_details"].get("offer_type", "") for v in vendors]
+    index_by_name: Dict[str, int] = {}
+    for i, vendor in enumerate(vendors):
+        index_by_name.setdefault(vendor["vendor_name"].lower(), i)
+    type_codes, type_names = pd.factorize(pd.Series(otypes, dtype=object))
+    _state.update(
+        vendors=vendors,
+        vendor_vecs=vendor_vecs,
+        pair_vecs=pair_vecs,
+        pair_rows=pair_rows,
+        config_names=list(configs),
+        # Three-weight configurations leave co-occurrence out
+        weights=np.array([tuple(configs[name]) + (0.0,) * (4 - len(configs[name])) for name in configs], dtype=np.float64),
+        cooccurrence=cooccurrence,
+        vendor_names=[v["vendor_name"] for v in vendors],
+        names_lower=np.array([v["vendor_name"].lower() for v in vendors], dtype=object),
+        categories=np.array([v.get("category") for v in vendors], dtype=object),
+        type_codes=type_codes,
+        n_types=len(type_names),
+        otypes=otypes,
+        index_by_name=index_by_name,
+        index_by_id={v["vendor_id"]: i for i, v in enumerate(vendors)},
+        **settings,
+    )
+
+
+def _panel_offers(scores: np.ndarray, anchor: Dict[str, str], panel_size: int) -> List[Dict[str, str]]:
+    """_recommend_for_anchor on precomputed scores: category filter with fallback, then the diversified top-n."""
+    s = _state
+    eligible = s["names_lower"] != anchor["merchant"].lower()
+    if anchor["category"]:
+        in_category = eligible & (s["categories"] == anchor["category"])
+        if in_category.sum() >= panel_size:
+            eligible = in_category
+    candidates = np.flatnonzero(eligible)
+    ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+    # Diversification only ever takes the best panel_size vendors of each offer type
+    keep = np.zeros(len(ranked), dtype=bool)
+    codes = s["type_codes"][ranked]
+    for code in range(s["n_types"]):
+        keep[np.flatnonzero(codes == code)[:panel_size]] = True
+    vendors, otypes = s["vendors"], s["otypes"]
+    tuples = [(float(scores[i]), vendors[i]["vendor_id"], vendors[i]["vendor_name"], otypes[i]) for i in ranked[keep]]
+    return engine._diverse_top_vendors(tuples, panel_size)
+
+
+def _evaluate_user(user_df: pd.DataFrame) -> Optional[Tuple[List[List[int]], set]]:
+    """(ranked vendor indices per configuration, relevant vendor indices), or None if the user can't be evaluated."""
+    s = _state
+    # Same split as _load_history(exclude_last_n=holdout_n)
+    txn_df = user_df[COLUMNS].sort_values("timestamp", ascending=False).reset_index(drop=True)
+    history, holdout = txn_df.iloc[s["holdout_n"]:].copy(), txn_df.iloc[:s["holdout_n"]]
+    if len(history) < s["min_history"]:
+        return None
+    relevant = {s["index_by_name"][m] for m in holdout["merchant_name"].str.lower() if m in s["index_by_name"]}
+    if not relevant:
+        return None
+    summary = profile_summary_from_frame(history, analysis_timeframe_days=s["analysis_timeframe_days"])
+    anchors = engine._choose_anchor_vendors(history, k=s["k_panels"])
+    if not anchors:
+        return None
+
+    # Matrices shared by every configuration
+    rows = [s["pair_rows"][engine._anchor_blob(a)] for a in anchors]
+    sims = (s["pair_vecs"][rows] @ s["vendor_vecs"].T).astype(np.float64) # anchors x vendors
+    value_norm, novelty = engine._score_components(s["vendors"], summary, history)
+    w = s["weights"]
+    scores = w[:, 0, None, None] * sims + w[:, 1, None, None] * value_norm + w[:, 2, None, None] * novelty # configs x anchors x vendors
+    if s["cooccurrence"] is not None:
+        cooc = np.array([s["cooccurrence"].scores_for(a["merchant"], s["vendor_names"]) for a in anchors])
+        scores = scores + w[:, 3, None, None] * cooc
+
+    ranked_lists = []
+    for c in range(len(w)):
+        ranked: List[int] = []
+        for a, anchor in enumerate(anchors):
+            for offer in _panel_offers(scores[c, a], anchor, s["panel_size"]):
+                index = s["index_by_id"][offer["vendor_id"]]
+                if index not in ranked:
+                    ranked.append(index)
+        ranked_lists.append(ranked)
+    return ranked_lists, relevant
+
+
+def _evaluate_chunk(users: List[pd.DataFrame]) -> Dict[str, Any]:
+    """Partial sums for a chunk of users: per configuration hits, NDCG sum and the vendors recommended."""
+    s = _state
+    k = s["k"]
+    n_configs = len(s["config_names"])
+    hits = np.zeros(n_configs)
+    ndcg = np.zeros(n_configs)
+    recommended = np.zeros((n_configs, len(s["vendors"])), dtype=bool)
+    evaluated = skipped = 0
+    for user_df in users:
+        result = _evaluate_user(user_df)
+        if result is None:
+            skipped += 1
+            continue
+        evaluated += 1
+        ranked_lists, relevant = result
+        ideal = sum(1 / math.log2(i + 2) for i in range(min(len(relevant), k)))
+        for c, ranked in enumerate(ranked_lists):
+            top = ranked[:k]
+            recommended[c, top] = True
+            gains = [1 / math.log2(pos + 2) for pos, index in enumerate(top) if index in relevant]
+            hits[c] += bool(gains)
+            ndcg[c] += sum(gains) / ideal
+    return {"evaluated": evaluated, "skipped": skipped, "hits": hits, "ndcg": ndcg, "recommended": recommended}
+
+
+# ---------- Driver ---------- #
+def _user_frames(df: pd.DataFrame) -> List[pd.DataFrame]:
+    if "user_id" not in df.columns:
+        return [df] # a single-user log like data/final_data.csv
+    return [group for _, group in df.groupby("user_id", sort=False)]
+
+
+def evaluate(
+    transactions: Union[str, pd.DataFrame] = "data/final_data.csv",
+    vendors: Union[str, List[Dict[str, Any]]] = "data/partner_vendors.json",
+    configs: Optional[Dict[str, Weights]] = None,
+    holdout_n: int = HOLDOUT_N,
+    k: int = CUTOFF_K,
+    k_panels: int = 3,
+    panel_size: int = 6,
+    analysis_timeframe_days: int = 30,
+    min_history: int = MIN_HISTORY,
+    workers: Optional[int] = None,
+    users_per_task: int = USERS_PER_TASK,
+    cooccurrence: Optional[CooccurrenceIndex] = None,
+) -> Dict[str, Any]:
+    """
+    Replays a time-split holdout for every user and scores each weight configuration.
+
+    Args:
+        transactions: Card transactions (path or frame); a `user_id` column makes it multi-user.
+        vendors: Partner vendors (path or records).
+        configs: Name -> (similarity, value, novelty[, co-occurrence]) weights; DEFAULT_CONFIGS
+            (plus COOCCURRENCE_CONFIGS with an index) when omitted.
+        holdout_n: Newest transactions hidden per user.
+        k: Cutoff of hit-rate@k and NDCG@k, over the panels' offers in panel order.
+        k_panels, panel_size, analysis_timeframe_days: As in generate_recs.
+        min_history: Users with fewer non-hidden transactions are skipped.
+        workers: Processes; defaults to the CPU count, 1 evaluates in this process.
+        users_per_task: Users sent to a worker at a time.
+        cooccurrence: Co-occurrence index blended in with each configuration's fourth weight.
+
+    Returns:
+        {"users", "skipped", "seconds", "users_per_second", "k",
+         "configs": {name: {"weights", "hit_rate", "ndcg", "coverage"}}}
+    """
+    start = time.perf_counter()
+    if not configs:
+        configs = {**DEFAULT_CONFIGS, **(COOCCURRENCE_CONFIGS if cooccurrence is not None else {})}
+    configs = dict(configs)
+    if isinstance(transactions, pd.DataFrame):
+        df = transactions
+    else:
+        df = pd.read_csv(transactions, parse_dates=["timestamp"])
+    if isinstance(vendors, str):
+        vendors = engine._load_vendors(vendors)
+
+    # One model pass for every vendor and every (merchant, category) pair that can become an anchor
+    vendor_vecs = engine._vendor_embeddings(vendors)
+    pairs = df[["merchant_name", "category"]].drop_duplicates()
+    blobs = [engine._anchor_blob({"merchant": m, "category": c}) for m, c in zip(pairs["merchant_name"], pairs["category"])]
+    pair_vecs = engine._embed(blobs)
+    pair_rows = {blob: i for i, blob in enumerate(blobs)}
+    settings = {
+        "holdout_n": holdout_n, "k": k, "k_panels": k_panels, "panel_size": panel_size,
+        "analysis_timeframe_days": analysis_timeframe_days, "min_history": min_history,
+    }
+    init_args = (vendors, vendor_vecs, pair_vecs, pair_rows, configs, settings, cooccurrence)
+
+    frames = _user_frames(df)
+    chunks = [frames[i:i + users_per_task] for i in range(0, len(frames), users_per_task)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        _init_worker(*init_args)
+        partials = [_evaluate_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker, initargs=init_args) as pool:
+            partials = list(pool.map(_evaluate_chunk, chunks))
+
+    evaluated = sum(p["evaluated"] for p in partials)
+    hits = sum(p["hits"] for p in partials)
+    ndcg = sum(p["ndcg"] for p in partials)
+    recommended = np.logical_or.reduce([p["recommended"] for p in partials])
+    seconds = time.perf_counter() - start
+    results = {
+        "users": evaluated,
+        "skipped": sum(p["skipped"] for p in partials),
+        "seconds": seconds,
+        "users_per_second": evaluated / seconds if seconds else 0.0,
+        "k": k,
+        "configs": {
+            name: {
+                "weights": list(configs[name]),
+                "hit_rate": float(hits[c] / evaluated) if evaluated else 0.0,
+                "ndcg": float(ndcg[c] / evaluated) if evaluated else 0.0,
+                "coverage": float(recommended[c].sum() / len(vendors)) if vendors else 0.0,
+            }
+            for c, name in enumerate(configs)
+        },
+    }
+    logger.info(f"offline_eval: {evaluated} users ({results['skipped']} skipped), {len(configs)} configs in {seconds:.1f}s")
+    return results
+
+
+def _parse_weights(values: Sequence[str]) -> Dict[str, Weights]:
+    """--config name=0.6,0.25,0.15[,0.2] (repeatable)."""
+    configs = {}
+    for value in values:
+        name, _, weights = value.partition("=")
+        configs[name] = tuple(float(w) for w in weights.split(","))
+        if len(configs[name]) not in (3, 4):
+            raise ValueError(f"--config {value}: expected similarity,value,novelty[,cooccurrence] weights")
+    return configs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transactions", nargs="?", default="data/final_data.csv")
+    parser.add_argument("vendors", nargs="?", default="data/partner_vendors.json")
+    parser.add_argument("--holdout", type=int, default=HOLDOUT_N)
+    parser.add_argument("--k", type=int, default=CUTOFF_K)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--config", action="append", default=[], help="name=similarity,value,novelty[,cooccurrence] (repeatable)")
+    parser.add_argument("--cooccurrence", default=None, help="co-occurrence index (.npz) to blend in")
+    args = parser.parse_args()
+    cooccurrence = CooccurrenceIndex.load(args.cooccurrence) if args.cooccurrence else None
+    r = evaluate(args.transactions, args.vendors, _parse_weights(args.config) or None, args.holdout, args.k, workers=args.workers, cooccurrence=cooccurrence)
+    print(f"{r['users']} users evaluated ({r['skipped']} skipped) in {r['seconds']:.1f}s, {r['users_per_second']:.1f} users/s")
+    for name, m in r["configs"].items():
+        print(f"{name:>16} {m['weights']}: hit_rate@{r['k']} {m['hit_rate']:.3f}  ndcg@{r['k']} {m['ndcg']:.3f}  coverage {m['coverage']:.3f}")
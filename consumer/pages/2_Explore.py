@@ -1,10 +1,19 @@
 import sys
 from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parents[2]))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import streamlit as st
 from pathlib import Path
-import json
 from recommendation_engine import generate_recs
+from json_stream import preferred_path
+from instrumentation import trace
+import metrics
+from data_access import (
+    COOCCURRENCE_FILE, TRANSACTIONS_FILE, VENDORS_FILE, VENDOR_CARD_FIELDS,
+    cached_on_files, load_anchor_selector, load_cooccurrence, load_vendors, vendors_by_name,
+)
+
+metrics.serve_from_env()
 
 # ---------- Paths to local assets ----------
 ASSETS_PATH  = Path(__file__).parent.parent / "assets"
@@ -168,10 +177,8 @@ with header_r:
 
 # ---------- Data ----------
 # ---------- Dynamic vendor data ----------
-FINAL_JSON_PATH = Path(__file__).parent.parent.parent / "data" / "partner_vendors.json"
-
-with open(FINAL_JSON_PATH, "r", encoding="utf‑8") as f:
-    vendors = json.load(f)
+# Shared across sessions by data_access; re-read only when partner_vendors.json changes
+vendors = load_vendors(columns=VENDOR_CARD_FIELDS)
 
 # --- Horizontal "stores" chips (logo + points multiplier) -------------
 stores = [
@@ -203,21 +210,38 @@ offers = [
 
 RECS_PLACEHOLDER_IMG = "https://images.pexels.com/photos/1640777/pexels-photo-1640777.jpeg"
 
-# Load vendor details for lookup by vendor_id
-VENDOR_JSON_PATH = Path(__file__).parent.parent.parent / "data" / "partner_vendors.json"
-with open(VENDOR_JSON_PATH, "r", encoding="utf-8") as f:
-    vendor_data = json.load(f)
-vendor_lookup = {v["vendor_id"]: v for v in vendor_data}
-
 # Determine how many recent transactions to exclude for recommendations
 exclude_last_n = st.session_state.get("lastn", 0)
 
-panels = generate_recs(exclude_last_n=exclude_last_n)
+def build_recs(n: int):
+    # Always traced: spans cost microseconds next to a recommendation run, and the breakdown is kept with the panels
+    with trace("explore_recs", enabled=True) as recs_trace:
+        panels = generate_recs(
+            vendor_path=str(VENDORS_FILE),
+            transactions_path=str(TRANSACTIONS_FILE),
+            exclude_last_n=n,
+            anchor_selector=load_anchor_selector(TRANSACTIONS_FILE, n),
+            cooccurrence=load_cooccurrence(COOCCURRENCE_FILE),
+        )
+    return panels, recs_trace
+
+# Panels only change with the data files (incl. the co-occurrence index) or exclude_last_n, so reruns reuse them
+panels, recs_trace = cached_on_files(
+    "recs",
+    [preferred_path(VENDORS_FILE), TRANSACTIONS_FILE, COOCCURRENCE_FILE],
+    build_recs,
+    exclude_last_n,
+)
 
-with open(FINAL_JSON_PATH, "r", encoding="utf-8") as f:
-    vendors = json.load(f)
+# ---------- Debug: where the recommendation time went (?debug=1) ---------- #
+if st.query_params.get("debug") == "1":
+    with st.expander("Recommendation timing", expanded=False):
+        st.caption(f"Last computed in {recs_trace.elapsed_ns / 1e6:.0f} ms; reruns reuse the cached panels until the data changes.")
+        st.dataframe(recs_trace.breakdown(), use_container_width=True, hide_index=True)
+        if recs_trace.profile_report:
+            st.code(recs_trace.profile_report)
 
-vendor_by_name = {v["vendor_name"]: v for v in vendors}   # <-- NEW
+vendor_by_name = vendors_by_name(columns=VENDOR_CARD_FIELDS)
 
 # ------------------------------------------------------------------------
 for panel in panels:
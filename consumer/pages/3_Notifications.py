@@ -1,10 +1,12 @@
 import sys
 from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parents[2]))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import streamlit as st
-import json
-from urllib.parse import quote_plus
-import pandas as pd
+from campaign_store import CampaignStore
+from notification_hub import NotificationHub
+from notification_matcher import NotificationMatcher, ProfileMatrix
+from user_profiler import generate_user_profile_summary
 
 # -------- Fixed width & UI shell constants -------- #
 FIXED = 750   # px fixed app width
@@ -80,29 +82,55 @@ st.markdown(f"<div class='mobile-top' style='height:{BAR_HEIGHT}px'></div>", uns
 st.markdown("<h2 style='text-align:center;margin-bottom:2.2rem'>Notifications</h2>", unsafe_allow_html=True)
 
 # ---------- Live-updating notifications fragment ---------- #
-@st.fragment(run_every="10s")
-def notifications_fragment():
-    json_path = Path(__file__).parent.parent.parent / "data" / "campaigns_approved.json"
-    with open(json_path, "r", encoding="utf-8") as f:
-        campaigns = json.load(f)
-    for idx, campaign in enumerate(campaigns):
-        notification = campaign.get("notification", "")
-        vendor_name = campaign.get("vendor_name", "")
-        vendor_name_encoded = quote_plus(vendor_name)
-        # Use campaign timestamp if available, else today's date
-        date = campaign.get("timestamp") or pd.Timestamp.now().strftime("%Y-%m-%d")
-        vendor_page = f"/Vendor?vendor_name={vendor_name_encoded}&date={date}"
-        card_class = "alt" if idx % 2 else "norm"
-        st.markdown(
-            f"""
-            <a href='{vendor_page}' target='_self' style='text-decoration:none;color:inherit;' class='notification-card {card_class}'>
-                <div class='notification-text'>{notification}</div>
-            </a>
-            """,
-            unsafe_allow_html=True
-        )
-
-notifications_fragment()
+@st.cache_resource
+def load_hub():
+    # One hub (and one watcher thread) per server process, shared by every session
+    return NotificationHub(CampaignStore()).start()
+
+hub = load_hub()
+
+CURRENT_USER = "me"  # the demo app has a single user, backed by data/final_data.csv
+TRANSACTIONS_FILE = Path(__file__).parents[2] / "data" / "final_data.csv"
+
+@st.cache_resource
+def load_matcher():
+    # Routes every campaign the hub publishes into the inboxes of the users it matches
+    try:
+        profiles = {CURRENT_USER: generate_user_profile_summary(path=TRANSACTIONS_FILE)}
+    except (FileNotFoundError, ValueError):
+        return None  # no profile to match against: fall back to showing every campaign
+    matcher = NotificationMatcher(ProfileMatrix.from_profiles(profiles))
+    hub.subscribe(matcher.route)
+    matcher.route(hub.campaigns())
+    return matcher
+
+matcher = load_matcher()
+
+def current_inbox():
+    return matcher.inboxes.get(CURRENT_USER) if matcher else None
+
+def feed_state(inbox):
+    # Changes whenever the hub publishes or the user's inbox receives a campaign
+    return hub.version, tuple(inbox) if inbox is not None else None
+
+def render_notifications():
+    inbox = current_inbox()
+    st.session_state.notif_rendered = feed_state(inbox)
+    if inbox == []:
+        st.markdown("<p style='text-align:center;color:#888'>You're all caught up 🎉</p>", unsafe_allow_html=True)
+        return
+    st.markdown(hub.render_feed(inbox), unsafe_allow_html=True)
+
+render_notifications()
+
+@st.fragment(run_every="2s")
+def watch_notifications():
+    # Draws nothing: a poll with nothing new is a version compare and sends no HTML.
+    # Only when the hub has published since this session rendered is the page rerun.
+    if feed_state(current_inbox()) != st.session_state.notif_rendered:
+        st.rerun()
+
+watch_notifications()
 
 # ---------- BOTTOM NAVIGATION ---------- #
 NAV = [
@@ -1,25 +1,17 @@
 import sys
 from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parents[2]))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import streamlit as st
 import pandas as pd
 from urllib.parse import quote_plus
-import base64
+from asset_cache import img_tag
 
 # -------- Paths to local assets -------- #
 ASSETS_PATH = Path(__file__).parent / "assets"
 LOGO_FILE = ASSETS_PATH / "revolut_logo.png"
 PROFILE_FILE = ASSETS_PATH / "user.png"
 
-# ---------- Helper to inline images as <img> tags ---------- #
-
-def img_tag(path: Path, height: int) -> str:
-    if not path.exists():
-        return ""
-    mime = "image/png" if path.suffix.lower() == ".png" else "image/jpeg"
-    data = base64.b64encode(path.read_bytes()).decode()
-    return f'<img src="data:{mime};base64,{data}" height="{height}">'  # noqa: E501
-
 # ---------- Page config ---------- #
 
 st.set_page_config(
@@ -1,17 +1,17 @@
 import sys
 from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parents[2]))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import streamlit as st
 import pandas as pd
-import json
-import base64
 from urllib.parse import quote_plus
+from data_access import TRANSACTIONS_FILE, VENDOR_PAGE_FIELDS, load_merchant_index, vendors_by_name
+from asset_cache import img_tag
 
 # -------- Paths to local assets -------- #
 ASSETS_PATH   = Path(__file__).parent.parent / "assets"
 LOGO_FILE     = ASSETS_PATH / "revolut_logo.png"
 PROFILE_FILE  = ASSETS_PATH / "user.png"
-VENDORS_FILE  = Path(__file__).parent.parent.parent / "data" / "partner_vendors.json"
 
 # ---------- BOTTOM NAVIGATION ---------- #
 HOME_PATH = Path(__file__).parent.parent / "home.py"
@@ -28,25 +28,12 @@ FIXED = 750   # px fixed app width
 BAR_HEIGHT = 20  # px faux status bar height
 
 
-# ---------- Helper to inline images as <img> tags ---------- #
-
-def img_tag(path: Path, height: int) -> str:
-    if not path.exists():
-        return ""
-    mime = "image/png" if path.suffix.lower() == ".png" else "image/jpeg"
-    data = base64.b64encode(path.read_bytes()).decode()
-    return f'<img src="data:{mime};base64,{data}" height="{height}">' 
-
-# ---------- Load vendor data ---------- #
-with open(VENDORS_FILE, 'r', encoding='utf-8') as f:
-    vendors = json.load(f)
-
 # ---------- Get vendor_name from URL query params ---------- #
 names = st.query_params.get_all("vendor_name")  # returns a list
 vendor_name = names[0] if names else None
 
 # ---------- Lookup vendor ---------- #
-vendor = next((v for v in vendors if v["vendor_name"] == vendor_name), None)
+vendor = vendors_by_name(columns=VENDOR_PAGE_FIELDS).get(vendor_name)
 if not vendor:
     st.error(
         f"Vendor '{vendor_name}' not found." if vendor_name else "No vendor_name provided in the URL."
@@ -85,18 +72,14 @@ vendor_page_url     = vendor.get('url', '')
 vendor_image_url    = vendor.get('image_url', '')
 
 # ---------- Read transaction data and compute metrics dynamically ---------- #
-CSV_FILE = Path(__file__).parent.parent.parent / "data/final_data.csv"
-if CSV_FILE.exists():
-    df = pd.read_csv(CSV_FILE, parse_dates=["timestamp"])
-    vendor_txns = df[df["merchant_name"] == vendor_name]
-    total_spent = -vendor_txns["amount"].sum()
-    visits = len(vendor_txns)
-    transactions = vendor_txns.sort_values("timestamp", ascending=False).head(10).to_dict("records")
-    if not vendor_txns.empty:
-        last_row = vendor_txns.sort_values("timestamp", ascending=False).iloc[0]
-        last_purchase = {"date": last_row["timestamp"], "amount": last_row["amount"]}
-    else:
-        last_purchase = {"date": pd.Timestamp.now(), "amount": 0}
+CSV_FILE = TRANSACTIONS_FILE
+summary = load_merchant_index(CSV_FILE).get(vendor_name) if CSV_FILE.exists() else None
+if summary is not None:
+    # O(1) lookup in the per-merchant index instead of filtering the whole CSV
+    total_spent = summary.total_spent
+    visits = summary.visits
+    transactions = summary.recent_transactions()
+    last_purchase = summary.last_purchase
 else:
     total_spent = 0
     visits = 0
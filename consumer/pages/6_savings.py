@@ -1,12 +1,14 @@
 import sys
 from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parents[2]))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import streamlit as st
 import pandas as pd
 import json
-import base64
 import plotly.express as px
 import plotly.graph_objects as go # Added for stacked bar
+from data_access import load_savings_rollups
+import asset_cache
 
 # -------- Paths to local assets -------- #
 PROJECT_ROOT = Path(__file__).parents[2]
@@ -23,9 +25,7 @@ def img_tag(path: Path, height: int) -> str:
         st.warning(f"Asset not found: {path}")
         return ""
     try:
-        mime = "image/png" if path.suffix.lower() == ".png" else "image/jpeg"
-        data = base64.b64encode(path.read_bytes()).decode()
-        return f'<img src="data:{mime};base64,{data}" height="{height}">'  # noqa: E501
+        return asset_cache.img_tag(path, height)
     except Exception as e:
         st.error(f"Error loading image {path}: {e}")
         return ""
@@ -210,32 +210,8 @@ if not TRANSACTIONS_FILE.exists():
     st.stop()
 
 try:
-    with open(TRANSACTIONS_FILE, "r") as f:
-        data = json.load(f)
-    valid_data = []
-    required_keys = ["money_saved", "points_spent", "timestamp", "vendor_name", "actual_price", "percentage_saved"]
-    for t in data:
-        if t and all(key in t for key in required_keys):
-            try:
-                t['money_saved'] = float(t['money_saved'])
-                t['points_spent'] = int(t['points_spent'])
-                t['actual_price'] = float(t['actual_price'])
-                t['percentage_saved'] = float(t['percentage_saved']) if t.get('percentage_saved') is not None else 0.0
-                valid_data.append(t)
-            except (ValueError, TypeError):
-                continue
-
-    if not valid_data:
-        st.warning("No valid transaction data found after cleaning.")
-        st.stop()
-
-    df = pd.DataFrame(valid_data)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['month_year'] = df['timestamp'].dt.to_period('M')
-    df['month_year_str'] = df['month_year'].astype(str)
-    df['paid_amount'] = df['actual_price'] - df['money_saved']
-    df['paid_amount'] = df['paid_amount'].fillna(0) # Ensure NaN handling early
-
+    # Month x vendor rollups shared across sessions; only new transactions are aggregated when the file changes
+    rollups = load_savings_rollups(TRANSACTIONS_FILE)
 except json.JSONDecodeError:
     st.error(f"Error decoding JSON from {TRANSACTIONS_FILE}")
     st.stop()
@@ -243,10 +219,15 @@ except Exception as e:
     st.error(f"Error loading or processing data: {e}")
     st.stop()
 
+if rollups.rows_seen == 0:
+    st.warning("No valid transaction data found after cleaning.")
+    st.stop()
+
 # ---------- Key Metrics ---------- #
-total_savings = df['money_saved'].sum()
-total_points_spent = df['points_spent'].sum()
-average_saving_percentage = df[df['money_saved'] > 0]['percentage_saved'].mean() if not df[df['money_saved'] > 0].empty else 0
+totals = rollups.totals()
+total_savings = totals['total_savings']
+total_points_spent = totals['total_points_spent']
+average_saving_percentage = totals['average_saving_percentage']
 
 col1, col2, col3 = st.columns(3)
 with col1:
@@ -260,8 +241,7 @@ st.markdown("---")
 
 # ---------- Savings Over Time (Overall Trend - Unfiltered) ---------- #
 st.markdown("#### Overall Savings Trend")
-savings_over_time = df.groupby('month_year_str')['money_saved'].sum().reset_index()
-savings_over_time = savings_over_time.sort_values('month_year_str')
+savings_over_time = rollups.monthly_savings()
 
 if not savings_over_time.empty:
     fig_time = px.line(savings_over_time, x='month_year_str', y='money_saved',
@@ -277,15 +257,15 @@ st.markdown("---")
 
 # ---------- Monthly Filtering ---------- #
 st.markdown("#### Explore Monthly Performance")
-available_months = sorted(df['month_year_str'].unique())
+available_months = rollups.months()
 month_options = ["All Months"] + available_months
 selected_month = st.selectbox("Select Month:", options=month_options, label_visibility="collapsed")
 
 if selected_month == "All Months":
-    filtered_df = df.copy()
+    filtered_df = rollups.vendor_table()
     st.markdown(f"##### Showing data for: All Time")
 else:
-    filtered_df = df[df['month_year_str'] == selected_month].copy()
+    filtered_df = rollups.vendor_table(selected_month)
     st.markdown(f"##### Showing data for: {selected_month}")
 
 if filtered_df.empty and selected_month != "All Months":
@@ -306,9 +286,8 @@ if not filtered_df.empty:
          st.error("Internal error: 'paid_amount' column missing.")
          st.stop() # Stop if essential calculated column is missing
 
-    savings_by_vendor_for_top = filtered_df.groupby('vendor_name')['money_saved'].sum().reset_index()
-    top_vendors_for_stack = savings_by_vendor_for_top.nlargest(10, 'money_saved')
-    spend_breakdown = filtered_df[filtered_df['vendor_name'].isin(top_vendors_for_stack['vendor_name'])].groupby('vendor_name')[['money_saved', 'paid_amount']].sum().reset_index()
+    # filtered_df already holds one pre-aggregated row per vendor
+    spend_breakdown = filtered_df.nlargest(10, 'money_saved')[['vendor_name', 'money_saved', 'paid_amount']]
     spend_breakdown = spend_breakdown.fillna(0)
     spend_breakdown['total_spend'] = spend_breakdown['money_saved'] + spend_breakdown['paid_amount']
     spend_breakdown = spend_breakdown.sort_values('total_spend', ascending=False)
@@ -325,8 +304,7 @@ if not filtered_df.empty:
 
     # --- Savings by Vendor ---
     st.markdown("#### Top Savings by Vendor")
-    savings_by_vendor = filtered_df.groupby('vendor_name')['money_saved'].sum().reset_index()
-    top_vendors = savings_by_vendor.nlargest(10, 'money_saved').sort_values('money_saved', ascending=True)
+    top_vendors = filtered_df.nlargest(10, 'money_saved').sort_values('money_saved', ascending=True)
     if not top_vendors.empty:
         fig_vendor = px.bar(top_vendors, y='vendor_name', x='money_saved', labels={'vendor_name': 'Vendor', 'money_saved': 'Total Savings (€)'}, orientation='h', template='plotly_dark')
         fig_vendor.update_layout(yaxis_title=None, xaxis_title="Savings (€)", margin=dict(l=10, r=20, t=30, b=20), height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
@@ -341,8 +319,7 @@ if not filtered_df.empty:
     if 'percentage_saved' not in filtered_df.columns:
         st.error("Internal error: 'percentage_saved' column missing.")
         st.stop()
-    avg_perc_by_vendor = filtered_df.groupby('vendor_name')['percentage_saved'].mean().reset_index()
-    avg_perc_by_vendor = avg_perc_by_vendor.dropna(subset=['percentage_saved'])
+    avg_perc_by_vendor = filtered_df[['vendor_name', 'percentage_saved']].dropna(subset=['percentage_saved'])
     top_avg_perc_vendors = avg_perc_by_vendor.nlargest(10, 'percentage_saved').sort_values('percentage_saved', ascending=False)
     if not top_avg_perc_vendors.empty:
         fig_avg_perc = px.bar(top_avg_perc_vendors, x='vendor_name', y='percentage_saved', labels={'vendor_name': 'Vendor', 'percentage_saved': 'Average Saving (%)'}, template='plotly_dark')
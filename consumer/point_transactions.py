@@ -0,0 +1,210 @@
+import os
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from json_stream import is_jsonl, iter_jsonl_from, iter_records
+
+logger = logging.getLogger(__name__)
+
+# --- Schema of revpoint_transactions.json records ---
+REQUIRED_KEYS = ["money_saved", "points_spent", "timestamp", "vendor_name", "actual_price", "percentage_saved"]
+NUMERIC_COLUMNS = {"money_saved": "float64", "points_spent": "int64", "actual_price": "float64", "percentage_saved": "float64"}
+NULL_AS_ZERO = {"percentage_saved"} # A null percentage is read as 0% rather than rejected
+# Only these fields are materialized; e.g. promotion_description_used is dropped while parsing
+RECORD_COLUMNS = ["pointtransactionid"] + REQUIRED_KEYS
+
+CHUNK_ROWS = 50_000 # records validated per DataFrame chunk
+
+PathLike = Union[str, Path]
+
+
+def validate_records(records: List[Any], rejections: Optional[Counter] = None) -> pd.DataFrame:
+    """
+    Validates and coerces a batch of raw point-transaction records column-wise.
+
+    Invalid rows are dropped with a mask and counted in `rejections` under a reason
+    ("not_an_object", "missing_<key>", "invalid_<key>"); each row counts once, for its first failing key.
+
+    Returns:
+        DataFrame of the valid rows with typed numeric columns plus timestamp, month_year,
+        month_year_str and paid_amount.
+    """
+    rejections = rejections if rejections is not None else Counter()
+    objects = [r for r in records if isinstance(r, dict) and r]
+    if len(objects) < len(records):
+        rejections["not_an_object"] += len(records) - len(objects)
+    df = pd.DataFrame.from_records(objects) if objects else pd.DataFrame()
+    if df.empty:
+        return df
+
+    valid = np.ones(len(df), dtype=bool)
+    for key in REQUIRED_KEYS:
+        if key not in df.columns:
+            rejections[f"missing_{key}"] += int(valid.sum())
+            return df.iloc[0:0]
+        raw = df[key]
+        missing = raw.isna().to_numpy()
+        if key in NULL_AS_ZERO:
+            # Only an absent key is "missing"; an explicit null means 0
+            present = np.fromiter((key in r for r in objects), dtype=bool, count=len(objects))
+            raw = raw.where(~(missing & present), 0)
+            missing = ~present
+        if key in NUMERIC_COLUMNS:
+            coerced = pd.to_numeric(raw, errors="coerce")
+        elif key == "timestamp":
+            coerced = pd.to_datetime(raw, errors="coerce", format="ISO8601")
+        else:
+            coerced = raw
+        invalid = coerced.isna().to_numpy() & ~missing
+        rejections[f"missing_{key}"] += int((missing & valid).sum())
+        rejections[f"invalid_{key}"] += int((invalid & valid).sum())
+        valid &= ~(missing | invalid)
+        df[key] = coerced
+
+    df = df[valid].reset_index(drop=True)
+    for key, dtype in NUMERIC_COLUMNS.items():
+        # int() semantics of the old loader: truncate towards zero
+        df[key] = np.trunc(df[key]).astype(dtype) if dtype == "int64" else df[key].astype(dtype)
+    df["month_year"] = df["timestamp"].dt.to_period("M")
+    df["month_year_str"] = df["month_year"].astype(str)
+    df["paid_amount"] = (df["actual_price"] - df["money_saved"]).fillna(0)
+    return df
+
+
+def iter_point_transactions(
+    path: PathLike,
+    chunk_rows: int = CHUNK_ROWS,
+    rejections: Optional[Counter] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams validated point transactions as DataFrame chunks of up to `chunk_rows` rows, in file order.
+    Reads a JSON array or JSON Lines file; peak memory is bounded by one chunk regardless of the history's size.
+    """
+    batch: List[Any] = []
+    for record in iter_records(path, RECORD_COLUMNS):
+        batch.append(record)
+        if len(batch) >= chunk_rows:
+            chunk = validate_records(batch, rejections)
+            batch = []
+            if not chunk.empty:
+                yield chunk
+    if batch:
+        chunk = validate_records(batch, rejections)
+        if not chunk.empty:
+            yield chunk
+
+
+class HistoryRewritten(Exception):
+    """The file no longer starts with the records a ReadCursor has already consumed."""
+
+
+class ReadCursor:
+    """
+    Where the last `iter_appended` read of a point-transaction file stopped: the raw records
+    consumed (valid or not), the last of them, and for JSON Lines the byte offsets around it.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.path: Optional[str] = None
+        self.inode: Optional[int] = None
+        self.records = 0
+        self.last_record: Any = None
+        self.last_start = 0 # JSON Lines: byte offsets of the last consumed line
+        self.offset = 0
+
+
+def _jsonl_prefix_intact(path: str, cursor: ReadCursor) -> bool:
+    """O(1) check that the last consumed line is still where it was (appends keep the inode)."""
+    if os.stat(path).st_ino != cursor.inode:
+        return False
+    for record, start, end in iter_jsonl_from(path, cursor.last_start, RECORD_COLUMNS):
+        return start == cursor.last_start and end == cursor.offset and record == cursor.last_record
+    return False
+
+
+def _after_prefix(records: Iterable[Any], cursor: ReadCursor) -> Iterator[Tuple[Any, int, int]]:
+    # JSON arrays have no stable byte offsets across appends (the closing bracket moves), so the
+    # consumed records are re-parsed, but not validated, and the last one is compared
+    seen = 0
+    for record in records:
+        seen += 1
+        if seen < cursor.records:
+            continue
+        if seen == cursor.records:
+            if record != cursor.last_record:
+                raise HistoryRewritten(f"{cursor.path}: record {seen} changed")
+            continue
+        yield record, 0, 0
+    if seen < cursor.records:
+        raise HistoryRewritten(f"{cursor.path}: {seen} record(s), {cursor.records} already read")
+
+
+def iter_appended(
+    path: PathLike,
+    cursor: ReadCursor,
+    chunk_rows: int = CHUNK_ROWS,
+    rejections: Optional[Counter] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Validated point transactions added to `path` since `cursor` (all of them for a fresh cursor),
+    as DataFrame chunks; the cursor advances past each chunk once the caller has consumed it.
+
+    JSON Lines files are resumed at the cursor's byte offset, so only appended lines are read.
+    JSON arrays are re-parsed up to the cursor, and only the records after it are validated.
+
+    Raises:
+        HistoryRewritten: Before anything is yielded, if the records already consumed are no longer
+            the start of the file (rewritten, truncated or replaced). Reset the cursor and re-read.
+    """
+    path = str(path)
+    if cursor.path is not None and cursor.path != path:
+        raise HistoryRewritten(f"{path}: cursor belongs to {cursor.path}")
+    if is_jsonl(path):
+        if cursor.records and not _jsonl_prefix_intact(path, cursor):
+            raise HistoryRewritten(f"{path}: consumed lines changed")
+        records = iter_jsonl_from(path, cursor.offset, RECORD_COLUMNS)
+        inode = os.stat(path).st_ino
+    else:
+        records = _after_prefix(iter_records(path, RECORD_COLUMNS), cursor)
+        inode = None
+    cursor.path, cursor.inode = path, inode
+
+    batch: List[Any] = []
+    last = (0, cursor.offset)
+    for record, start, end in records:
+        batch.append(record)
+        last = (start, end)
+        if len(batch) >= chunk_rows:
+            chunk = validate_records(batch, rejections)
+            if not chunk.empty:
+                yield chunk
+            cursor.records, cursor.last_record = cursor.records + len(batch), batch[-1]
+            cursor.last_start, cursor.offset = last
+            batch = []
+    if batch:
+        chunk = validate_records(batch, rejections)
+        if not chunk.empty:
+            yield chunk
+        cursor.records, cursor.last_record = cursor.records + len(batch), batch[-1]
+        cursor.last_start, cursor.offset = last
+
+
+def load_point_transactions(path: PathLike, rejections: Optional[Counter] = None) -> pd.DataFrame:
+    """All valid point transactions in one frame (empty if there are none)."""
+    rejections = rejections if rejections is not None else Counter()
+    chunks = list(iter_point_transactions(path, rejections=rejections))
+    log_rejections(path, rejections)
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+
+def log_rejections(path: PathLike, rejections: Counter) -> None:
+    reasons: Dict[str, int] = {reason: n for reason, n in rejections.items() if n}
+    if reasons:
+        logger.warning(f"Skipped {sum(reasons.values())} invalid point transaction(s) in {path}: {reasons}")
@@ -1,23 +1,40 @@
-import json
 from typing import List, Dict, Any, Optional
-import os
+import sys
+from pathlib import Path
 import numpy as np
 import pandas as pd
 import torch
 from sentence_transformers import SentenceTransformer
-from user_profiler import generate_user_profile_summary, calculate_potential_savings
+from user_profiler import generate_user_profile_summary, profile_summary_from_frame, calculate_potential_savings
+from json_stream import load_records, preferred_path
+from anchor_selector import AnchorSelector
+from cooccurrence import CooccurrenceIndex
+from instrumentation import span, trace
+if __name__ == "__main__": # run as a script: make the project root (metrics.py) importable
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+import metrics
 
 MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# Vendor fields used for embedding and scoring; everything else is skipped while parsing
+VENDOR_FIELDS = ("vendor_id", "vendor_name", "category", "offer_details", "tags")
 
 torch.classes.__path__ = []
 
+# Score = similarity to the anchor, estimated offer value, novelty and (when a co-occurrence
+# index is supplied) how often the anchor's shoppers also shop at the vendor, weighted as below
+SCORE_WEIGHTS = (0.6, 0.25, 0.15, 0.2)
+
+RECS_REQUESTS = metrics.counter("recs_requests_total", "generate_recs calls by status (ok, error).", ["status"])
+RECS_SECONDS = metrics.histogram("recs_request_seconds", "Seconds per generate_recs call.")
+
 class _ModelCache:
     _model: Optional[SentenceTransformer] = None
 
     @classmethod
     def get(cls) -> SentenceTransformer:
         if cls._model is None:
-            cls._model = SentenceTransformer(MODEL_NAME)
+            with span("model_load"):
+                cls._model = SentenceTransformer(MODEL_NAME)
         return cls._model
 
 def _embed(texts: List[str]) -> np.ndarray:
@@ -25,8 +42,7 @@ def _embed(texts: List[str]) -> np.ndarray:
     return model.encode(texts, normalize_embeddings=True)
 
 def _load_vendors(path: str) -> List[Dict[str, Any]]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return load_records(preferred_path(path), VENDOR_FIELDS)
 
 def _vendor_embeddings(vendors: List[Dict[str, Any]]) -> np.ndarray:
     blobs = [
@@ -45,25 +61,31 @@ def _choose_anchor_vendors(
 ) -> List[Dict[str, str]]:
     if "timestamp" not in txn_df.columns:
         raise ValueError("txn_df must include a 'timestamp' column parsed as datetime")
-    max_ts = txn_df["timestamp"].max()
-    txn_df = txn_df.copy()
-    txn_df["recency_weight"] = np.exp(-(max_ts - txn_df["timestamp"]).dt.days / tau_days)
-    txn_df["weighted_amount"] = txn_df["recency_weight"] * txn_df["amount"].abs()
-    stats = txn_df.groupby(["merchant_name", "category"]).agg(
-        freq=("recency_weight", "sum"), spend=("weighted_amount", "sum")
-    ).reset_index()
-    freq_norm = stats["freq"] / stats["freq"].max()
-    spend_norm = stats["spend"] / stats["spend"].max()
-    stats["score"] = 0.6 * freq_norm + 0.4 * spend_norm
-    anchors, seen_categories = [], set()
-    for _, row in stats.sort_values("score", ascending=False).iterrows():
-        if row["category"] in seen_categories:
-            continue
-        anchors.append({"merchant": row["merchant_name"], "category": row["category"]})
-        seen_categories.add(row["category"])
-        if len(anchors) == k:
-            break
-    return anchors
+    return AnchorSelector.from_frame(txn_df, tau_days=tau_days).select(k)
+
+def _anchor_blob(anchor: Dict[str, str]) -> str:
+    return f"{anchor['merchant']} | {anchor['category']}"
+
+def _anchor_similarities(anchors: List[Dict[str, str]], vendor_vecs: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every anchor to every vendor (anchors x vendors), in one encode and one matmul."""
+    with span("anchor_embedding"):
+        anchor_vecs = _embed([_anchor_blob(a) for a in anchors])
+    return anchor_vecs @ vendor_vecs.T
+
+def _score_components(
+    vendors: List[Dict[str, Any]], user_summary: Dict[str, Any], txn_df: pd.DataFrame
+) -> tuple[np.ndarray, np.ndarray]:
+    """Anchor-independent score inputs per vendor: offer value (relative to the category's average spend, capped at 1) and novelty (1 if never purchased)."""
+    purchased = set(txn_df["merchant_name"].unique())
+    avg_spend = user_summary.get("avg_spend_per_category", {})
+    value_norm = np.empty(len(vendors))
+    novelty = np.empty(len(vendors))
+    for idx, vendor in enumerate(vendors):
+        est_value = calculate_potential_savings(vendor["offer_details"], avg_spend)
+        cat_avg = avg_spend.get(vendor.get("category", ""), 1.0)
+        value_norm[idx] = min(est_value / cat_avg, 1.0) if cat_avg else 0.0
+        novelty[idx] = 0.0 if vendor["vendor_name"] in purchased else 1.0
+    return value_norm, novelty
 
 def _score_vendors(
     anchor: Dict[str, str],
@@ -72,23 +94,30 @@ def _score_vendors(
     user_summary: Dict[str, Any],
     txn_df: pd.DataFrame,
     category_filter: Optional[str] = None,
+    sims: Optional[np.ndarray] = None,
+    components: Optional[tuple[np.ndarray, np.ndarray]] = None,
+    weights: tuple[float, float, float, float] = SCORE_WEIGHTS,
+    cooccurrence: Optional[np.ndarray] = None,
 ) -> List[tuple[float, str, str, str]]:
-    anchor_blob = f"{anchor['merchant']} | {anchor['category']}"
-    anchor_vec = _embed([anchor_blob])[0]
-    purchased = set(txn_df["merchant_name"].unique())
-    avg_spend = user_summary.get("avg_spend_per_category", {})
+    """
+    `sims`: precomputed similarities of the anchor to each vendor; the anchor is embedded here when omitted.
+    `components`: _score_components for the same user, shared by all anchors of a request.
+    `weights`: (similarity, value, novelty, co-occurrence) weights of the score.
+    `cooccurrence`: co-occurrence of the anchor with each vendor (CooccurrenceIndex.scores_for); 0 when omitted.
+    """
+    if sims is None:
+        sims = _anchor_similarities([anchor], vendor_vecs)[0]
+    value_norm, novelty = components if components is not None else _score_components(vendors, user_summary, txn_df)
+    value_norm, novelty = value_norm.tolist(), novelty.tolist()
+    cooc = cooccurrence.tolist() if cooccurrence is not None else [0.0] * len(vendors)
+    w_sim, w_value, w_novelty, w_cooc = weights
     results = []
     for idx, vendor in enumerate(vendors):
         if vendor["vendor_name"].lower() == anchor["merchant"].lower():
             continue
         if category_filter and vendor.get("category") != category_filter:
             continue
-        sim = float(np.dot(anchor_vec, vendor_vecs[idx]))
-        est_value = calculate_potential_savings(vendor["offer_details"], avg_spend)
-        cat_avg = avg_spend.get(vendor.get("category", ""), 1.0)
-        value_norm = min(est_value / cat_avg, 1.0) if cat_avg else 0.0
-        novelty = 0.0 if vendor["vendor_name"] in purchased else 1.0
-        score = 0.6 * sim + 0.25 * value_norm + 0.15 * novelty
+        score = w_sim * float(sims[idx]) + w_value * value_norm[idx] + w_novelty * novelty[idx] + w_cooc * cooc[idx]
         otype = vendor["offer_details"].get("offer_type", "")
         results.append((score, vendor["vendor_id"], vendor["vendor_name"], otype))
     return results
@@ -122,11 +151,22 @@ def _recommend_for_anchor(
     user_summary: Dict[str, Any],
     txn_df: pd.DataFrame,
     top_n: int = 6,
+    sims: Optional[np.ndarray] = None,
+    components: Optional[tuple[np.ndarray, np.ndarray]] = None,
+    cooccurrence: Optional[np.ndarray] = None,
 ) -> List[Dict[str, str]]:
-    scores = _score_vendors(anchor, vendors, vendor_vecs, user_summary, txn_df, anchor["category"])
-    if len(scores) < top_n:
-        scores = _score_vendors(anchor, vendors, vendor_vecs, user_summary, txn_df, None)
-    return _diverse_top_vendors(scores, top_n)
+    if sims is None:
+        sims = _anchor_similarities([anchor], vendor_vecs)[0]
+    with span("score_vendors"):
+        if components is None:
+            components = _score_components(vendors, user_summary, txn_df)
+        scores = _score_vendors(
+            anchor, vendors, vendor_vecs, user_summary, txn_df, anchor["category"], sims, components, cooccurrence=cooccurrence
+        )
+        if len(scores) < top_n:
+            scores = _score_vendors(anchor, vendors, vendor_vecs, user_summary, txn_df, None, sims, components, cooccurrence=cooccurrence)
+    with span("diversify"):
+        return _diverse_top_vendors(scores, top_n)
 
 def generate_recs(
     vendor_path: str = "data/partner_vendors.json",
@@ -135,41 +175,70 @@ def generate_recs(
     k_panels: int = 3,
     panel_size: int = 6,
     exclude_last_n: int = 0,
+    anchor_selector: Optional[AnchorSelector] = None,
+    cooccurrence: Optional[CooccurrenceIndex] = None,
 ) -> List[Dict[str, Any]]:
     """
     Generate recommendation panels for the front-end.
     exclude_last_n: Exclude the most recent n transactions from analysis.
+    anchor_selector: Decayed counters already kept in step with the same transactions
+        (e.g. data_access.load_anchor_selector); built from the CSV when omitted.
+    cooccurrence: Top-K merchant neighbours from many users' transactions (e.g.
+        data_access.load_cooccurrence); blended into the score when given.
     Returns a list of dicts: {reason, anchor_merchant, category, offers}
     """
-    txn_df = pd.read_csv(
-        transactions_path,
-        usecols=["timestamp", "merchant_name", "category", "amount"],
-        parse_dates=["timestamp"],
-    ).sort_values("timestamp", ascending=False).reset_index(drop=True)
-    if exclude_last_n > 0 and len(txn_df) > exclude_last_n:
-        txn_df = txn_df.iloc[exclude_last_n:].copy()
-    temp_path = None
-    if exclude_last_n > 0 and len(txn_df) > 0:
-        import tempfile
-        temp = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
-        txn_df.to_csv(temp.name, index=False)
-        temp_path = temp.name
-        temp.close()
-        summary = generate_user_profile_summary(
-            path=temp_path, analysis_timeframe_days=analysis_timeframe_days
-        )
-        os.unlink(temp_path)
-    else:
-        summary = generate_user_profile_summary(
-            path=transactions_path, analysis_timeframe_days=analysis_timeframe_days
-        )
-    vendors = _load_vendors(vendor_path)
-    vendor_vecs = _vendor_embeddings(vendors)
-    anchors = _choose_anchor_vendors(txn_df, k=k_panels)
+    with RECS_SECONDS.time(), trace("generate_recs"):
+        try:
+            panels = _generate_recs(
+                vendor_path, transactions_path, analysis_timeframe_days, k_panels, panel_size, exclude_last_n, anchor_selector, cooccurrence
+            )
+        except Exception:
+            RECS_REQUESTS.inc(status="error")
+            raise
+    RECS_REQUESTS.inc(status="ok")
+    return panels
+
+def _load_history(
+    transactions_path: str, exclude_last_n: int = 0, analysis_timeframe_days: int = 30
+) -> tuple[pd.DataFrame, Dict[str, Any]]:
+    """Transactions (newest first, minus the newest `exclude_last_n`) and the user profile summary built from them."""
+    with span("read_transactions"):
+        txn_df = pd.read_csv(
+            transactions_path,
+            usecols=["timestamp", "merchant_name", "category", "amount"],
+            parse_dates=["timestamp"],
+        ).sort_values("timestamp", ascending=False).reset_index(drop=True)
+        if exclude_last_n > 0 and len(txn_df) > exclude_last_n:
+            txn_df = txn_df.iloc[exclude_last_n:].copy()
+    with span("profile_summary"):
+        if exclude_last_n > 0 and len(txn_df) > 0:
+            summary = profile_summary_from_frame(txn_df, analysis_timeframe_days=analysis_timeframe_days)
+        else:
+            summary = generate_user_profile_summary(
+                path=transactions_path, analysis_timeframe_days=analysis_timeframe_days
+            )
+    return txn_df, summary
+
+def _build_panels(
+    anchors: List[Dict[str, str]],
+    vendors: List[Dict[str, Any]],
+    vendor_vecs: np.ndarray,
+    summary: Dict[str, Any],
+    txn_df: pd.DataFrame,
+    panel_size: int = 6,
+    anchor_sims: Optional[np.ndarray] = None,
+    cooccurrence: Optional[CooccurrenceIndex] = None,
+) -> List[Dict[str, Any]]:
+    """One panel per anchor; `anchor_sims` (anchors x vendors) is computed here when not supplied."""
+    if anchors and anchor_sims is None:
+        anchor_sims = _anchor_similarities(anchors, vendor_vecs)
+    components = _score_components(vendors, summary, txn_df) if anchors else None
+    vendor_names = [v["vendor_name"] for v in vendors] if cooccurrence is not None else None
     panels = []
-    for anchor in anchors:
+    for anchor, sims in zip(anchors, anchor_sims if anchors else []):
+        cooc = cooccurrence.scores_for(anchor["merchant"], vendor_names) if cooccurrence is not None else None
         offers = _recommend_for_anchor(
-            anchor, vendors, vendor_vecs, summary, txn_df, top_n=panel_size
+            anchor, vendors, vendor_vecs, summary, txn_df, top_n=panel_size, sims=sims, components=components, cooccurrence=cooc
         )
         panels.append(
             {
@@ -181,6 +250,28 @@ def generate_recs(
         )
     return panels
 
+def _generate_recs(
+    vendor_path: str,
+    transactions_path: str,
+    analysis_timeframe_days: int,
+    k_panels: int,
+    panel_size: int,
+    exclude_last_n: int,
+    anchor_selector: Optional[AnchorSelector],
+    cooccurrence: Optional[CooccurrenceIndex],
+) -> List[Dict[str, Any]]:
+    txn_df, summary = _load_history(transactions_path, exclude_last_n, analysis_timeframe_days)
+    with span("load_vendors"):
+        vendors = _load_vendors(vendor_path)
+    with span("vendor_embeddings"):
+        vendor_vecs = _vendor_embeddings(vendors)
+    with span("choose_anchors"):
+        if anchor_selector is not None:
+            anchors = anchor_selector.select(k_panels)
+        else:
+            anchors = _choose_anchor_vendors(txn_df, k=k_panels)
+    return _build_panels(anchors, vendors, vendor_vecs, summary, txn_df, panel_size, cooccurrence=cooccurrence)
+
 if __name__ == "__main__":
     import pprint
     p = generate_recs()
@@ -0,0 +1,346 @@
+"""
+JSON API over the recommender for the React frontends.
+
+    uvicorn recs_api:app --app-dir consumer --port 8502
+
+Endpoints (all GET, JSON, ETag / If-None-Match aware):
+    /recs?exclude_last_n=0&k_panels=3&panel_size=6   recommendation panels (as generate_recs)
+    /profile?exclude_last_n=0&days=30                 user profile summary
+    /vendors/<vendor_id>                              one partner vendor
+    /vendors?ids=a,b,c                                several partner vendors
+    /transactions?merchant=&category=&start=&end=&limit=50&cursor=
+                                                      one page of card transactions, newest first;
+                                                      format=ndjson (or Accept: application/x-ndjson)
+                                                      streams every match, one JSON object per line
+    /healthz                                          liveness plus batching stats
+"""
+import sys
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs
+
+import numpy as np
+
+# Entry point (uvicorn --app-dir consumer): make the project root (metrics.py) importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import recommendation_engine as engine
+from data_access import (
+    COOCCURRENCE_FILE, TRANSACTIONS_FILE, VENDORS_FILE, VENDOR_PAGE_FIELDS,
+    cached_on_files, file_version, load_anchor_selector, load_cooccurrence, load_transaction_index, vendors_by_id,
+)
+from json_stream import preferred_path
+from transaction_query import MAX_PAGE_SIZE, PAGE_SIZE
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+MAX_BATCH = 64 # anchors encoded per model call
+BATCH_WINDOW_SECONDS = 0.005 # how long the first request of a batch waits for others to join
+
+API_REQUESTS = metrics.counter("recs_api_requests_total", "Recommendation API requests by route and HTTP status.", ["route", "status"])
+API_SECONDS = metrics.histogram("recs_api_request_seconds", "Seconds per recommendation API request.", ["route"])
+BATCH_SIZE = metrics.histogram("recs_api_batch_anchors", "Anchors encoded per batched model call.", buckets=(1, 2, 4, 8, 16, 32, 64, 128))
+
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class StreamAborted(Exception):
+    """A streamed response failed after its status line went out; the connection has to be dropped."""
+
+
+class NDJSONStream:
+    """Handler result sent as application/x-ndjson, one chunk of lines at a time."""
+    def __init__(self, chunks: Iterator[List[Dict[str, Any]]], headers: Optional[List[Tuple[bytes, bytes]]] = None):
+        self.chunks = chunks
+        self.headers = headers or []
+
+
+# ---------- Resident model and vendor matrix ---------- #
+def _build_vendor_matrix(path: str) -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    vendors = engine._load_vendors(path)
+    return vendors, engine._vendor_embeddings(vendors)
+
+
+def vendor_matrix() -> Tuple[List[Dict[str, Any]], np.ndarray]:
+    """Vendors and their embeddings, encoded once per version of the vendor file."""
+    return cached_on_files("recs_vendor_matrix", [preferred_path(VENDORS_FILE)], _build_vendor_matrix, str(VENDORS_FILE))
+
+
+def history(exclude_last_n: int, days: int) -> Tuple[Any, Dict[str, Any]]:
+    """(transactions, profile summary), rebuilt only when the transaction file changes."""
+    return cached_on_files("recs_history", [TRANSACTIONS_FILE], engine._load_history, str(TRANSACTIONS_FILE), exclude_last_n, days)
+
+
+class SimilarityBatcher:
+    """
+    Coalesces anchor similarity lookups from concurrent requests.
+
+    The first request opens a short window; every anchor submitted meanwhile (up to MAX_BATCH)
+    is encoded in a single model call and scored against the vendor matrix with a single matmul,
+    on a worker thread so the event loop keeps accepting requests.
+    """
+    def __init__(self, max_batch: int = MAX_BATCH, window: float = BATCH_WINDOW_SECONDS):
+        self.max_batch = max_batch
+        self.window = window
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set() # the loop only keeps weak references to running batches
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    async def similarities(self, anchor: Dict[str, str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Similarity of `anchor` to every vendor in the current vendor matrix, and that matrix,
+        so callers can check it is the one they loaded their vendors with.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((engine._anchor_blob(anchor), future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        blobs = list(dict.fromkeys(blob for blob, _ in batch)) # same anchor from several requests is encoded once
+        try:
+            vendor_vecs, sims = await asyncio.to_thread(self._score, blobs)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        rows = dict(zip(blobs, sims))
+        for blob, future in batch:
+            if not future.done():
+                future.set_result((rows[blob], vendor_vecs))
+
+    def _score(self, blobs: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        _, vendor_vecs = vendor_matrix()
+        with self._lock:
+            self.batches += 1
+            self.items += len(blobs)
+        BATCH_SIZE.observe(len(blobs))
+        return vendor_vecs, engine._embed(blobs) @ vendor_vecs.T
+
+
+batcher = SimilarityBatcher()
+
+
+# ---------- Handlers ---------- #
+def _int_param(query: Dict[str, List[str]], name: str, default: int, low: int = 0, high: int = 10_000) -> int:
+    try:
+        value = int(query.get(name, [default])[0])
+    except ValueError:
+        raise HTTPError(400, f"'{name}' must be an integer")
+    if not low <= value <= high:
+        raise HTTPError(400, f"'{name}' must be between {low} and {high}")
+    return value
+
+
+async def recs(query: Dict[str, List[str]]) -> Any:
+    exclude_last_n = _int_param(query, "exclude_last_n", 0)
+    k_panels = _int_param(query, "k_panels", 3, 1, 10)
+    panel_size = _int_param(query, "panel_size", 6, 1, 50)
+    days = _int_param(query, "days", 30, 1, 3650)
+
+    def prepare():
+        txn_df, summary = history(exclude_last_n, days)
+        anchors = load_anchor_selector(TRANSACTIONS_FILE, exclude_last_n).select(k_panels)
+        vendors, vendor_vecs = vendor_matrix()
+        return txn_df, summary, anchors, vendors, vendor_vecs, load_cooccurrence(COOCCURRENCE_FILE)
+
+    txn_df, summary, anchors, vendors, vendor_vecs, cooccurrence = await asyncio.to_thread(prepare)
+    scored = await asyncio.gather(*(batcher.similarities(a) for a in anchors))
+    if any(matrix is not vendor_vecs for _, matrix in scored): # vendor file changed between the two steps
+        raise HTTPError(503, "Vendor catalogue was reloaded; retry")
+    sims = [row for row, _ in scored]
+    return await asyncio.to_thread(
+        engine._build_panels, anchors, vendors, vendor_vecs, summary, txn_df, panel_size, np.asarray(sims) if sims else None, cooccurrence
+    )
+
+
+async def profile(query: Dict[str, List[str]]) -> Any:
+    exclude_last_n = _int_param(query, "exclude_last_n", 0)
+    days = _int_param(query, "days", 30, 1, 3650)
+    _, summary = await asyncio.to_thread(history, exclude_last_n, days)
+    return summary
+
+
+async def vendors(query: Dict[str, List[str]], vendor_id: Optional[str] = None) -> Any:
+    by_id = await asyncio.to_thread(vendors_by_id, VENDORS_FILE, VENDOR_PAGE_FIELDS)
+    if vendor_id is not None:
+        if vendor_id not in by_id:
+            raise HTTPError(404, f"Unknown vendor '{vendor_id}'")
+        return by_id[vendor_id]
+    ids = [i for value in query.get("ids", []) for i in value.split(",") if i]
+    if not ids:
+        raise HTTPError(400, "Pass ?ids=<vendor_id>,... or use /vendors/<vendor_id>")
+    return [by_id[i] for i in ids if i in by_id]
+
+
+async def transactions(query: Dict[str, List[str]], ndjson: bool = False) -> Any:
+    filters = {name: query[name][0] for name in ("merchant", "category", "start", "end") if query.get(name)}
+    cursor = query.get("cursor", [None])[0]
+    index = await asyncio.to_thread(load_transaction_index, TRANSACTIONS_FILE)
+    try:
+        if ndjson or query.get("format", [""])[0] == "ndjson":
+            limit = _int_param(query, "limit", 0, 0, 10_000_000) or None # 0 / omitted: every match
+            return NDJSONStream(index.iter_rows(cursor, limit, **filters))
+        return await asyncio.to_thread(index.page, cursor, _int_param(query, "limit", PAGE_SIZE, 1, MAX_PAGE_SIZE), **filters)
+    except ValueError as e: # bad cursor or date
+        raise HTTPError(400, str(e))
+
+
+async def healthz(query: Dict[str, List[str]]) -> Any:
+    return {"status": "ok", "batches": batcher.batches, "batched_anchors": batcher.items}
+
+
+def _etag(path: str, query_string: bytes, accept: bytes = b"") -> str:
+    """Validator from the request and the versions of the files every response is derived from."""
+    versions = (file_version(TRANSACTIONS_FILE), file_version(preferred_path(VENDORS_FILE)), file_version(COOCCURRENCE_FILE))
+    digest = hashlib.sha1(repr((path, query_string, accept, versions)).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+# ---------- ASGI app ---------- #
+async def _respond(send: Send, status: int, body: bytes = b"", headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+    headers = list(headers or [])
+    if body:
+        headers.append((b"content-type", b"application/json"))
+    headers.append((b"content-length", str(len(body)).encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+def _route(path: str) -> Tuple[Callable[..., Awaitable[Any]], Dict[str, str], bool]:
+    """(handler, path arguments, cacheable)."""
+    if path == "/recs":
+        return recs, {}, True
+    if path == "/profile":
+        return profile, {}, True
+    if path == "/vendors":
+        return vendors, {}, True
+    if path.startswith("/vendors/") and path.count("/") == 2:
+        return vendors, {"vendor_id": path.split("/")[2]}, True
+    if path == "/transactions":
+        return transactions, {}, True
+    if path == "/healthz":
+        return healthz, {}, False
+    raise HTTPError(404, f"No route for {path}")
+
+
+async def _stream(send: Send, stream: NDJSONStream, headers: List[Tuple[bytes, bytes]]) -> None:
+    """
+    Sends the stream chunk by chunk, building each chunk on a worker thread.
+
+    Raises:
+        StreamAborted: If building a chunk failed. The status line has already gone out by then,
+            so the body is left unterminated: the server drops the connection and the client sees
+            a broken transfer instead of a truncated but well-formed 200.
+    """
+    headers = headers + stream.headers + [(b"content-type", b"application/x-ndjson")]
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    done = object()
+    while True:
+        try:
+            rows = await asyncio.to_thread(next, stream.chunks, done)
+            if rows is done:
+                break
+            body = "".join(json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows)
+        except Exception as e:
+            logger.error(f"Recommendation API stream failed after the response started: {e}", exc_info=True)
+            raise StreamAborted(str(e)) from e
+        await send({"type": "http.response.body", "body": body.encode("utf-8"), "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _lifespan(receive, send: Send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                # Load the model and encode the vendor catalogue before the first request
+                await asyncio.to_thread(vendor_matrix)
+                await send({"type": "lifespan.startup.complete"})
+            except Exception as e:
+                logger.error(f"Recommendation API failed to start: {e}", exc_info=True)
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope: Dict[str, Any], receive, send: Send) -> None:
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+    start = time.perf_counter()
+    route, status = "unknown", 500
+    try:
+        if scope["method"] != "GET":
+            raise HTTPError(405, "Only GET is supported")
+        handler, kwargs, cacheable = _route(scope["path"])
+        route = handler.__name__
+        request_headers = dict(scope.get("headers", []))
+        accept = request_headers.get(b"accept", b"")
+        headers = {}
+        if cacheable:
+            etag = _etag(scope["path"], scope.get("query_string", b""), accept)
+            headers = {b"etag": etag.encode(), b"cache-control": b"no-cache", b"vary": b"Accept"}
+            if request_headers.get(b"if-none-match", b"").decode() in (etag, f"W/{etag}"):
+                # Nothing the response depends on has changed: skip the work entirely
+                status = 304
+                await _respond(send, status, headers=list(headers.items()))
+                return
+        query = parse_qs(scope.get("query_string", b"").decode())
+        if handler is transactions and b"application/x-ndjson" in accept:
+            kwargs["ndjson"] = True
+        result = await handler(query, **kwargs)
+        if isinstance(result, NDJSONStream):
+            status = 500 # until the last chunk is out
+            await _stream(send, result, list(headers.items()))
+            status = 200
+            return
+        body = json.dumps(result, ensure_ascii=False, default=str).encode("utf-8")
+        status = 200
+        await _respond(send, status, body, list(headers.items()))
+    except HTTPError as e:
+        status = e.status
+        await _respond(send, status, json.dumps({"error": e.message}).encode())
+    except StreamAborted:
+        raise # already logged; a second response can't be sent
+    except Exception as e:
+        logger.error(f"Recommendation API error on {scope.get('path')}: {e}", exc_info=True)
+        await _respond(send, 500, json.dumps({"error": "internal error"}).encode())
+    finally:
+        API_REQUESTS.inc(route=route, status=str(status))
+        API_SECONDS.observe(time.perf_counter() - start, route=route)
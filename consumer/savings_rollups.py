@@ -0,0 +1,117 @@
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Additive measures kept per (month, vendor); averages are derived from the sum/count pairs
+MEASURES = ["money_saved", "paid_amount", "points_spent", "pct_sum", "pct_count", "pos_pct_sum", "pos_pct_count"]
+_M = {name: i for i, name in enumerate(MEASURES)}
+
+
+def _aggregate(df: pd.DataFrame) -> pd.DataFrame:
+    """One groupby of validated point transactions into month x vendor measures."""
+    # The page's headline "Avg. Saving %" only averages transactions that actually saved money
+    positive_pct = df["percentage_saved"].where(df["money_saved"] > 0)
+    grouped = df.assign(pos_pct=positive_pct).groupby(["month_year_str", "vendor_name"], sort=False)
+    return pd.DataFrame({
+        "money_saved": grouped["money_saved"].sum(),
+        "paid_amount": grouped["paid_amount"].sum(),
+        "points_spent": grouped["points_spent"].sum(),
+        "pct_sum": grouped["percentage_saved"].sum(),
+        "pct_count": grouped["percentage_saved"].count(),
+        "pos_pct_sum": grouped["pos_pct"].sum(),
+        "pos_pct_count": grouped["pos_pct"].count(),
+    })[MEASURES]
+
+
+class SavingsRollups:
+    """
+    Month x vendor rollups of point transactions for the savings dashboard.
+
+    Built with a single groupby and then kept current with `append` (only new transactions are
+    aggregated), so every metric and chart on the page reads O(vendors) pre-summed rows instead of
+    re-grouping the whole history on each rerun. A per-vendor all-time table is maintained alongside
+    the monthly cells so "All Months" is as cheap as a single month.
+    """
+    def __init__(self):
+        self._cells: Dict[str, Dict[str, np.ndarray]] = {}   # month -> vendor -> measures
+        self._all_time: Dict[str, np.ndarray] = {}            # vendor -> measures
+        self._totals = np.zeros(len(MEASURES))
+        self._lock = threading.Lock()
+        self.rows_seen = 0
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "SavingsRollups":
+        rollups = cls()
+        rollups.append(df)
+        return rollups
+
+    def append(self, df: pd.DataFrame) -> None:
+        """Adds newly recorded (validated) point transactions to the rollups."""
+        if df.empty:
+            return
+        agg = _aggregate(df)
+        with self._lock:
+            for (month, vendor), values in zip(agg.index, agg.to_numpy(dtype=np.float64)):
+                month_cells = self._cells.setdefault(month, {})
+                if vendor in month_cells:
+                    month_cells[vendor] += values
+                else:
+                    month_cells[vendor] = values.copy()
+                if vendor in self._all_time:
+                    self._all_time[vendor] += values
+                else:
+                    self._all_time[vendor] = values.copy()
+                self._totals += values
+            self.rows_seen += len(df)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._cells.clear()
+            self._all_time.clear()
+            self._totals[:] = 0
+            self.rows_seen = 0
+
+    # ---------- Page queries ---------- #
+    def months(self) -> List[str]:
+        with self._lock:
+            return sorted(self._cells)
+
+    def totals(self) -> Dict[str, float]:
+        """Headline metrics: total saved, total points spent, average saving % over transactions that saved."""
+        with self._lock:
+            t = self._totals.copy()
+        return {
+            "total_savings": float(t[_M["money_saved"]]),
+            "total_points_spent": int(t[_M["points_spent"]]),
+            "average_saving_percentage": float(t[_M["pos_pct_sum"]] / t[_M["pos_pct_count"]]) if t[_M["pos_pct_count"]] else 0.0,
+        }
+
+    def monthly_savings(self) -> pd.DataFrame:
+        """Total money_saved per month, oldest first (columns: month_year_str, money_saved)."""
+        with self._lock:
+            rows = [(month, float(sum(v[_M["money_saved"]] for v in cells.values()))) for month, cells in sorted(self._cells.items())]
+        return pd.DataFrame(rows, columns=["month_year_str", "money_saved"])
+
+    def vendor_table(self, month: Optional[str] = None) -> pd.DataFrame:
+        """
+        One row per vendor for `month` (or all time if None).
+
+        Returns:
+            DataFrame with vendor_name, money_saved, paid_amount, points_spent, percentage_saved (mean).
+        """
+        with self._lock:
+            cells = self._all_time if month is None else self._cells.get(month, {})
+            vendors = list(cells)
+            values = np.array([cells[v] for v in vendors]).reshape(len(vendors), len(MEASURES))
+        counts = values[:, _M["pct_count"]]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_pct = np.where(counts > 0, values[:, _M["pct_sum"]] / counts, np.nan)
+        return pd.DataFrame({
+            "vendor_name": vendors,
+            "money_saved": values[:, _M["money_saved"]],
+            "paid_amount": values[:, _M["paid_amount"]],
+            "points_spent": values[:, _M["points_spent"]],
+            "percentage_saved": mean_pct,
+        })
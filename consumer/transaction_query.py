@@ -0,0 +1,190 @@
+import base64
+import binascii
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_CHUNK = 1000 # rows materialized at a time when streaming
+FIELDS = ("id", "timestamp", "merchant_name", "category", "amount", "currency")
+
+Cursor = Tuple[int, int] # (timestamp in ns since the epoch, id) of the last row a client has seen
+
+
+def _epoch_ns(timestamps: pd.Series) -> np.ndarray:
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert(None)
+    return timestamps.to_numpy("datetime64[ns]").view("i8")
+
+
+def to_epoch_ns(value: Any) -> int:
+    """Instant of a date / datetime string or Timestamp; naive values are taken as UTC."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.value
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    return base64.urlsafe_b64encode(f"{cursor[0]}:{cursor[1]}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Raises ValueError for a token that wasn't produced by encode_cursor."""
+    try:
+        ts, row_id = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode().split(":")
+        return int(ts), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor '{token}'")
+
+
+class TransactionIndex:
+    """
+    Card transactions ordered newest first by (timestamp, id), for paging through the history
+    without materializing it.
+
+    `id` is the row's position in final_data.csv, so it is stable while the file only grows.
+    Pages are found by keyset: a cursor is the (timestamp, id) of the last row returned, and the
+    next page starts right after it, so rows appended meanwhile never shift or repeat a page.
+    Merchant and category filters read per-value posting lists (positions in the sorted order),
+    date ranges are a binary search; only the rows of the requested page are turned into dicts.
+    """
+    def __init__(self, df: pd.DataFrame):
+        ids = np.arange(len(df), dtype=np.int64)
+        ts = _epoch_ns(df["timestamp"]) if len(df) else np.empty(0, dtype=np.int64)
+        order = np.lexsort((-ids, -ts)) # newest first; ties broken by the later row
+        self._frame = df
+        self._rows = ids[order]               # sorted position -> row in df
+        self._neg_ts = -ts[order]             # ascending, for searchsorted
+        self._neg_ids = -ids[order]
+        self._postings: Dict[str, Dict[str, np.ndarray]] = {}
+        self._codes: Dict[str, Tuple[np.ndarray, Dict[str, int]]] = {}
+        for column in ("merchant_name", "category"):
+            codes, uniques = pd.factorize(df[column].to_numpy()[self._rows], use_na_sentinel=True)
+            self._codes[column] = (codes, {value: i for i, value in enumerate(uniques)})
+            # Stable sort keeps each value's positions ascending, i.e. newest first
+            by_code = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[by_code], np.arange(len(uniques) + 1))
+            self._postings[column] = {value: by_code[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _position_after(self, cursor: Cursor) -> int:
+        """First sorted position strictly after `cursor`."""
+        ts, row_id = cursor
+        lo = np.searchsorted(self._neg_ts, -ts, side="left")
+        hi = np.searchsorted(self._neg_ts, -ts, side="right")
+        return int(lo + np.searchsorted(self._neg_ids[lo:hi], -row_id, side="right"))
+
+    def positions(
+        self,
+        merchant: Optional[str] = None,
+        category: Optional[str] = None,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+        after: Optional[Cursor] = None,
+        limit: Optional[int] = PAGE_SIZE,
+    ) -> np.ndarray:
+        """
+        Sorted positions of the matching transactions, newest first.
+
+        Args:
+            merchant: Only this merchant_name.
+            category: Only this category.
+            start: Inclusive lower bound on the timestamp (date or datetime; naive means UTC).
+            end: Exclusive upper bound on the timestamp.
+            after: Cursor of the last row already returned.
+            limit: Maximum number of positions; None for all.
+
+        Returns:
+            int64 array of positions, usable with `rows()` and `cursor_at()`.
+        """
+        lo, hi = 0, len(self._rows)
+        if end is not None:
+            lo = max(lo, int(np.searchsorted(self._neg_ts, -to_epoch_ns(end), side="right")))
+        if start is not None:
+            hi = min(hi, int(np.searchsorted(self._neg_ts, -to_epoch_ns(start), side="right")))
+        if after is not None:
+            lo = max(lo, self._position_after(after))
+        if lo >= hi:
+            return np.empty(0, dtype=np.int64)
+
+        filters = [(c, v) for c, v in (("merchant_name", merchant), ("category", category)) if v is not None]
+        if not filters:
+            stop = hi if limit is None else min(hi, lo + limit)
+            return np.arange(lo, stop, dtype=np.int64)
+        for column, value in filters:
+            if value not in self._postings[column]:
+                return np.empty(0, dtype=np.int64)
+        # Walk the shorter posting list; check any other filter against the code array
+        filters.sort(key=lambda f: len(self._postings[f[0]][f[1]]))
+        postings = self._postings[filters[0][0]][filters[0][1]]
+        candidates = postings[np.searchsorted(postings, lo):np.searchsorted(postings, hi)]
+        if len(filters) == 1:
+            return candidates if limit is None else candidates[:limit]
+        codes, lookup = self._codes[filters[1][0]]
+        wanted = lookup[filters[1][1]]
+        matches: List[np.ndarray] = []
+        found = 0
+        step = max(limit or 0, STREAM_CHUNK)
+        for i in range(0, len(candidates), step): # stop scanning once the page is full
+            chunk = candidates[i:i + step]
+            chunk = chunk[codes[chunk] == wanted]
+            matches.append(chunk)
+            found += len(chunk)
+            if limit is not None and found >= limit:
+                break
+        result = np.concatenate(matches) if matches else np.empty(0, dtype=np.int64)
+        return result if limit is None else result[:limit]
+
+    def cursor_at(self, position: int) -> Cursor:
+        return -int(self._neg_ts[position]), -int(self._neg_ids[position])
+
+    def rows(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        """Transactions at `positions` as JSON-ready dicts (FIELDS), in the given order."""
+        if len(positions) == 0:
+            return []
+        ids = self._rows[positions]
+        page = self._frame.iloc[ids]
+        columns = [c for c in FIELDS[1:] if c in page.columns]
+        records = []
+        for row_id, record in zip(ids.tolist(), page[columns].to_dict("records")):
+            if "timestamp" in record:
+                record["timestamp"] = record["timestamp"].isoformat()
+            records.append({"id": row_id, **record})
+        return records
+
+    def page(self, cursor: Optional[str] = None, limit: int = PAGE_SIZE, **filters: Any) -> Dict[str, Any]:
+        """
+        One page of transactions, newest first.
+
+        Args:
+            cursor: `next_cursor` of the previous page; None for the first page.
+            limit: Page size, 1..MAX_PAGE_SIZE.
+            **filters: merchant, category, start, end (see `positions`).
+
+        Returns:
+            {"transactions": [...], "next_cursor": str or None when this is the last page}
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        after = decode_cursor(cursor) if cursor else None
+        positions = self.positions(after=after, limit=limit + 1, **filters)
+        has_more = len(positions) > limit
+        positions = positions[:limit]
+        return {
+            "transactions": self.rows(positions),
+            "next_cursor": encode_cursor(self.cursor_at(positions[-1])) if has_more else None,
+        }
+
+    def iter_rows(self, cursor: Optional[str] = None, limit: Optional[int] = None, chunk: int = STREAM_CHUNK, **filters: Any) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Matching transactions for streaming responses, as lists of at most `chunk` dicts built one
+        list at a time. The query runs here, so a bad cursor or date raises before anything is sent.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        positions = self.positions(after=after, limit=limit, **filters)
+        return (self.rows(positions[i:i + chunk]) for i in range(0, len(positions), chunk))
@@ -3,17 +3,33 @@ from typing import Dict, Any, List, Optional
 
 import pandas as pd
 
+from instrumentation import span
+
 def generate_user_profile_summary(
     path="data/final_data.csv",
     analysis_timeframe_days: int = 30,
     top_n_categories: int = 3,
     top_n_merchants: int = 5,
+) -> dict:
+    """
+    Produce a JSON serializable profile summary from the transactions CSV at `path`.
+    See profile_summary_from_frame for the arguments and the returned dict.
+    """
+    with span("read_csv"):
+        df = pd.read_csv(path, usecols=["timestamp","merchant_name","category","amount"], parse_dates=True, index_col=0).reset_index()
+    return profile_summary_from_frame(df, analysis_timeframe_days, top_n_categories, top_n_merchants)
+
+def profile_summary_from_frame(
+    df: pd.DataFrame,
+    analysis_timeframe_days: int = 30,
+    top_n_categories: int = 3,
+    top_n_merchants: int = 5,
 ) -> dict:
     """
     Produce a JSON serializable profile summary from raw transactions.
 
     Args:
-        df: DataFrame with columns ['timestamp', 'merchant_name', 'category', 'amount'].
+        df: DataFrame with columns ['timestamp', 'merchant_name', 'category', 'amount'] (not modified).
         analysis_timeframe_days: lookback window (days) from the latest timestamp in df.
         top_n_categories: how many top categories by frequency to include.
         top_n_merchants: how many merchants by frequency to include.
@@ -32,11 +48,9 @@ def generate_user_profile_summary(
             'typical_spending_times': [str, …]
         }
     """
-    df = pd.read_csv(path, usecols=["timestamp","merchant_name","category","amount"], parse_dates=True, index_col=0).reset_index()
-    df['amount'] = -df['amount']
-
     # 1) Ensure timestamp dtype and copy
-    df = df.copy()
+    df = df[["timestamp", "merchant_name", "category", "amount"]].copy()
+    df['amount'] = -df['amount']
     df['timestamp'] = pd.to_datetime(df['timestamp'])
 
     # 2) Filter to the last N days